@@ -0,0 +1,92 @@
+"""
+SQLite full-text index over todo title/description, shared by the revisions
+that create it (0004) and the ones that rebuild todos (0005, 0012).
+
+todos_fts is a contentless FTS5 table keyed by todos_fts_keys.id, an INTEGER
+PRIMARY KEY mapped to todos.id. todos has a string primary key, so its
+implicit rowid is renumbered by VACUUM and batch table rebuilds and cannot
+key the index. Rebuilding todos drops its triggers but leaves the keys and
+the index as they are: restore_triggers() is all that is needed afterwards.
+"""
+from alembic import op
+
+
+TABLES = [
+    """
+    CREATE TABLE todos_fts_keys (
+        id INTEGER PRIMARY KEY,
+        todo_id VARCHAR NOT NULL UNIQUE
+    )
+    """,
+    """
+    CREATE VIRTUAL TABLE todos_fts USING fts5(
+        title, description, content='', tokenize='trigram'
+    )
+    """,
+]
+
+BACKFILL = [
+    "INSERT INTO todos_fts_keys (todo_id) SELECT id FROM todos",
+    """
+    INSERT INTO todos_fts (rowid, title, description)
+    SELECT todos_fts_keys.id, todos.title, todos.description
+    FROM todos_fts_keys JOIN todos ON todos.id = todos_fts_keys.todo_id
+    """,
+]
+
+# A contentless table removes a row through the 'delete' command, given the
+# values that were indexed
+TRIGGERS = [
+    """
+    CREATE TRIGGER IF NOT EXISTS todos_fts_insert AFTER INSERT ON todos BEGIN
+        INSERT INTO todos_fts_keys (todo_id) VALUES (new.id);
+        INSERT INTO todos_fts (rowid, title, description)
+        SELECT id, new.title, new.description FROM todos_fts_keys WHERE todo_id = new.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS todos_fts_delete AFTER DELETE ON todos BEGIN
+        INSERT INTO todos_fts (todos_fts, rowid, title, description)
+        SELECT 'delete', id, old.title, old.description FROM todos_fts_keys WHERE todo_id = old.id;
+        DELETE FROM todos_fts_keys WHERE todo_id = old.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS todos_fts_update AFTER UPDATE OF title, description ON todos BEGIN
+        INSERT INTO todos_fts (todos_fts, rowid, title, description)
+        SELECT 'delete', id, old.title, old.description FROM todos_fts_keys WHERE todo_id = old.id;
+        INSERT INTO todos_fts (rowid, title, description)
+        SELECT id, new.title, new.description FROM todos_fts_keys WHERE todo_id = new.id;
+    END
+    """,
+]
+
+DROP = [
+    "DROP TRIGGER IF EXISTS todos_fts_update",
+    "DROP TRIGGER IF EXISTS todos_fts_delete",
+    "DROP TRIGGER IF EXISTS todos_fts_insert",
+    "DROP TABLE IF EXISTS todos_fts",
+    "DROP TABLE IF EXISTS todos_fts_keys",
+]
+
+
+def is_sqlite() -> bool:
+    return op.get_context().dialect.name == "sqlite"
+
+
+def create_index() -> None:
+    """Create and fill the index for the todos already there"""
+    for statement in TABLES + BACKFILL + TRIGGERS:
+        op.execute(statement)
+
+
+def drop_index() -> None:
+    for statement in DROP:
+        op.execute(statement)
+
+
+def restore_triggers() -> None:
+    """Recreate the triggers after a batch rebuild of todos (no-op elsewhere)"""
+    if is_sqlite():
+        for statement in TRIGGERS:
+            op.execute(statement)
@@ -0,0 +1,50 @@
+"""composite indexes for todo and category queries
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDEXES = [
+    ("ix_todos_user_created", "todos", ["user_id", "created_at", "id"]),
+    ("ix_todos_user_completed_created", "todos", ["user_id", "completed", "created_at", "id"]),
+    ("ix_todos_user_due_date", "todos", ["user_id", "due_date", "id"]),
+    ("ix_todos_user_priority", "todos", ["user_id", "priority", "id"]),
+    ("ix_todos_category_id", "todos", ["category_id"]),
+    ("ix_categories_user_id", "categories", ["user_id"]),
+]
+
+
+def upgrade() -> None:
+    if op.get_context().dialect.name == "postgresql":
+        # CONCURRENTLY cannot run inside a transaction block
+        with op.get_context().autocommit_block():
+            for name, table, columns in INDEXES:
+                op.create_index(name, table, columns, if_not_exists=True, postgresql_concurrently=True)
+        return
+
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, if_not_exists=True)
+
+
+def downgrade() -> None:
+    if op.get_context().dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            for name, table, _ in INDEXES:
+                op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+        return
+
+    for name, table, _ in INDEXES:
+        op.drop_index(name, table_name=table, if_exists=True)
@@ -0,0 +1,81 @@
+"""stored priority rank and title sort key for todos
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+import unicodedata
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+NEW_INDEXES = [
+    ("ix_todos_user_priority_rank", "todos", ["user_id", "priority_rank", "id"]),
+    ("ix_todos_user_title_key", "todos", ["user_id", "title_key", "id"]),
+]
+
+todos = sa.table(
+    "todos",
+    sa.column("id", sa.String),
+    sa.column("title", sa.String),
+    sa.column("priority", sa.String),
+    sa.column("priority_rank", sa.Integer),
+    sa.column("title_key", sa.String),
+)
+
+
+def upgrade() -> None:
+    op.add_column("todos", sa.Column("priority_rank", sa.Integer(), nullable=False, server_default="2"))
+    op.add_column("todos", sa.Column("title_key", sa.String(), nullable=False, server_default=""))
+
+    # Backfill: rank in SQL, title key in Python (NFKC + casefold)
+    op.execute(
+        todos.update().values(
+            priority_rank=sa.case(
+                (todos.c.priority == "high", 3),
+                (todos.c.priority == "medium", 2),
+                (todos.c.priority == "low", 1),
+                else_=0,
+            )
+        )
+    )
+    connection = op.get_bind()
+    rows = connection.execute(sa.select(todos.c.id, todos.c.title)).all()
+    if rows:
+        connection.execute(
+            todos.update().where(todos.c.id == sa.bindparam("todo_id")).values(title_key=sa.bindparam("key")),
+            [
+                {"todo_id": row.id, "key": unicodedata.normalize("NFKC", row.title or "").casefold()}
+                for row in rows
+            ],
+        )
+
+    if op.get_context().dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            op.drop_index("ix_todos_user_priority", table_name="todos", postgresql_concurrently=True, if_exists=True)
+            for name, table, columns in NEW_INDEXES:
+                op.create_index(name, table, columns, if_not_exists=True, postgresql_concurrently=True)
+        return
+
+    op.drop_index("ix_todos_user_priority", table_name="todos", if_exists=True)
+    for name, table, columns in NEW_INDEXES:
+        op.create_index(name, table, columns, if_not_exists=True)
+
+
+def downgrade() -> None:
+    for name, table, _ in NEW_INDEXES:
+        op.drop_index(name, table_name=table, if_exists=True)
+    op.create_index("ix_todos_user_priority", "todos", ["user_id", "priority", "id"], if_not_exists=True)
+    with op.batch_alter_table("todos") as batch_op:
+        batch_op.drop_column("title_key")
+        batch_op.drop_column("priority_rank")
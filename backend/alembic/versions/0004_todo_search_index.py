@@ -0,0 +1,55 @@
+"""trigram search index for todo title/description
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlite_fts
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: Union[str, None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Postgres: pg_trgm GIN indexes serve ILIKE '%term%' directly
+TRGM_INDEXES = [
+    ("ix_todos_title_trgm", "title"),
+    ("ix_todos_description_trgm", "description"),
+]
+
+
+def upgrade() -> None:
+    dialect = op.get_context().dialect.name
+    if dialect == "sqlite":
+        # FTS5 trigram table kept in sync by triggers on todos
+        sqlite_fts.create_index()
+    elif dialect == "postgresql":
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        with op.get_context().autocommit_block():
+            for name, column in TRGM_INDEXES:
+                op.create_index(
+                    name,
+                    "todos",
+                    [column],
+                    if_not_exists=True,
+                    postgresql_using="gin",
+                    postgresql_ops={column: "gin_trgm_ops"},
+                    postgresql_concurrently=True
+                )
+
+
+def downgrade() -> None:
+    dialect = op.get_context().dialect.name
+    if dialect == "sqlite":
+        sqlite_fts.drop_index()
+    elif dialect == "postgresql":
+        with op.get_context().autocommit_block():
+            for name, _ in TRGM_INDEXES:
+                op.drop_index(name, table_name="todos", postgresql_concurrently=True, if_exists=True)
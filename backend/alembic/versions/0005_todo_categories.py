@@ -0,0 +1,63 @@
+"""todo_categories association table replacing todos.category_id
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlite_fts
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0005"
+down_revision: Union[str, None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "todo_categories",
+        sa.Column("todo_id", sa.String(), sa.ForeignKey("todos.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("category_id", sa.String(), sa.ForeignKey("categories.id", ondelete="CASCADE"), primary_key=True),
+    )
+    op.create_index("ix_todo_categories_category_todo", "todo_categories", ["category_id", "todo_id"])
+
+    # Carry over existing single-category assignments (skipping dangling ids)
+    op.execute(
+        """
+        INSERT INTO todo_categories (todo_id, category_id)
+        SELECT todos.id, todos.category_id
+        FROM todos JOIN categories ON categories.id = todos.category_id
+        """
+    )
+
+    op.drop_index("ix_todos_category_id", table_name="todos", if_exists=True)
+    with op.batch_alter_table("todos") as batch_op:
+        batch_op.drop_column("category_id")
+    # The SQLite batch rebuild of todos drops its FTS triggers
+    sqlite_fts.restore_triggers()
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("todos") as batch_op:
+        batch_op.add_column(sa.Column("category_id", sa.String(), nullable=True))
+        batch_op.create_foreign_key("fk_todos_category_id", "categories", ["category_id"], ["id"])
+    # The SQLite batch rebuild of todos drops its FTS triggers
+    sqlite_fts.restore_triggers()
+
+    # Keep one category per todo
+    op.execute(
+        """
+        UPDATE todos SET category_id = (
+            SELECT MIN(category_id) FROM todo_categories WHERE todo_categories.todo_id = todos.id
+        )
+        """
+    )
+    op.create_index("ix_todos_category_id", "todos", ["category_id"])
+    op.drop_index("ix_todo_categories_category_todo", table_name="todo_categories")
+    op.drop_table("todo_categories")
@@ -0,0 +1,68 @@
+"""per-user todo counters and the pending due date index
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0009"
+down_revision: Union[str, None] = "0008"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Same keys as StatsService.todo_keys
+BACKFILL = [
+    "SELECT user_id, 'total', COUNT(*) FROM todos GROUP BY user_id",
+    "SELECT user_id, CASE WHEN completed THEN 'status:completed' ELSE 'status:pending' END, COUNT(*)"
+    " FROM todos GROUP BY 1, 2",
+    "SELECT user_id, 'priority:' || COALESCE(priority, 'none'), COUNT(*) FROM todos GROUP BY 1, 2",
+    "SELECT todos.user_id, 'category:' || todo_categories.category_id, COUNT(*)"
+    " FROM todo_categories JOIN todos ON todos.id = todo_categories.todo_id GROUP BY 1, 2",
+]
+
+PENDING_DUE_INDEX = "ix_todos_user_pending_due"
+
+
+def upgrade() -> None:
+    op.create_table(
+        "user_stats",
+        sa.Column("user_id", sa.String(), sa.ForeignKey("users.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("key", sa.String(), primary_key=True),
+        sa.Column("value", sa.Integer(), nullable=False),
+    )
+    for query in BACKFILL:
+        op.execute(f"INSERT INTO user_stats (user_id, key, value) {query}")
+
+    if op.get_context().dialect.name == "postgresql":
+        # CONCURRENTLY cannot run inside a transaction block
+        with op.get_context().autocommit_block():
+            op.create_index(
+                PENDING_DUE_INDEX, "todos", ["user_id", "due_date"],
+                postgresql_where=sa.text("completed IS NOT true AND due_date IS NOT NULL"),
+                if_not_exists=True, postgresql_concurrently=True
+            )
+        return
+
+    op.create_index(
+        PENDING_DUE_INDEX, "todos", ["user_id", "due_date"],
+        sqlite_where=sa.text("completed IS NOT 1 AND due_date IS NOT NULL"),
+        if_not_exists=True
+    )
+
+
+def downgrade() -> None:
+    if op.get_context().dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            op.drop_index(PENDING_DUE_INDEX, table_name="todos", postgresql_concurrently=True, if_exists=True)
+    else:
+        op.drop_index(PENDING_DUE_INDEX, table_name="todos", if_exists=True)
+
+    op.drop_table("user_stats")
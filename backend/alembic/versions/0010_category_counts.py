@@ -0,0 +1,42 @@
+"""denormalized todo counts on categories
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0010"
+down_revision: Union[str, None] = "0009"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Constant defaults: no table rewrite on Postgres, no batch rebuild on SQLite
+    op.add_column("categories", sa.Column("todo_count", sa.Integer(), nullable=False, server_default="0"))
+    op.add_column("categories", sa.Column("completed_count", sa.Integer(), nullable=False, server_default="0"))
+    op.execute(
+        "UPDATE categories SET"
+        " todo_count = (SELECT COUNT(*) FROM todo_categories WHERE todo_categories.category_id = categories.id),"
+        " completed_count = (SELECT COUNT(*) FROM todo_categories JOIN todos ON todos.id = todo_categories.todo_id"
+        " WHERE todo_categories.category_id = categories.id AND todos.completed)"
+    )
+    # Per-category counters now live on the categories rows
+    op.execute("DELETE FROM user_stats WHERE key LIKE 'category:%'")
+
+
+def downgrade() -> None:
+    op.execute(
+        "INSERT INTO user_stats (user_id, key, value)"
+        " SELECT user_id, 'category:' || id, todo_count FROM categories WHERE todo_count > 0"
+    )
+    with op.batch_alter_table("categories") as batch_op:
+        batch_op.drop_column("completed_count")
+        batch_op.drop_column("todo_count")
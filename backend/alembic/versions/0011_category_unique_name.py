@@ -0,0 +1,123 @@
+"""unique category names per user, default categories seeded at signup
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-18 00:00:00
+
+"""
+from datetime import datetime, timezone
+from typing import Sequence, Union
+import uuid
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0011"
+down_revision: Union[str, None] = "0010"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDEX = "uq_categories_user_name"
+
+# Snapshot of app.models.category.default_categories at this revision
+DEFAULT_CATEGORIES = [
+    ("仕事", "#1976d2"),
+    ("プライベート", "#388e3c"),
+    ("買い物", "#f57c00"),
+    ("その他", "#7b1fa2"),
+]
+
+# Categories sharing a user and name with an older one (lowest id wins)
+DUPLICATES = """
+    SELECT categories.id AS duplicate_id, categories.user_id, kept.kept_id
+    FROM categories
+    JOIN (
+        SELECT user_id, name, MIN(id) AS kept_id FROM categories
+        GROUP BY user_id, name HAVING COUNT(*) > 1
+    ) kept ON kept.user_id = categories.user_id AND kept.name = categories.name
+    WHERE categories.id <> kept.kept_id
+"""
+
+
+def bump_versions(bind, user_ids) -> None:
+    """Invalidate the category list ETags of users whose categories changed"""
+    for user_id in set(user_ids):
+        bind.execute(sa.text("UPDATE users SET data_version = data_version + 1 WHERE id = :id"), {"id": user_id})
+
+
+def merge_duplicates(bind) -> None:
+    """Move todos of duplicate categories to the kept one, then delete the duplicates"""
+    duplicates = bind.execute(sa.text(DUPLICATES)).all()
+    deleted_at = datetime.now(timezone.utc)
+    for duplicate_id, user_id, kept_id in duplicates:
+        params = {"duplicate_id": duplicate_id, "kept_id": kept_id}
+        bind.execute(sa.text(
+            "INSERT INTO todo_categories (todo_id, category_id)"
+            " SELECT todo_id, :kept_id FROM todo_categories WHERE category_id = :duplicate_id"
+            " AND todo_id NOT IN (SELECT todo_id FROM todo_categories WHERE category_id = :kept_id)"
+        ), params)
+        bind.execute(sa.text("DELETE FROM todo_categories WHERE category_id = :duplicate_id"), params)
+        bind.execute(sa.text("DELETE FROM categories WHERE id = :duplicate_id"), params)
+        # Sync clients drop the duplicate like any deleted category
+        bind.execute(sa.text(
+            "INSERT INTO tombstones (id, user_id, entity, entity_id, deleted_at)"
+            " VALUES (:id, :user_id, 'category', :duplicate_id, :deleted_at)"
+        ), {"id": str(uuid.uuid4()), "user_id": user_id, "duplicate_id": duplicate_id, "deleted_at": deleted_at})
+        bind.execute(sa.text(
+            "UPDATE categories SET"
+            " todo_count = (SELECT COUNT(*) FROM todo_categories WHERE category_id = :kept_id),"
+            " completed_count = (SELECT COUNT(*) FROM todo_categories JOIN todos ON todos.id = todo_categories.todo_id"
+            " WHERE category_id = :kept_id AND todos.completed)"
+            " WHERE id = :kept_id"
+        ), params)
+    bump_versions(bind, [user_id for _, user_id, _ in duplicates])
+
+
+def seed_defaults(bind) -> None:
+    """
+    Users without categories got the defaults on their next category list;
+    seeding now happens at signup, so give them the defaults here
+    """
+    user_ids = bind.execute(sa.text(
+        "SELECT id FROM users WHERE NOT EXISTS (SELECT 1 FROM categories WHERE categories.user_id = users.id)"
+    )).scalars().all()
+    now = datetime.now(timezone.utc)
+    rows = [
+        {"id": str(uuid.uuid4()), "user_id": user_id, "name": name, "color": color, "created_at": now, "updated_at": now}
+        for user_id in user_ids
+        for name, color in DEFAULT_CATEGORIES
+    ]
+    if rows:
+        bind.execute(sa.text(
+            "INSERT INTO categories (id, user_id, name, color, created_at, updated_at)"
+            " VALUES (:id, :user_id, :name, :color, :created_at, :updated_at)"
+        ), rows)
+    bump_versions(bind, user_ids)
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    merge_duplicates(bind)
+    seed_defaults(bind)
+
+    if op.get_context().dialect.name == "postgresql":
+        # CONCURRENTLY cannot run inside a transaction block
+        with op.get_context().autocommit_block():
+            op.create_index(
+                INDEX, "categories", ["user_id", "name"], unique=True,
+                if_not_exists=True, postgresql_concurrently=True
+            )
+        return
+
+    op.create_index(INDEX, "categories", ["user_id", "name"], unique=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    if op.get_context().dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            op.drop_index(INDEX, table_name="categories", postgresql_concurrently=True, if_exists=True)
+    else:
+        op.drop_index(INDEX, table_name="categories", if_exists=True)
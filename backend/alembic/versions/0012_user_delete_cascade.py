@@ -0,0 +1,56 @@
+"""ON DELETE CASCADE from users to todos and categories
+
+Revision ID: 0012
+Revises: 0011
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlite_fts
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0012"
+down_revision: Union[str, None] = "0011"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Postgres' names for the unnamed baseline constraints, also used on SQLite
+TABLES = ["todos", "categories"]
+NAMING_CONVENTION = {"fk": "%(table_name)s_%(column_0_name)s_fkey"}
+
+def replace_user_fk(ondelete: Union[str, None]) -> None:
+    if op.get_context().dialect.name == "postgresql":
+        action = f" ON DELETE {ondelete}" if ondelete else ""
+        for table in TABLES:
+            name = f"{table}_user_id_fkey"
+            # NOT VALID skips the full-table check under the ALTER's lock
+            op.execute(
+                f"ALTER TABLE {table} DROP CONSTRAINT IF EXISTS {name},"
+                f" ADD CONSTRAINT {name} FOREIGN KEY (user_id) REFERENCES users (id){action} NOT VALID"
+            )
+        # Committing first releases the ALTER's lock; VALIDATE then scans
+        # holding only SHARE UPDATE EXCLUSIVE
+        with op.get_context().autocommit_block():
+            for table in TABLES:
+                op.execute(f"ALTER TABLE {table} VALIDATE CONSTRAINT {table}_user_id_fkey")
+        return
+
+    # SQLite cannot alter a constraint: rebuild the tables
+    for table in TABLES:
+        with op.batch_alter_table(table, naming_convention=NAMING_CONVENTION) as batch_op:
+            batch_op.drop_constraint(f"{table}_user_id_fkey", type_="foreignkey")
+            batch_op.create_foreign_key(f"{table}_user_id_fkey", "users", ["user_id"], ["id"], ondelete=ondelete)
+    # The rebuild of todos drops its FTS triggers
+    sqlite_fts.restore_triggers()
+
+
+def upgrade() -> None:
+    replace_user_fk("CASCADE")
+
+
+def downgrade() -> None:
+    replace_user_fk(None)
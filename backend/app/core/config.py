@@ -19,12 +19,46 @@ class Settings(BaseSettings):
     SUPABASE_URL: Optional[str] = None
     SUPABASE_KEY: Optional[str] = None
     DATABASE_URL: Optional[str] = None
+    # Use AsyncSession (aiosqlite/asyncpg); false falls back to the blocking driver
+    DATABASE_ASYNC: bool = True
+    
+    # Connection pool (QueuePool-based engines)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    
+    # Token for /api/internal endpoints; without it they are disabled in production
+    INTERNAL_STATS_TOKEN: Optional[str] = None
     
     # Security Settings
     SECRET_KEY: str = "your-secret-key-change-this-in-production"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     
+    # Authenticated user cache
+    USER_CACHE_MAX_SIZE: int = 10000
+    USER_CACHE_TTL_SECONDS: int = 60
+    
+    # Category list cache, keyed by user and data version
+    CATEGORY_CACHE_MAX_SIZE: int = 10000
+    CATEGORY_CACHE_TTL_SECONDS: int = 300
+    
+    # Password hashing pool (bcrypt runs off the event loop)
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_QUEUE_LIMIT: int = 32
+    PASSWORD_HASH_RETRY_AFTER_SECONDS: int = 1
+    
+    # Bulk todo endpoints
+    TODO_BULK_MAX_ITEMS: int = 500
+    
+    # Todo imports: rows validated/inserted/committed per batch, row errors kept per job,
+    # and the longest row buffered (bytes of an NDJSON line, characters of a CSV record)
+    TODO_IMPORT_BATCH_SIZE: int = 500
+    TODO_IMPORT_MAX_ERRORS: int = 100
+    TODO_IMPORT_MAX_ROW_SIZE: int = 65536
+    
     # Environment
     ENVIRONMENT: str = "development"
     
@@ -32,6 +66,7 @@ class Settings(BaseSettings):
     GOOGLE_CLIENT_ID: Optional[str] = None
     GOOGLE_CLIENT_SECRET: Optional[str] = None
     GOOGLE_REDIRECT_URI: Optional[str] = None
+    GOOGLE_CERTS_URL: str = "https://www.googleapis.com/oauth2/v1/certs"
     
     class Config:
         env_file = ".env"
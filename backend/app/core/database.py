@@ -1,7 +1,13 @@
-from sqlalchemy import create_engine, MetaData
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable
+from sqlalchemy import create_engine, event, make_url, MetaData
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import QueuePool
 from app.core.config import settings
+from app.core.pool_metrics import PoolMetrics
 import logging
 import os
 
@@ -13,15 +19,89 @@ if settings.ENVIRONMENT == "development":
 else:
     DATABASE_URL = settings.DATABASE_URL or "sqlite:///./todoShare.db"
 
-# SQLAlchemy engine
+
+def get_async_database_url(url: str) -> str:
+    """Map a sync database URL to its async driver (aiosqlite / asyncpg)"""
+    if url.startswith("sqlite://"):
+        return "sqlite+aiosqlite://" + url[len("sqlite://"):]
+    for prefix in ("postgres://", "postgresql://", "postgresql+psycopg2://"):
+        if url.startswith(prefix):
+            return "postgresql+asyncpg://" + url[len(prefix):]
+    return url
+
+
+def get_pool_options(url: str, metrics: PoolMetrics) -> dict:
+    """Pool arguments from settings, using an instrumented pool class"""
+    pool_class = make_url(url).get_dialect().get_pool_class(make_url(url))
+    options = {
+        "poolclass": metrics.instrument(pool_class),
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+    }
+    # NullPool/StaticPool (aiosqlite) do not take sizing arguments
+    if issubclass(pool_class, QueuePool):
+        options.update(
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+        )
+        metrics.pool_size = settings.DB_POOL_SIZE
+        metrics.max_overflow = settings.DB_MAX_OVERFLOW
+    return options
+
+
+ASYNC_DATABASE_URL = get_async_database_url(DATABASE_URL)
+
+# Pool telemetry, exposed on /api/internal/stats
+pool_metrics = {
+    "sync": PoolMetrics("sync"),
+    "async": PoolMetrics("async"),
+}
+
+# SQLAlchemy engine (sync path, also used for schema management)
 engine = create_engine(
-    DATABASE_URL, 
+    DATABASE_URL,
     connect_args={"check_same_thread": False} if "sqlite" in DATABASE_URL else {},
-    echo=settings.ENVIRONMENT == "development"  # Log SQL queries in development
+    echo=settings.ENVIRONMENT == "development",  # Log SQL queries in development
+    **get_pool_options(DATABASE_URL, pool_metrics["sync"])
+)
+
+# Async engine used by request handlers when DATABASE_ASYNC is enabled
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    echo=settings.ENVIRONMENT == "development",
+    **get_pool_options(ASYNC_DATABASE_URL, pool_metrics["async"])
 )
 
-# Session factory
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+pool_metrics["sync"].listen(engine)
+pool_metrics["async"].listen(async_engine.sync_engine)
+
+
+def enable_sqlite_foreign_keys(dbapi_connection: Any, connection_record: Any) -> None:
+    """SQLite ignores FOREIGN KEY / ON DELETE clauses unless asked per connection"""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
+
+if engine.dialect.name == "sqlite":
+    event.listen(engine, "connect", enable_sqlite_foreign_keys)
+    event.listen(async_engine.sync_engine, "connect", enable_sqlite_foreign_keys)
+
+
+def dialect_insert(entity: Any) -> Any:
+    """INSERT with the engine dialect's ON CONFLICT support (Postgres or SQLite)"""
+    return (postgresql.insert if engine.dialect.name == "postgresql" else sqlite.insert)(entity)
+
+
+# Session factories
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
+AsyncSessionLocal = async_sessionmaker(
+    async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
 
 # Base class for ORM models
 Base = declarative_base()
@@ -29,21 +109,104 @@ Base = declarative_base()
 # Metadata for migrations
 metadata = MetaData()
 
-def get_db():
-    """Dependency to get database session"""
-    db = SessionLocal()
+
+class SyncSessionAdapter:
+    """
+    Exposes a blocking Session through the subset of the AsyncSession API
+    used by the services, so DATABASE_ASYNC=false runs the same service code
+    on the sync driver (useful for comparing both paths under load).
+    """
+
+    def __init__(self, session: Session):
+        self.sync_session = session
+
+    def add(self, instance: Any) -> None:
+        self.sync_session.add(instance)
+
+    def add_all(self, instances: Any) -> None:
+        self.sync_session.add_all(instances)
+
+    async def execute(self, statement: Any, *args: Any, **kwargs: Any) -> Any:
+        return self.sync_session.execute(statement, *args, **kwargs)
+
+    async def scalar(self, statement: Any, *args: Any, **kwargs: Any) -> Any:
+        return self.sync_session.scalar(statement, *args, **kwargs)
+
+    async def scalars(self, statement: Any, *args: Any, **kwargs: Any) -> Any:
+        return self.sync_session.scalars(statement, *args, **kwargs)
+
+    async def get(self, entity: Any, ident: Any, **kwargs: Any) -> Any:
+        return self.sync_session.get(entity, ident, **kwargs)
+
+    async def delete(self, instance: Any) -> None:
+        self.sync_session.delete(instance)
+
+    async def flush(self, objects: Any = None) -> None:
+        self.sync_session.flush(objects)
+
+    async def refresh(self, instance: Any, attribute_names: Any = None) -> None:
+        self.sync_session.refresh(instance, attribute_names)
+
+    async def commit(self) -> None:
+        self.sync_session.commit()
+
+    async def rollback(self) -> None:
+        self.sync_session.rollback()
+
+    async def close(self) -> None:
+        self.sync_session.close()
+
+    async def run_sync(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        return fn(self.sync_session, *args, **kwargs)
+
+    async def stream_scalars(self, statement: Any, *args: Any, **kwargs: Any) -> "SyncStreamResult":
+        return SyncStreamResult(self.sync_session.scalars(statement, *args, **kwargs))
+
+
+class SyncStreamResult:
+    """The partitions() part of AsyncScalarResult over a blocking ScalarResult"""
+
+    def __init__(self, result: Any):
+        self.result = result
+
+    async def partitions(self, size: Any = None) -> AsyncIterator[Any]:
+        for partition in self.result.partitions(size):
+            yield partition
+
+
+@asynccontextmanager
+async def open_session() -> AsyncIterator[AsyncSession]:
+    """A session for the configured driver, closed on exit"""
+    if settings.DATABASE_ASYNC:
+        async with AsyncSessionLocal() as db:
+            yield db
+        return
+
+    db = SyncSessionAdapter(SessionLocal())
     try:
         yield db
     finally:
-        db.close()
+        await db.close()
+
+
+async def get_db() -> AsyncIterator[AsyncSession]:
+    """Dependency to get database session"""
+    async with open_session() as db:
+        yield db
 
 def init_db():
-    """Initialize database tables"""
-    Base.metadata.create_all(bind=engine)
+    """Initialize database tables by running Alembic migrations"""
+    from app.core.migrations import upgrade_database
+    upgrade_database(engine)
     logger.info("Database initialized successfully")
 
+async def close_db():
+    """Dispose pooled connections on shutdown"""
+    await async_engine.dispose()
+    engine.dispose()
+
 # Convenience function for Supabase compatibility (future migration)
 def get_supabase_client():
     """Future: Return Supabase client when migrating"""
     # This will be implemented when migrating to Supabase
-    return None
\ No newline at end of file
+    return None
@@ -1,8 +1,8 @@
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, Response, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
-from app.core.security import verify_token
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.services.auth_service import auth_service
+from app.services.data_version import data_version_service
 from app.core.database import get_db
 from app.models.user import UserResponse
 from typing import Optional
@@ -11,7 +11,7 @@ security = HTTPBearer()
 
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ) -> UserResponse:
     """
     Dependency to get current authenticated user
@@ -23,13 +23,8 @@ async def get_current_user(
     )
     
     try:
-        # Verify token
-        user_id = verify_token(credentials.credentials)
-        if user_id is None:
-            raise credentials_exception
-        
-        # Get user from database
-        user = await auth_service.get_user_by_id(user_id, db)
+        # Verify token and resolve user (cached per token)
+        user = await auth_service.get_user_for_token(credentials.credentials, db)
         if user is None:
             raise credentials_exception
         
@@ -42,7 +37,7 @@ async def get_current_user_optional(
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(
         HTTPBearer(auto_error=False)
     ),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ) -> Optional[UserResponse]:
     """
     Dependency to get current user (optional)
@@ -52,12 +47,7 @@ async def get_current_user_optional(
         return None
     
     try:
-        user_id = verify_token(credentials.credentials)
-        if user_id is None:
-            return None
-        
-        user = await auth_service.get_user_by_id(user_id, db)
-        return user
+        return await auth_service.get_user_for_token(credentials.credentials, db)
         
     except Exception:
         return None
@@ -73,4 +63,34 @@ async def get_current_active_user(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Inactive user"
         )
-    return current_user
\ No newline at end of file
+    return current_user
+
+async def check_not_modified(
+    request: Request,
+    response: Response,
+    current_user: UserResponse = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+) -> None:
+    """
+    Dependency for cacheable GETs: sets a weak ETag from the user's data
+    version and answers a matching If-None-Match with 304 before the route
+    runs its queries
+    """
+    version = await data_version_service.get(current_user.id, db)
+    if version is None:
+        return
+    # Lets the route key caches on the version without reading it again
+    request.state.data_version = version
+
+    resource = request.url.path
+    if request.url.query:
+        resource = f"{resource}?{request.url.query}"
+    headers = {
+        "ETag": data_version_service.etag(version, current_user.id, resource),
+        # Always revalidate; the 304 path is a single primary key lookup
+        "Cache-Control": "private, no-cache"
+    }
+
+    if data_version_service.matches(request.headers.get("if-none-match"), headers["ETag"]):
+        raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
@@ -0,0 +1,47 @@
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import inspect
+from sqlalchemy.engine import Engine
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Schema that Base.metadata.create_all produced before Alembic was added
+BASELINE_REVISION = "0001"
+
+def get_alembic_config(connection=None) -> Config:
+    """Alembic config pointing at backend/alembic, optionally bound to a connection"""
+    config = Config(os.path.join(BACKEND_DIR, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(BACKEND_DIR, "alembic"))
+    if connection is not None:
+        config.attributes["connection"] = connection
+    return config
+
+def upgrade_database(engine: Engine, revision: str = "head") -> None:
+    """
+    Bring the database to the given revision.
+    Databases created by create_all (tables but no alembic_version) are
+    stamped at the baseline first so only the newer revisions run.
+    """
+    with engine.connect() as connection:
+        sqlite = connection.dialect.name == "sqlite"
+        if sqlite:
+            # Batch migrations rebuild tables (DROP + rename); with foreign
+            # keys enforced that would cascade into referencing tables
+            connection.exec_driver_sql("PRAGMA foreign_keys=OFF")
+        try:
+            inspector = inspect(connection)
+            config = get_alembic_config(connection)
+            if inspector.has_table("users") and not inspector.has_table("alembic_version"):
+                logger.info(f"Stamping existing schema at baseline revision {BASELINE_REVISION}")
+                command.stamp(config, BASELINE_REVISION)
+                connection.commit()
+            command.upgrade(config, revision)
+            connection.commit()
+        finally:
+            if sqlite:
+                connection.rollback()
+                connection.exec_driver_sql("PRAGMA foreign_keys=ON")
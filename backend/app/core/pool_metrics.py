@@ -0,0 +1,118 @@
+from typing import Any, Dict, Type
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import Pool
+import threading
+import time
+
+
+class PoolMetrics:
+    """
+    Connection pool telemetry: checkout wait, in-use/overflow counts and
+    connection lifetime. Fed by pool events and an instrumented pool class.
+    """
+
+    def __init__(self, name: str, pool_size: int = 0, max_overflow: int = 0):
+        self.name = name
+        self.pool_size = pool_size
+        self.max_overflow = max_overflow
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.in_use = 0
+        self.max_in_use = 0
+        self.opened = 0
+        self.closed = 0
+        self.total_lifetime_seconds = 0.0
+        self.max_lifetime_seconds = 0.0
+
+    def instrument(self, pool_class: Type[Pool]) -> Type[Pool]:
+        """Return a subclass of pool_class that times checkout waits"""
+        metrics = self
+
+        class InstrumentedPool(pool_class):
+            def _do_get(self):
+                started = time.perf_counter()
+                try:
+                    return super()._do_get()
+                except PoolTimeoutError:
+                    metrics.record_timeout()
+                    raise
+                finally:
+                    metrics.record_wait(time.perf_counter() - started)
+
+        InstrumentedPool.__name__ = f"Instrumented{pool_class.__name__}"
+        return InstrumentedPool
+
+    def listen(self, target: Any) -> None:
+        """Attach pool event listeners to an Engine or Pool"""
+        event.listen(target, "connect", self._on_connect)
+        event.listen(target, "checkout", self._on_checkout)
+        event.listen(target, "checkin", self._on_checkin)
+        event.listen(target, "close", self._on_close)
+        event.listen(target, "detach", self._on_detach)
+
+    def record_wait(self, seconds: float) -> None:
+        with self._lock:
+            self.total_wait_seconds += seconds
+            self.max_wait_seconds = max(self.max_wait_seconds, seconds)
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def _record_lifetime(self, connected_at: Any) -> None:
+        with self._lock:
+            self.closed += 1
+            if connected_at is not None:
+                lifetime = time.monotonic() - connected_at
+                self.total_lifetime_seconds += lifetime
+                self.max_lifetime_seconds = max(self.max_lifetime_seconds, lifetime)
+
+    def _on_connect(self, dbapi_connection, connection_record) -> None:
+        connection_record.info["connected_at"] = time.monotonic()
+        with self._lock:
+            self.opened += 1
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy) -> None:
+        connection_record.info["checked_out"] = True
+        with self._lock:
+            self.checkouts += 1
+            self.in_use += 1
+            self.max_in_use = max(self.max_in_use, self.in_use)
+
+    def _on_checkin(self, dbapi_connection, connection_record) -> None:
+        if connection_record.info.pop("checked_out", False):
+            with self._lock:
+                self.in_use -= 1
+
+    def _on_close(self, dbapi_connection, connection_record) -> None:
+        self._record_lifetime(connection_record.info.get("connected_at"))
+
+    def _on_detach(self, dbapi_connection, connection_record) -> None:
+        # A detached connection leaves the pool for good
+        if connection_record.info.pop("checked_out", False):
+            with self._lock:
+                self.in_use -= 1
+        self._record_lifetime(connection_record.info.get("connected_at"))
+
+    def stats(self) -> Dict[str, Any]:
+        """Return a snapshot of pool telemetry"""
+        with self._lock:
+            open_connections = self.opened - self.closed
+            return {
+                "pool_size": self.pool_size,
+                "max_overflow": self.max_overflow,
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "in_use": self.in_use,
+                "max_in_use": self.max_in_use,
+                "open_connections": open_connections,
+                "overflow": max(open_connections - self.pool_size, 0) if self.pool_size else 0,
+                "avg_checkout_wait_ms": 1000 * self.total_wait_seconds / self.checkouts if self.checkouts else 0.0,
+                "max_checkout_wait_ms": 1000 * self.max_wait_seconds,
+                "avg_connection_lifetime_s": self.total_lifetime_seconds / self.closed if self.closed else 0.0,
+                "max_connection_lifetime_s": self.max_lifetime_seconds
+            }
@@ -0,0 +1,29 @@
+from typing import Any, AsyncIterator
+from fastapi import Response
+from pydantic_core import to_json
+import zlib
+
+
+def trusted_json_response(content: Any, response: Response) -> Response:
+    """
+    Serialize trusted output (dicts, lists, models built from database rows)
+    straight to JSON bytes. Returning a Response makes FastAPI skip
+    response_model validation and jsonable_encoder, so content must already
+    match the declared response_model: it was validated on the way in, and
+    validating it again on the way out costs more than serializing it.
+    Headers that dependencies set on the request's Response (ETag,
+    Cache-Control) are carried over, as FastAPI would.
+    """
+    json_response = Response(content=to_json(content), media_type="application/json")
+    json_response.headers.raw.extend(response.headers.raw)
+    return json_response
+
+
+async def gzip_stream(chunks: AsyncIterator[bytes], level: int = 6) -> AsyncIterator[bytes]:
+    """Gzip a byte stream on the fly, one compressed piece per input chunk"""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    async for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
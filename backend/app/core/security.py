@@ -1,8 +1,12 @@
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Optional, Union, Any
+from typing import Optional, Union, Any, Callable, Dict
 from jose import jwt
 from passlib.context import CryptContext
 from app.core.config import settings
+import asyncio
+import threading
+import time
 import uuid
 
 # Password hashing context
@@ -34,21 +38,27 @@ def create_access_token(
     )
     return encoded_jwt
 
-def verify_token(token: str) -> Optional[str]:
-    """Verify JWT token and return user ID"""
+def decode_token(token: str) -> Optional[dict]:
+    """Verify JWT token and return its payload"""
     try:
         payload = jwt.decode(
             token, 
             settings.SECRET_KEY, 
             algorithms=[settings.ALGORITHM]
         )
-        user_id: str = payload.get("sub")
-        if user_id is None:
+        if payload.get("sub") is None:
             return None
-        return user_id
+        return payload
     except jwt.JWTError:
         return None
 
+def verify_token(token: str) -> Optional[str]:
+    """Verify JWT token and return user ID"""
+    payload = decode_token(token)
+    if payload is None:
+        return None
+    return payload["sub"]
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash"""
     return pwd_context.verify(plain_password, hashed_password)
@@ -57,6 +67,94 @@ def get_password_hash(password: str) -> str:
     """Hash a password"""
     return pwd_context.hash(password)
 
+class PasswordHasherBusyError(Exception):
+    """Raised when the password hashing queue is full"""
+    pass
+
+class PasswordHasher:
+    """
+    Runs bcrypt hashing/verification on a dedicated thread pool so it does
+    not block the event loop. Work beyond max_workers + queue_limit is rejected.
+    """
+    
+    def __init__(self, max_workers: int, queue_limit: int):
+        self.max_workers = max_workers
+        self.queue_limit = queue_limit
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="password-hash"
+        )
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.max_queue_depth = 0
+        self.completed = 0
+        self.rejected = 0
+        self.total_hash_seconds = 0.0
+        self.max_hash_seconds = 0.0
+        self.total_wait_seconds = 0.0
+    
+    async def hash(self, password: str) -> str:
+        """Hash a password on the pool"""
+        return await self.run(get_password_hash, password)
+    
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """Verify a password on the pool"""
+        return await self.run(verify_password, plain_password, hashed_password)
+    
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Submit func to the pool, raising PasswordHasherBusyError when full"""
+        with self._lock:
+            if self.in_flight >= self.max_workers + self.queue_limit:
+                self.rejected += 1
+                raise PasswordHasherBusyError("Password hashing queue is full")
+            self.in_flight += 1
+            self.max_queue_depth = max(self.max_queue_depth, self._queue_depth())
+        
+        submitted_at = time.perf_counter()
+        future = self._executor.submit(self._timed, func, submitted_at, *args)
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+    
+    def _timed(self, func: Callable[..., Any], submitted_at: float, *args: Any) -> Any:
+        started_at = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            hash_seconds = time.perf_counter() - started_at
+            with self._lock:
+                self.completed += 1
+                self.total_wait_seconds += started_at - submitted_at
+                self.total_hash_seconds += hash_seconds
+                self.max_hash_seconds = max(self.max_hash_seconds, hash_seconds)
+    
+    def _release(self, future: Future) -> None:
+        with self._lock:
+            self.in_flight -= 1
+    
+    def _queue_depth(self) -> int:
+        return max(self.in_flight - self.max_workers, 0)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Return queue depth and hash latency metrics"""
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "queue_limit": self.queue_limit,
+                "in_flight": self.in_flight,
+                "queue_depth": self._queue_depth(),
+                "max_queue_depth": self.max_queue_depth,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "avg_hash_ms": 1000 * self.total_hash_seconds / self.completed if self.completed else 0.0,
+                "max_hash_ms": 1000 * self.max_hash_seconds,
+                "avg_wait_ms": 1000 * self.total_wait_seconds / self.completed if self.completed else 0.0
+            }
+
+password_hasher = PasswordHasher(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    queue_limit=settings.PASSWORD_HASH_QUEUE_LIMIT
+)
+
 def validate_password_strength(password: str) -> tuple[bool, str]:
     """
     Validate password strength
@@ -0,0 +1,12 @@
+from pydantic import BaseModel
+from typing import List
+from app.models.category import CategoryResponse
+from app.models.todo import TodoListResponse, TodoStats
+from app.models.user import UserResponse
+
+class BootstrapResponse(BaseModel):
+    """What the app loads on start: GET /auth/me, /categories, /todos and /todos/stats in one"""
+    user: UserResponse
+    categories: List[CategoryResponse]
+    todos: TodoListResponse  # first page, newest first, no filters
+    stats: TodoStats
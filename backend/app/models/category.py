@@ -25,6 +25,7 @@ class CategoryResponse(CategoryBase):
     created_at: datetime
     updated_at: Optional[datetime]
     todo_count: Optional[int] = 0
+    completed_count: Optional[int] = 0
 
     class Config:
         from_attributes = True
@@ -1,10 +1,40 @@
-from sqlalchemy import Column, String, Boolean, DateTime, Text, ForeignKey, Integer
+from sqlalchemy import Column, String, Boolean, DateTime, Text, ForeignKey, Integer, Index, JSON, Table
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, validates
 from sqlalchemy.sql import func
 from app.core.database import Base
+from datetime import datetime, timezone
+import unicodedata
 import uuid
 
+def utcnow() -> datetime:
+    """
+    Client-side timestamp: stored values keep sub-second precision and
+    writes know their timestamps without reading the row back
+    """
+    return datetime.now(timezone.utc)
+
+# Stored on todos.priority_rank so sort_by=priority orders by rank, not text
+PRIORITY_RANKS = {"low": 1, "medium": 2, "high": 3}
+
+def priority_rank(priority) -> int:
+    """Sort rank for a priority value (unset sorts below low)"""
+    return PRIORITY_RANKS.get(priority, 0)
+
+def title_sort_key(title) -> str:
+    """NFKC-normalized, case-folded title (full/half-width forms sort together)"""
+    return unicodedata.normalize("NFKC", title or "").casefold()
+
+# Todo <-> category links; rows go away with either side (ON DELETE CASCADE)
+todo_categories = Table(
+    "todo_categories",
+    Base.metadata,
+    Column("todo_id", String, ForeignKey("todos.id", ondelete="CASCADE"), primary_key=True),
+    Column("category_id", String, ForeignKey("categories.id", ondelete="CASCADE"), primary_key=True),
+    # Serves the category_ids filter and per-category counts
+    Index("ix_todo_categories_category_todo", "category_id", "todo_id"),
+)
+
 class User(Base):
     __tablename__ = "users"
     
@@ -15,12 +45,15 @@ class User(Base):
     google_id = Column(String, nullable=True, unique=True)  # For Google OAuth
     picture = Column(String, nullable=True)  # Profile picture URL
     is_active = Column(Boolean, default=True)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    # Bumped by every todo/category write; backs the list and detail ETags
+    data_version = Column(Integer, nullable=False, default=0, server_default="0")
+    created_at = Column(DateTime(timezone=True), default=utcnow, server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=utcnow)
     
-    # Relationships
-    categories = relationship("Category", back_populates="user", cascade="all, delete-orphan")
-    todos = relationship("Todo", back_populates="user", cascade="all, delete-orphan")
+    # Relationships; deleting a user leaves its rows to ON DELETE CASCADE
+    # instead of loading them to delete one by one
+    categories = relationship("Category", back_populates="user", cascade="all, delete-orphan", passive_deletes=True)
+    todos = relationship("Todo", back_populates="user", cascade="all, delete-orphan", passive_deletes=True)
 
 class Category(Base):
     __tablename__ = "categories"
@@ -28,13 +61,24 @@ class Category(Base):
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     name = Column(String, nullable=False)
     color = Column(String, default="#6B7280")  # Default gray color
-    user_id = Column(String, ForeignKey("users.id"), nullable=False)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    user_id = Column(String, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    # Linked todos (and how many are completed), kept by StatsService with every todo write
+    todo_count = Column(Integer, nullable=False, default=0, server_default="0")
+    completed_count = Column(Integer, nullable=False, default=0, server_default="0")
+    created_at = Column(DateTime(timezone=True), default=utcnow, server_default=func.now())
+    # Set on insert too, so the change feed sees new rows (see CategoryService.get_changed_categories)
+    updated_at = Column(DateTime(timezone=True), default=utcnow, onupdate=utcnow)
     
     # Relationships
     user = relationship("User", back_populates="categories")
-    todos = relationship("Todo", back_populates="category", cascade="all, delete-orphan")
+    todos = relationship("Todo", secondary=todo_categories, back_populates="categories", passive_deletes=True)
+    
+    __table_args__ = (
+        Index("ix_categories_user_id", "user_id"),
+        Index("ix_categories_user_updated", "user_id", "updated_at", "id"),
+        # One category per name and user; ON CONFLICT target for default seeding
+        Index("uq_categories_user_name", "user_id", "name", unique=True),
+    )
 
 class Todo(Base):
     __tablename__ = "todos"
@@ -44,12 +88,97 @@ class Todo(Base):
     description = Column(Text, nullable=True)
     completed = Column(Boolean, default=False)
     priority = Column(String, default="medium")  # low, medium, high
+    # Derived sort keys, kept in sync by the validators below; Core
+    # statements must set them via priority_rank() / title_sort_key()
+    priority_rank = Column(Integer, nullable=False, default=2, server_default="2")
+    title_key = Column(String, nullable=False, default="", server_default="")
     due_date = Column(DateTime(timezone=True), nullable=True)
-    user_id = Column(String, ForeignKey("users.id"), nullable=False)
-    category_id = Column(String, ForeignKey("categories.id"), nullable=True)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    user_id = Column(String, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    # Python-side default: keyset cursors compare created_at for equality
+    created_at = Column(DateTime(timezone=True), default=utcnow, server_default=func.now())
+    # Set on insert too, so the change feed sees new rows (see TodoService.get_changes)
+    updated_at = Column(DateTime(timezone=True), default=utcnow, onupdate=utcnow)
     
     # Relationships
     user = relationship("User", back_populates="todos")
-    category = relationship("Category", back_populates="todos")
\ No newline at end of file
+    # Not loaded implicitly: list queries use selectinload (one IN query per page)
+    categories = relationship(
+        "Category",
+        secondary=todo_categories,
+        back_populates="todos",
+        order_by="Category.name",
+        passive_deletes=True,
+        lazy="raise"
+    )
+    
+    # Composite indexes matching TodoService.get_todos: every list query
+    # filters by user_id, then sorts (keyset: sort key + id) or filters
+    __table_args__ = (
+        Index("ix_todos_user_created", "user_id", "created_at", "id"),
+        Index("ix_todos_user_completed_created", "user_id", "completed", "created_at", "id"),
+        Index("ix_todos_user_due_date", "user_id", "due_date", "id"),
+        Index("ix_todos_user_priority_rank", "user_id", "priority_rank", "id"),
+        Index("ix_todos_user_title_key", "user_id", "title_key", "id"),
+        # Change feed: rows updated after a (updated_at, id) cursor
+        Index("ix_todos_user_updated", "user_id", "updated_at", "id"),
+        # Overdue count (StatsService): only pending todos with a due date
+        Index(
+            "ix_todos_user_pending_due",
+            "user_id",
+            "due_date",
+            sqlite_where=completed.is_not(True) & due_date.is_not(None),
+            postgresql_where=completed.is_not(True) & due_date.is_not(None),
+        ),
+    )
+    
+    @validates("priority")
+    def _set_priority_rank(self, key, value):
+        self.priority_rank = priority_rank(value)
+        return value
+    
+    @validates("title")
+    def _set_title_key(self, key, value):
+        self.title_key = title_sort_key(value)
+        return value
+
+class Tombstone(Base):
+    """Record of a deleted todo or category, served by the change feed"""
+    __tablename__ = "tombstones"
+    
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    user_id = Column(String, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    entity = Column(String, nullable=False)  # todo, category
+    entity_id = Column(String, nullable=False)
+    deleted_at = Column(DateTime(timezone=True), nullable=False, default=utcnow)
+    
+    __table_args__ = (
+        Index("ix_tombstones_user_deleted", "user_id", "deleted_at", "id"),
+    )
+
+class UserStat(Base):
+    """One todo counter of a user, kept by StatsService (e.g. key "status:pending")"""
+    __tablename__ = "user_stats"
+    
+    user_id = Column(String, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    key = Column(String, primary_key=True)
+    value = Column(Integer, nullable=False, default=0)
+
+class ImportJob(Base):
+    """Progress and row errors of a todo import (see TodoImportService)"""
+    __tablename__ = "import_jobs"
+    
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    user_id = Column(String, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    format = Column(String, nullable=False)  # ndjson, csv
+    status = Column(String, nullable=False, default="running")  # running, completed, failed
+    processed = Column(Integer, nullable=False, default=0)  # rows read
+    created = Column(Integer, nullable=False, default=0)
+    failed = Column(Integer, nullable=False, default=0)
+    errors = Column(JSON, nullable=False, default=list)  # first TODO_IMPORT_MAX_ERRORS row errors
+    detail = Column(String, nullable=True)  # why a failed job stopped
+    created_at = Column(DateTime(timezone=True), default=utcnow, server_default=func.now())
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+    
+    __table_args__ = (
+        Index("ix_import_jobs_user_created", "user_id", "created_at"),
+    )
@@ -1,7 +1,8 @@
-from pydantic import BaseModel, Field, ConfigDict
-from typing import Optional, List
+from pydantic import BaseModel, Field, ConfigDict, model_validator
+from typing import Any, Dict, Optional, List
 from datetime import datetime
 from enum import Enum
+from app.models.category import CategoryResponse
 
 class TodoStatus(str, Enum):
     PENDING = "pending"
@@ -51,7 +52,116 @@ class TodoInDB(TodoBase):
 
 class TodoListResponse(BaseModel):
     items: list[TodoResponse]
-    total: int
-    page: int
+    total: Optional[int] = None  # None when include_total=false
+    page: Optional[int] = None  # None in cursor mode
     per_page: int
-    pages: int
\ No newline at end of file
+    pages: Optional[int] = None
+    next_cursor: Optional[str] = None
+
+class TodoSparse(BaseModel):
+    """A todo limited by fields=: id plus the requested TodoResponse fields only"""
+    id: str
+    title: Optional[str] = None
+    description: Optional[str] = None
+    status: Optional[TodoStatus] = None
+    priority: Optional[TodoPriority] = None
+    due_date: Optional[datetime] = None
+    user_id: Optional[str] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    category_ids: Optional[List[str]] = None
+    categories: Optional[List[dict]] = None
+
+class TodoSparseListResponse(TodoListResponse):
+    """TodoListResponse of a fields= request"""
+    items: list[TodoSparse]
+
+class Tombstone(BaseModel):
+    entity: str  # todo, category
+    id: str
+    deleted_at: datetime
+
+class TodoChangesResponse(BaseModel):
+    """Rows changed after the since cursor, oldest first in each list"""
+    todos: List[TodoResponse]
+    categories: List[CategoryResponse]
+    deleted: List[Tombstone]
+    next_cursor: str  # pass back as since; unchanged when nothing changed
+    has_more: bool
+
+class TodoBulkCreate(BaseModel):
+    # Items are validated one by one so errors can be reported per index
+    items: List[Dict[str, Any]] = Field(..., min_length=1)
+    all_or_nothing: bool = True
+
+class TodoBulkError(BaseModel):
+    index: int
+    errors: List[dict]
+
+class TodoBulkCreateResponse(BaseModel):
+    created: List[TodoResponse]
+    errors: List[TodoBulkError] = []
+
+class TodoStats(BaseModel):
+    """Counts of a user's todos (by_category omits categories with none)"""
+    total: int
+    by_status: Dict[str, int]
+    by_priority: Dict[str, int]  # "none" counts todos without a priority
+    by_category: Dict[str, int]  # category id -> todos linked
+    overdue: int  # pending todos past their due date
+
+class TodoImportJob(BaseModel):
+    """Progress of an import; errors index data rows from 0 (CSV header excluded)"""
+    id: str
+    format: str
+    status: str  # running, completed, failed
+    processed: int
+    created: int
+    failed: int
+    errors: List[TodoBulkError]  # the first TODO_IMPORT_MAX_ERRORS
+    detail: Optional[str] = None
+    created_at: datetime
+    finished_at: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+class TodoFilter(BaseModel):
+    """Same filters as GET /api/todos"""
+    status: Optional[TodoStatus] = None
+    search: Optional[str] = None
+    priority: Optional[TodoPriority] = None
+    category_ids: Optional[List[str]] = None
+    due_date_from: Optional[datetime] = None
+    due_date_to: Optional[datetime] = None
+
+class TodoSelection(BaseModel):
+    """Todos to act on: explicit ids or a filter, not both"""
+    ids: Optional[List[str]] = Field(None, min_length=1)
+    filter: Optional[TodoFilter] = None
+
+    @model_validator(mode="after")
+    def check_one_selector(self):
+        if (self.ids is None) == (self.filter is None):
+            raise ValueError("Provide exactly one of ids or filter")
+        return self
+
+class TodoBulkUpdate(TodoSelection):
+    changes: TodoUpdate = TodoUpdate()
+    toggle: bool = False
+
+    @model_validator(mode="after")
+    def check_changes(self):
+        changes = self.changes.model_dump(exclude_unset=True)
+        if changes.get("category_ids") is None:
+            changes.pop("category_ids", None)
+        if "title" in changes and changes["title"] is None:
+            # todos.title is NOT NULL: fail here rather than on the UPDATE
+            raise ValueError("title cannot be null")
+        if self.toggle and "status" in changes:
+            raise ValueError("toggle cannot be combined with a status change")
+        if not self.toggle and not changes:
+            raise ValueError("No changes given")
+        return self
+
+class TodoBulkResult(BaseModel):
+    affected: int
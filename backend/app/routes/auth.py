@@ -1,10 +1,11 @@
 from fastapi import APIRouter, HTTPException, Depends, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.user import UserCreate, UserLogin, UserResponse, Token, GoogleLoginRequest
 from app.services.auth_service import auth_service
 from app.core.dependencies import get_current_active_user
 from app.core.database import get_db
-from app.core.security import validate_password_strength
+from app.core.security import validate_password_strength, PasswordHasherBusyError
+from app.core.config import settings
 from app.services.google_auth import google_auth_service
 import logging
 
@@ -12,8 +13,16 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+def password_pool_busy_exception() -> HTTPException:
+    """503 returned when the password hashing queue is full"""
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Server is busy, please retry shortly",
+        headers={"Retry-After": str(settings.PASSWORD_HASH_RETRY_AFTER_SECONDS)},
+    )
+
 @router.post("/register", response_model=UserResponse)
-async def register(user_data: UserCreate, db: Session = Depends(get_db)):
+async def register(user_data: UserCreate, db: AsyncSession = Depends(get_db)):
     """Register a new user"""
     try:
         # Validate password strength
@@ -36,6 +45,8 @@ async def register(user_data: UserCreate, db: Session = Depends(get_db)):
         
     except HTTPException:
         raise
+    except PasswordHasherBusyError:
+        raise password_pool_busy_exception()
     except Exception as e:
         logger.error(f"Registration error: {e}")
         raise HTTPException(
@@ -44,7 +55,7 @@ async def register(user_data: UserCreate, db: Session = Depends(get_db)):
         )
 
 @router.post("/login", response_model=Token)
-async def login(user_data: UserLogin, db: Session = Depends(get_db)):
+async def login(user_data: UserLogin, db: AsyncSession = Depends(get_db)):
     """Login user"""
     try:
         # Authenticate user
@@ -71,6 +82,8 @@ async def login(user_data: UserLogin, db: Session = Depends(get_db)):
         
     except HTTPException:
         raise
+    except PasswordHasherBusyError:
+        raise password_pool_busy_exception()
     except Exception as e:
         logger.error(f"Login error: {e}")
         raise HTTPException(
@@ -116,11 +129,11 @@ async def refresh_token(
         )
 
 @router.post("/google-login", response_model=Token)
-async def google_login(google_data: GoogleLoginRequest, db: Session = Depends(get_db)):
+async def google_login(google_data: GoogleLoginRequest, db: AsyncSession = Depends(get_db)):
     """Login with Google"""
     try:
         # Verify Google ID token
-        user_info = google_auth_service.verify_google_token(google_data.id_token)
+        user_info = await google_auth_service.verify_google_token_async(google_data.id_token)
         if not user_info:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -154,14 +167,16 @@ async def google_login(google_data: GoogleLoginRequest, db: Session = Depends(ge
         )
 
 @router.post("/debug/clear-users")
-async def clear_all_users(db: Session = Depends(get_db)):
+async def clear_all_users(db: AsyncSession = Depends(get_db)):
     """Clear all users (development only)"""
-    from app.models.db_models import User, Category, Todo
+    from sqlalchemy import delete
+    from app.models.db_models import User
+    from app.services.category_service import category_service
     
-    # Delete in correct order due to foreign keys
-    db.query(Todo).delete()
-    db.query(Category).delete()
-    db.query(User).delete()
-    db.commit()
+    # Todos, categories and the rest of each user's rows cascade
+    await db.execute(delete(User))
+    await db.commit()
+    auth_service.user_cache.clear()
+    category_service.cache.clear()
     
     return {"message": "All users and related data cleared"}
\ No newline at end of file
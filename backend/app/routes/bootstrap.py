@@ -0,0 +1,34 @@
+from fastapi import APIRouter, HTTPException, Depends, Query, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.bootstrap import BootstrapResponse
+from app.models.user import UserResponse
+from app.services.bootstrap_service import bootstrap_service
+from app.core.dependencies import get_current_active_user
+from app.core.database import get_db
+from app.core.responses import trusted_json_response
+import logging
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+
+@router.get("", response_model=BootstrapResponse)
+async def get_bootstrap(
+    response: Response,
+    per_page: int = Query(20, ge=1, le=100),
+    current_user: UserResponse = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    The current user, its categories, todo stats and first page of todos,
+    so the app starts with one round trip instead of one per resource.
+    No ETag: the overdue count changes with time, not with writes.
+    """
+    data = await bootstrap_service.get_bootstrap(current_user, db, per_page=per_page)
+    if data is None:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error"
+        )
+    return trusted_json_response(data, response)
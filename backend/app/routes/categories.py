@@ -1,10 +1,10 @@
-from fastapi import APIRouter, HTTPException, Depends, status
+from fastapi import APIRouter, HTTPException, Depends, Request, status
 from typing import List
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.category import CategoryCreate, CategoryUpdate, CategoryResponse, CategoryListResponse
 from app.models.user import UserResponse
 from app.services.category_service import category_service
-from app.core.dependencies import get_current_active_user
+from app.core.dependencies import check_not_modified, get_current_active_user
 from app.core.database import get_db
 import logging
 
@@ -17,7 +17,7 @@ router = APIRouter()
 async def create_category(
     category_data: CategoryCreate,
     current_user: UserResponse = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Create a new category"""
     try:
@@ -38,23 +38,29 @@ async def create_category(
         )
 
 
-@router.get("", response_model=CategoryListResponse)
+@router.get("", response_model=CategoryListResponse, dependencies=[Depends(check_not_modified)])
 async def get_categories(
+    request: Request,
     current_user: UserResponse = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Get all categories for the current user"""
     try:
-        categories = await category_service.get_categories_by_user(current_user.id, db)
-        
-        # If no categories exist, create default ones
-        if not categories:
-            categories = await category_service.create_user_default_categories(current_user.id, db)
-        
+        # Defaults are seeded at signup (CategoryService.seed_default_categories)
+        categories = await category_service.get_categories_by_user(
+            current_user.id, db, version=getattr(request.state, "data_version", None)
+        )
+        if categories is None:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Internal server error"
+            )
         return CategoryListResponse(
             items=categories,
             total=len(categories)
         )
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error getting categories: {e}")
         raise HTTPException(
@@ -63,11 +69,11 @@ async def get_categories(
         )
 
 
-@router.get("/{category_id}", response_model=CategoryResponse)
+@router.get("/{category_id}", response_model=CategoryResponse, dependencies=[Depends(check_not_modified)])
 async def get_category(
     category_id: str,
     current_user: UserResponse = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Get a specific category by ID"""
     try:
@@ -93,7 +99,7 @@ async def update_category(
     category_id: str,
     category_update: CategoryUpdate,
     current_user: UserResponse = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Update a category"""
     try:
@@ -118,7 +124,7 @@ async def update_category(
 async def delete_category(
     category_id: str,
     current_user: UserResponse = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Delete a category"""
     try:
@@ -0,0 +1,62 @@
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+from typing import Optional
+from app.core.config import settings
+from app.core.database import pool_metrics
+from app.core.security import password_hasher
+from app.services.auth_service import auth_service
+from app.services.category_service import category_service
+from app.services.google_auth import google_auth_service
+from app.services.stats_service import stats_service
+import logging
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+def require_internal_access(x_internal_token: Optional[str] = Header(None)) -> None:
+    """
+    Internal endpoints need INTERNAL_STATS_TOKEN when it is configured;
+    when it is not, they are only open in development and hidden elsewhere
+    """
+    if settings.INTERNAL_STATS_TOKEN:
+        if x_internal_token != settings.INTERNAL_STATS_TOKEN:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Invalid internal token"
+            )
+    elif settings.ENVIRONMENT != "development":
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Not Found"
+        )
+
+def require_internal_token(x_internal_token: Optional[str] = Header(None)) -> None:
+    """Internal writes need INTERNAL_STATS_TOKEN in every environment"""
+    if not settings.INTERNAL_STATS_TOKEN:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Not Found"
+        )
+    require_internal_access(x_internal_token)
+
+@router.get("/stats", dependencies=[Depends(require_internal_access)])
+async def get_stats():
+    """Connection pool, cache and password hashing telemetry"""
+    return {
+        "database": {
+            "async_enabled": settings.DATABASE_ASYNC,
+            "pools": {name: metrics.stats() for name, metrics in pool_metrics.items()}
+        },
+        "user_cache": auth_service.user_cache.stats(),
+        "category_cache": category_service.cache.stats(),
+        "password_hasher": password_hasher.stats(),
+        "google_keys": google_auth_service.key_cache.stats()
+    }
+
+@router.post("/stats/reconcile", dependencies=[Depends(require_internal_token)])
+async def reconcile_todo_stats(user_id: Optional[str] = None):
+    """
+    Recount every user's (or only user_id's) todo counters from scratch,
+    fix them and report the drift found (meant for a periodic job)
+    """
+    return await stats_service.reconcile_all(user_id=user_id)
@@ -1,11 +1,34 @@
-from fastapi import APIRouter, HTTPException, Depends, Query, status
-from typing import Optional
-from sqlalchemy.orm import Session
-from app.models.todo import TodoCreate, TodoUpdate, TodoResponse, TodoListResponse, TodoStatus
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from datetime import datetime
+from typing import List, Optional, Union
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.todo import (
+    TodoCreate,
+    TodoUpdate,
+    TodoResponse,
+    TodoListResponse,
+    TodoSparse,
+    TodoSparseListResponse,
+    TodoStatus,
+    TodoBulkCreate,
+    TodoBulkCreateResponse,
+    TodoBulkUpdate,
+    TodoBulkResult,
+    TodoSelection,
+    TodoChangesResponse,
+    TodoImportJob,
+    TodoStats
+)
 from app.models.user import UserResponse
-from app.services.todo_service import todo_service
-from app.core.dependencies import get_current_active_user
+from app.services.todo_service import InvalidFieldsError, todo_service
+from app.services.import_service import todo_import_service
+from app.services.stats_service import stats_service
+from app.services.pagination import InvalidCursorError
+from app.core.dependencies import check_not_modified, get_current_active_user
 from app.core.database import get_db
+from app.core.config import settings
+from app.core.responses import gzip_stream, trusted_json_response
 import logging
 
 logger = logging.getLogger(__name__)
@@ -16,7 +39,7 @@ router = APIRouter()
 async def create_todo(
     todo_data: TodoCreate,
     current_user: UserResponse = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Create a new todo"""
     try:
@@ -36,23 +59,144 @@ async def create_todo(
             detail="Internal server error"
         )
 
-@router.get("", response_model=TodoListResponse)
+@router.post("/bulk", response_model=TodoBulkCreateResponse, status_code=status.HTTP_201_CREATED)
+async def create_todos_bulk(
+    bulk_data: TodoBulkCreate,
+    current_user: UserResponse = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Create up to TODO_BULK_MAX_ITEMS todos in one transaction.
+    With all_or_nothing (default) any invalid item rejects the whole batch;
+    otherwise valid items are created and invalid ones reported by index.
+    """
+    if len(bulk_data.items) > settings.TODO_BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {settings.TODO_BULK_MAX_ITEMS} items per request"
+        )
+
+    valid, errors = todo_service.validate_bulk_items(bulk_data.items)
+    if errors and (bulk_data.all_or_nothing or not valid):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail={
+                "message": "Invalid items",
+                "errors": [error.model_dump() for error in errors]
+            }
+        )
+
+    try:
+        created = await todo_service.create_todos(current_user.id, valid, db)
+        if created is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Failed to create todos"
+            )
+        return TodoBulkCreateResponse(created=created, errors=errors)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error bulk creating todos: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error"
+        )
+
+def check_bulk_selection(selection: TodoSelection) -> None:
+    """Apply the bulk item limit to explicit id lists"""
+    if selection.ids is not None and len(selection.ids) > settings.TODO_BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {settings.TODO_BULK_MAX_ITEMS} ids per request"
+        )
+
+@router.patch("/bulk", response_model=TodoBulkResult)
+async def update_todos_bulk(
+    bulk_update: TodoBulkUpdate,
+    current_user: UserResponse = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Apply changes (or toggle=true) to todos selected by ids or by the
+    GET /api/todos filters, in one UPDATE
+    """
+    check_bulk_selection(bulk_update)
+    try:
+        affected = await todo_service.update_todos(current_user.id, bulk_update, db)
+        if affected is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Failed to update todos"
+            )
+        return TodoBulkResult(affected=affected)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error bulk updating todos: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error"
+        )
+
+@router.delete("/bulk", response_model=TodoBulkResult)
+async def delete_todos_bulk(
+    selection: TodoSelection,
+    current_user: UserResponse = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Delete todos selected by ids or by the GET /api/todos filters, in one DELETE"""
+    check_bulk_selection(selection)
+    try:
+        affected = await todo_service.delete_todos(current_user.id, selection, db)
+        if affected is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Failed to delete todos"
+            )
+        return TodoBulkResult(affected=affected)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error bulk deleting todos: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error"
+        )
+
+# fields= responses carry only the requested item fields (TodoSparse)
+@router.get(
+    "",
+    response_model=Union[TodoListResponse, TodoSparseListResponse],
+    dependencies=[Depends(check_not_modified)]
+)
 async def get_todos(
+    response: Response,
     page: int = Query(1, ge=1),
     per_page: int = Query(20, ge=1, le=100),
-    status: Optional[TodoStatus] = None,
-    sort_by: str = Query("created_at", pattern="^(created_at|due_date|priority|title)$"),
+    todo_status: Optional[TodoStatus] = Query(None, alias="status"),
+    sort_by: str = Query("created_at", pattern="^(created_at|due_date|priority|title|relevance)$"),
     sort_order: str = Query("desc", pattern="^(asc|desc)$"),
     search: Optional[str] = None,
     priority: Optional[str] = None,
     category_ids: Optional[str] = None,
-    due_date_from: Optional[str] = None,
-    due_date_to: Optional[str] = None,
+    due_date_from: Optional[datetime] = None,
+    due_date_to: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    include_total: bool = True,
+    fields: Optional[str] = None,
     current_user: UserResponse = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    """Get todos for current user with pagination and filters"""
+    """
+    Get todos for current user with pagination and filters.
+    Pass next_cursor back as cursor for keyset paging; include_total=false
+    skips the count query. sort_by=relevance ranks search matches (page mode only).
+    fields=title,status,... returns (and loads) only those item fields plus id.
+    """
     try:
+        selected_fields = todo_service.parse_fields(fields)
+
         # Parse category_ids if provided
         parsed_category_ids = None
         if category_ids:
@@ -63,16 +207,31 @@ async def get_todos(
             db=db,
             page=page,
             per_page=per_page,
-            status=status,
+            status=todo_status,
             sort_by=sort_by,
             sort_order=sort_order,
             search=search,
             priority=priority,
             category_ids=parsed_category_ids,
             due_date_from=due_date_from,
-            due_date_to=due_date_to
+            due_date_to=due_date_to,
+            cursor=cursor,
+            include_total=include_total,
+            fields=selected_fields
         )
-        return TodoListResponse(**result)
+        if result is None:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Internal server error"
+            )
+        return trusted_json_response(result, response)
+    except (InvalidCursorError, InvalidFieldsError) as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error getting todos: {e}")
         raise HTTPException(
@@ -80,23 +239,180 @@ async def get_todos(
             detail="Internal server error"
         )
 
-@router.get("/{todo_id}", response_model=TodoResponse)
+@router.get("/export")
+async def export_todos(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    gzip: bool = False,
+    todo_status: Optional[TodoStatus] = Query(None, alias="status"),
+    sort_by: str = Query("created_at", pattern="^(created_at|due_date|priority|title|relevance)$"),
+    sort_order: str = Query("desc", pattern="^(asc|desc)$"),
+    search: Optional[str] = None,
+    priority: Optional[str] = None,
+    category_ids: Optional[str] = None,
+    due_date_from: Optional[datetime] = None,
+    due_date_to: Optional[datetime] = None,
+    current_user: UserResponse = Depends(get_current_active_user)
+):
+    """
+    Stream every todo matching the GET /api/todos filters as NDJSON (one
+    TodoResponse per line) or CSV, optionally gzip-compressed on the fly
+    """
+    parsed_category_ids = None
+    if category_ids:
+        parsed_category_ids = [id.strip() for id in category_ids.split(',') if id.strip()]
+
+    try:
+        # Built before the response starts, so failures can still answer 500
+        chunks = todo_service.export_todos(
+            current_user.id,
+            format=format,
+            sort_by=sort_by,
+            sort_order=sort_order,
+            status=todo_status,
+            search=search,
+            priority=priority,
+            category_ids=parsed_category_ids,
+            due_date_from=due_date_from,
+            due_date_to=due_date_to
+        )
+    except Exception as e:
+        logger.error(f"Error exporting todos: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error"
+        )
+    media_type = "application/x-ndjson" if format == "ndjson" else "text/csv; charset=utf-8"
+    filename = f"todos.{format}"
+    if gzip:
+        chunks = gzip_stream(chunks)
+        media_type = "application/gzip"
+        filename += ".gz"
+
+    return StreamingResponse(
+        chunks,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+@router.get("/stats", response_model=TodoStats)
+async def get_todo_stats(
+    current_user: UserResponse = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Totals by status, priority and category plus the overdue count, read
+    from counters kept up to date by every write (cost independent of list size)
+    """
+    stats = await stats_service.get_stats(current_user.id, db)
+    if stats is None:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error"
+        )
+    return stats
+
+@router.post("/import", response_model=TodoImportJob, status_code=status.HTTP_201_CREATED)
+async def import_todos(
+    request: Request,
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    current_user: UserResponse = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Import todos from a raw NDJSON or CSV body (as GET /export writes them),
+    read while it uploads. Categories are given by name. Rows that fail
+    validation are skipped and reported; returns the finished job.
+    """
+    job = await todo_import_service.create_job(current_user.id, format, db)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error"
+        )
+    job = await todo_import_service.run(job, request.stream(), db)
+    return todo_import_service.to_response(job)
+
+@router.get("/import", response_model=List[TodoImportJob])
+async def get_import_jobs(
+    current_user: UserResponse = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """The user's most recent imports, newest first"""
+    jobs = await todo_import_service.get_jobs(current_user.id, db)
+    return [todo_import_service.to_response(job) for job in jobs]
+
+@router.get("/import/{job_id}", response_model=TodoImportJob)
+async def get_import_job(
+    job_id: str,
+    current_user: UserResponse = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Progress of an import, including while it is still running"""
+    job = await todo_import_service.get_job(job_id, current_user.id, db)
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Import job not found"
+        )
+    return todo_import_service.to_response(job)
+
+@router.get("/changes", response_model=TodoChangesResponse, dependencies=[Depends(check_not_modified)])
+async def get_changes(
+    response: Response,
+    since: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=500),
+    current_user: UserResponse = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Incremental sync: todos and categories created or updated, and
+    tombstones of deleted ones, since a cursor. Omit since for a full
+    snapshot; pass next_cursor back as since and repeat while has_more.
+    """
+    try:
+        changes = await todo_service.get_changes(current_user.id, db, since=since, limit=limit)
+        if changes is None:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Internal server error"
+            )
+        return trusted_json_response(changes, response)
+    except InvalidCursorError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+@router.get(
+    "/{todo_id}",
+    response_model=Union[TodoResponse, TodoSparse],
+    dependencies=[Depends(check_not_modified)]
+)
 async def get_todo(
     todo_id: str,
+    response: Response,
+    fields: Optional[str] = None,
     current_user: UserResponse = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    """Get a specific todo by ID"""
+    """Get a specific todo by ID (fields= as for the list)"""
     try:
-        todo = await todo_service.get_todo_by_id(todo_id, current_user.id, db)
+        todo = await todo_service.get_todo_by_id(
+            todo_id, current_user.id, db, fields=todo_service.parse_fields(fields)
+        )
         if not todo:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Todo not found"
             )
-        return todo
+        return trusted_json_response(todo, response)
     except HTTPException:
         raise
+    except InvalidFieldsError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     except Exception as e:
         logger.error(f"Error getting todo: {e}")
         raise HTTPException(
@@ -109,7 +425,7 @@ async def update_todo(
     todo_id: str,
     todo_update: TodoUpdate,
     current_user: UserResponse = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Update a todo"""
     try:
@@ -133,7 +449,7 @@ async def update_todo(
 async def delete_todo(
     todo_id: str,
     current_user: UserResponse = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Delete a todo"""
     try:
@@ -157,7 +473,7 @@ async def delete_todo(
 async def toggle_todo_status(
     todo_id: str,
     current_user: UserResponse = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Toggle todo status between pending and completed"""
     try:
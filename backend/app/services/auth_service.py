@@ -1,38 +1,49 @@
 from typing import Optional
-from sqlalchemy.orm import Session
+from sqlalchemy import delete, event, insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.user import UserCreate, UserInDB, UserResponse, UserCreateFromGoogle
 from app.models.db_models import User
-from app.core.security import get_password_hash, verify_password, create_access_token
+from app.core.security import (
+    create_access_token,
+    decode_token,
+    password_hasher,
+    PasswordHasherBusyError
+)
 from app.core.database import get_db
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.services.category_service import category_service
 from datetime import datetime, timedelta
 import uuid
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Resolved users keyed by (user_id, jti) so each token is looked up once
+user_cache = TTLCache(
+    max_size=settings.USER_CACHE_MAX_SIZE,
+    ttl_seconds=settings.USER_CACHE_TTL_SECONDS
+)
+
 class AuthService:
     def __init__(self):
-        pass
+        self.user_cache = user_cache
     
-    async def create_user(self, user_data: UserCreate, db: Session) -> Optional[UserResponse]:
+    async def create_user(self, user_data: UserCreate, db: AsyncSession) -> Optional[UserResponse]:
         """Create a new user"""
         try:
-            # Check if user already exists
-            existing_user = db.query(User).filter(User.email == user_data.email).first()
-            if existing_user:
-                return None
-            
-            # Create new user
-            hashed_password = get_password_hash(user_data.password)
-            db_user = User(
-                email=user_data.email,
-                username=user_data.username,
-                hashed_password=hashed_password
+            # Create new user; the unique email index rejects duplicates
+            hashed_password = await password_hasher.hash(user_data.password)
+            db_user = await db.scalar(
+                insert(User).values(
+                    email=user_data.email,
+                    username=user_data.username,
+                    hashed_password=hashed_password
+                ).returning(User)
             )
-            
-            db.add(db_user)
-            db.commit()
-            db.refresh(db_user)
+            await category_service.seed_default_categories(db_user.id, db)
+            await db.commit()
             
             return UserResponse(
                 id=db_user.id,
@@ -42,23 +53,29 @@ class AuthService:
                 is_active=db_user.is_active
             )
             
+        except IntegrityError:
+            # Email already registered
+            await db.rollback()
+            return None
+        except PasswordHasherBusyError:
+            raise
         except Exception as e:
             logger.error(f"Error creating user: {e}")
-            db.rollback()
+            await db.rollback()
             return None
     
-    async def get_user_by_email(self, email: str, db: Session) -> Optional[User]:
+    async def get_user_by_email(self, email: str, db: AsyncSession) -> Optional[User]:
         """Get user by email"""
         try:
-            return db.query(User).filter(User.email == email).first()
+            return await db.scalar(select(User).where(User.email == email))
         except Exception as e:
             logger.error(f"Error getting user by email: {e}")
             return None
     
-    async def get_user_by_id(self, user_id: str, db: Session) -> Optional[UserResponse]:
+    async def get_user_by_id(self, user_id: str, db: AsyncSession) -> Optional[UserResponse]:
         """Get user by ID"""
         try:
-            db_user = db.query(User).filter(User.id == user_id).first()
+            db_user = await db.scalar(select(User).where(User.id == user_id))
             if db_user:
                 return UserResponse(
                     id=db_user.id,
@@ -73,13 +90,55 @@ class AuthService:
             logger.error(f"Error getting user by ID: {e}")
             return None
     
-    async def authenticate_user(self, email: str, password: str, db: Session) -> Optional[User]:
+    async def get_user_for_token(self, token: str, db: AsyncSession) -> Optional[UserResponse]:
+        """Resolve the user for an access token, using the user cache"""
+        payload = decode_token(token)
+        if payload is None:
+            return None
+        
+        cache_key = (payload["sub"], payload.get("jti"))
+        user = self.user_cache.get(cache_key)
+        if user is not None:
+            return user
+        
+        user = await self.get_user_by_id(payload["sub"], db)
+        if user is not None:
+            self.user_cache.set(cache_key, user)
+        return user
+    
+    def invalidate_user(self, user_id: str) -> None:
+        """Drop cached entries for a user after it was changed or deactivated"""
+        self.user_cache.invalidate_where(lambda key: key[0] == user_id)
+    
+    async def delete_user(self, user_id: str, db: AsyncSession) -> bool:
+        """
+        Delete a user with one statement: its todos, categories, links,
+        tombstones, counters and import jobs go with it (ON DELETE CASCADE)
+        """
+        try:
+            result = await db.execute(
+                delete(User).where(User.id == user_id).execution_options(synchronize_session=False)
+            )
+            if result.rowcount == 0:
+                await db.rollback()
+                return False
+            await db.commit()
+            # Core DELETE: the mapper event below does not fire
+            self.invalidate_user(user_id)
+            category_service.invalidate_user(user_id)
+            return True
+        except Exception as e:
+            logger.error(f"Error deleting user: {e}")
+            await db.rollback()
+            return False
+    
+    async def authenticate_user(self, email: str, password: str, db: AsyncSession) -> Optional[User]:
         """Authenticate user with email and password"""
         user = await self.get_user_by_email(email, db)
         if not user:
             return None
         
-        if not user.hashed_password or not verify_password(password, user.hashed_password):
+        if not user.hashed_password or not await password_hasher.verify(password, user.hashed_password):
             return None
         
         return user
@@ -88,7 +147,7 @@ class AuthService:
         """Create access token for user"""
         return create_access_token(subject=user_id)
     
-    async def get_or_create_google_user(self, user_info: dict, db: Session) -> Optional[UserResponse]:
+    async def get_or_create_google_user(self, user_info: dict, db: AsyncSession) -> Optional[UserResponse]:
         """Get existing user or create new user from Google OAuth"""
         try:
             # Check if user exists by email
@@ -98,7 +157,7 @@ class AuthService:
                 if not existing_user.google_id:
                     existing_user.google_id = user_info['google_id']
                     existing_user.picture = user_info.get('picture', '')
-                    db.commit()
+                    await db.commit()
                 
                 return UserResponse(
                     id=existing_user.id,
@@ -110,17 +169,17 @@ class AuthService:
             
             # Create new user from Google info
             username = user_info.get('name', user_info['email'].split('@')[0])
-            db_user = User(
-                email=user_info['email'],
-                username=username,
-                google_id=user_info['google_id'],
-                picture=user_info.get('picture', ''),
-                hashed_password=None  # No password for OAuth users
+            db_user = await db.scalar(
+                insert(User).values(
+                    email=user_info['email'],
+                    username=username,
+                    google_id=user_info['google_id'],
+                    picture=user_info.get('picture', ''),
+                    hashed_password=None  # No password for OAuth users
+                ).returning(User)
             )
-            
-            db.add(db_user)
-            db.commit()
-            db.refresh(db_user)
+            await category_service.seed_default_categories(db_user.id, db)
+            await db.commit()
             
             return UserResponse(
                 id=db_user.id,
@@ -132,8 +191,13 @@ class AuthService:
             
         except Exception as e:
             logger.error(f"Error getting or creating Google user: {e}")
-            db.rollback()
+            await db.rollback()
             return None
 
 # Singleton instance
-auth_service = AuthService()
\ No newline at end of file
+auth_service = AuthService()
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_cached_user(mapper, connection, target):
+    auth_service.invalidate_user(target.id)
\ No newline at end of file
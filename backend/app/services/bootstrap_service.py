@@ -0,0 +1,48 @@
+from typing import Any, Dict, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.user import UserResponse
+from app.services.category_service import category_service
+from app.services.data_version import data_version_service
+from app.services.stats_service import stats_service
+from app.services.todo_service import todo_service
+import logging
+import math
+
+logger = logging.getLogger(__name__)
+
+
+class BootstrapService:
+    """
+    Initial load of the app in one request. The parts run one after another
+    on the request's session (an AsyncSession runs one statement at a time),
+    each reusing what the previous ones read instead of querying again.
+    """
+
+    async def get_bootstrap(self, user: UserResponse, db: AsyncSession, per_page: int = 20) -> Optional[Dict[str, Any]]:
+        """A BootstrapResponse dict for an already resolved user"""
+        try:
+            # Keys the category cache, as check_not_modified does for /categories
+            version = await data_version_service.get(user.id, db)
+            categories = await category_service.get_categories_by_user(user.id, db, version=version)
+            if categories is None:
+                return None
+            # by_category from the categories just loaded
+            stats = await stats_service.get_stats(user.id, db, categories=categories)
+            if stats is None:
+                return None
+
+            # The unfiltered total is the "total" counter: no count query
+            todos = await todo_service.get_todos(user.id, db, per_page=per_page, include_total=False)
+            if todos is None:
+                return None
+            todos["total"] = stats["total"]
+            todos["pages"] = math.ceil(stats["total"] / per_page)
+
+            return {"user": user, "categories": categories, "todos": todos, "stats": stats}
+        except Exception as e:
+            logger.error(f"Error loading bootstrap data: {e}")
+            return None
+
+
+# Singleton instance
+bootstrap_service = BootstrapService()
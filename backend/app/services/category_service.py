@@ -1,8 +1,8 @@
 import uuid
 from datetime import datetime
-from typing import Optional, List, Dict
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from typing import Optional, List, Dict, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import delete, insert, literal, select, update, Select
 from app.models.category import (
     CategoryCreate, 
     CategoryUpdate, 
@@ -10,117 +10,183 @@ from app.models.category import (
     CategoryInDB,
     default_categories
 )
-from app.models.db_models import Category, Todo
+from app.core.cache import CacheBackend, TTLCache
+from app.core.config import settings
+from app.core.database import dialect_insert
+from app.models.db_models import Category, utcnow
+from app.services.data_version import data_version_service
+from app.services.pagination import keyset_condition, keyset_order
+
+
+# Category lists keyed by (user_id, data_version): every todo/category
+# write bumps the version, so entries never need to be found and updated
+category_cache = TTLCache(
+    max_size=settings.CATEGORY_CACHE_MAX_SIZE,
+    ttl_seconds=settings.CATEGORY_CACHE_TTL_SECONDS
+)
 
 
 class CategoryService:
-    def __init__(self):
-        pass
+    def __init__(self, cache: CacheBackend = category_cache):
+        self.cache = cache
+    
+    def invalidate_user(self, user_id: str) -> None:
+        """Drop a user's cached lists after one of its categories changed"""
+        self.cache.invalidate_where(lambda key: key[0] == user_id)
+    
+    def build_list_query(self, user_id: str) -> Select:
+        """Categories of a user (todo counts are stored on the rows)"""
+        return select(Category).where(Category.user_id == user_id)
+    
+    def _to_response(self, category: Category) -> CategoryResponse:
+        return CategoryResponse(
+            id=category.id,
+            name=category.name,
+            color=category.color,
+            user_id=category.user_id,
+            created_at=category.created_at,
+            updated_at=category.updated_at,
+            todo_count=category.todo_count,
+            completed_count=category.completed_count
+        )
+    
+    async def _get_owned_category(self, category_id: str, user_id: str, db: AsyncSession) -> Optional[Category]:
+        """Load a category belonging to user_id"""
+        return await db.scalar(
+            select(Category).where(
+                Category.id == category_id,
+                Category.user_id == user_id
+            )
+        )
+    
+    async def seed_default_categories(self, user_id: str, db: AsyncSession) -> None:
+        """
+        Insert the default categories of a new user with one multi-row INSERT,
+        skipping names already taken (ON CONFLICT DO NOTHING). Runs inside
+        the caller's transaction, so the user and its defaults commit together.
+        """
+        now = utcnow()
+        await db.execute(
+            dialect_insert(Category)
+            .values([
+                {
+                    "id": str(uuid.uuid4()),
+                    "user_id": user_id,
+                    "name": default["name"],
+                    "color": default["color"],
+                    "created_at": now,
+                    "updated_at": now
+                }
+                for default in default_categories
+            ])
+            .on_conflict_do_nothing(index_elements=[Category.user_id, Category.name])
+        )
     
-    async def create_user_default_categories(self, user_id: str, db: Session) -> List[CategoryResponse]:
-        """Create default categories for a new user"""
-        categories = []
-        for default_cat in default_categories:
-            category_data = CategoryCreate(**default_cat)
-            category = await self.create_category(user_id, category_data, db)
-            if category:
-                categories.append(category)
-        return categories
+    def _name_taken(self, user_id: str, name: str, exclude_id: Optional[str] = None):
+        """EXISTS clause for another category of the user with this name"""
+        query = select(Category.id).where(
+            Category.user_id == user_id,
+            Category.name == name
+        )
+        if exclude_id:
+            query = query.where(Category.id != exclude_id)
+        return query.exists()
     
-    async def create_category(self, user_id: str, category_data: CategoryCreate, db: Session) -> Optional[CategoryResponse]:
-        """Create a new category"""
+    async def create_category(self, user_id: str, category_data: CategoryCreate, db: AsyncSession) -> Optional[CategoryResponse]:
+        """Create a new category (one INSERT ... SELECT ... RETURNING)"""
         try:
-            # Check for duplicate name within user's categories
-            existing = db.query(Category).filter(
-                Category.user_id == user_id,
-                Category.name == category_data.name
-            ).first()
+            await data_version_service.bump(user_id, db)
+            now = utcnow()
+            values = {
+                "id": str(uuid.uuid4()),
+                "user_id": user_id,
+                "name": category_data.name,
+                "color": category_data.color or "#6B7280",
+                "created_at": now,
+                "updated_at": now
+            }
+            columns = Category.__table__.c
             
-            if existing:
+            # Insert only when the name is free, so no separate duplicate check
+            db_category = await db.scalar(
+                insert(Category).from_select(
+                    list(values),
+                    select(
+                        *[literal(value, columns[key].type) for key, value in values.items()]
+                    ).where(~self._name_taken(user_id, category_data.name))
+                ).returning(Category)
+            )
+            
+            if not db_category:
+                await db.rollback()
                 return None  # Duplicate name
             
-            db_category = Category(
-                user_id=user_id,
-                name=category_data.name,
-                color=category_data.color or "#6B7280"
-            )
+            await db.commit()
+            self.invalidate_user(user_id)
             
-            db.add(db_category)
-            db.commit()
-            db.refresh(db_category)
-            
-            # Get todo count for this category
-            todo_count = db.query(Todo).filter(Todo.category_id == db_category.id).count()
-            
-            return CategoryResponse(
-                id=db_category.id,
-                name=db_category.name,
-                color=db_category.color,
-                user_id=db_category.user_id,
-                created_at=db_category.created_at,
-                updated_at=db_category.updated_at,
-                todo_count=todo_count
-            )
+            return self._to_response(db_category)
             
         except Exception as e:
             print(f"Error creating category: {e}")
-            db.rollback()
+            await db.rollback()
             return None
     
-    async def get_categories_by_user(self, user_id: str, db: Session) -> List[CategoryResponse]:
-        """Get all categories for a user"""
+    async def get_categories_by_user(
+        self,
+        user_id: str,
+        db: AsyncSession,
+        version: Optional[int] = None
+    ) -> Optional[List[CategoryResponse]]:
+        """
+        Get all categories for a user, from the cache when the user's data
+        version (pass it if already read, e.g. by check_not_modified) has
+        not moved since they were loaded. None on error.
+        """
         try:
-            # Get categories with todo counts
-            categories_query = db.query(
-                Category,
-                func.count(Todo.id).label('todo_count')
-            ).outerjoin(
-                Todo, Category.id == Todo.category_id
-            ).filter(
-                Category.user_id == user_id
-            ).group_by(Category.id).all()
-            
-            categories = []
-            for category, todo_count in categories_query:
-                categories.append(CategoryResponse(
-                    id=category.id,
-                    name=category.name,
-                    color=category.color,
-                    user_id=category.user_id,
-                    created_at=category.created_at,
-                    updated_at=category.updated_at,
-                    todo_count=todo_count
-                ))
-            
-            return categories
+            if version is None:
+                version = await data_version_service.get(user_id, db)
+            cache_key = (user_id, version)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return list(cached)
+            
+            # Read after the version: a write committing in between can only
+            # make the entry newer than its key, never older
+            categories = (await db.scalars(self.build_list_query(user_id))).all()
+            responses = [self._to_response(category) for category in categories]
+            self.cache.set(cache_key, tuple(responses))
+            return responses
             
         except Exception as e:
+            # Not an empty list: that would be cached under the data version ETag
             print(f"Error getting user categories: {e}")
-            return []
+            return None
     
-    async def get_category_by_id(self, category_id: str, user_id: str, db: Session) -> Optional[CategoryResponse]:
+    async def get_changed_categories(
+        self,
+        user_id: str,
+        after: Optional[Tuple[datetime, str]],
+        limit: int,
+        db: AsyncSession
+    ) -> List[CategoryResponse]:
+        """Categories updated after an (updated_at, id) position, oldest first"""
+        query = self.build_list_query(user_id)
+        if after:
+            query = query.where(keyset_condition(Category.updated_at, Category.id, *after, descending=False))
+        categories = (await db.scalars(
+            query.order_by(*keyset_order(Category.updated_at, Category.id, False)).limit(limit)
+        )).all()
+        return [self._to_response(category) for category in categories]
+    
+    async def get_category_by_id(self, category_id: str, user_id: str, db: AsyncSession) -> Optional[CategoryResponse]:
         """Get a specific category by ID"""
         try:
-            category = db.query(Category).filter(
-                Category.id == category_id,
-                Category.user_id == user_id
-            ).first()
+            category = await self._get_owned_category(category_id, user_id, db)
             
             if not category:
                 return None
             
-            # Get todo count
-            todo_count = db.query(Todo).filter(Todo.category_id == category_id).count()
-            
-            return CategoryResponse(
-                id=category.id,
-                name=category.name,
-                color=category.color,
-                user_id=category.user_id,
-                created_at=category.created_at,
-                updated_at=category.updated_at,
-                todo_count=todo_count
-            )
+            return self._to_response(category)
             
         except Exception as e:
             print(f"Error getting category: {e}")
@@ -131,79 +197,74 @@ class CategoryService:
         category_id: str, 
         user_id: str, 
         category_update: CategoryUpdate,
-        db: Session
+        db: AsyncSession
     ) -> Optional[CategoryResponse]:
-        """Update a category"""
+        """Update a category (one UPDATE ... RETURNING)"""
         try:
-            category = db.query(Category).filter(
+            await data_version_service.bump(user_id, db)
+            # Only mapped columns (CategoryUpdate.description has none)
+            columns = Category.__table__.c
+            update_data = {
+                key: value for key, value in category_update.model_dump(exclude_unset=True).items()
+                if key in columns
+            }
+            statement = update(Category).where(
                 Category.id == category_id,
                 Category.user_id == user_id
-            ).first()
+            )
+            
+            # Duplicate names leave the row unmatched
+            if 'name' in update_data:
+                statement = statement.where(
+                    ~self._name_taken(user_id, update_data['name'], exclude_id=category_id)
+                )
+            
+            # Nothing to change: still match the row, keeping updated_at as it was
+            values = update_data or {"updated_at": Category.updated_at}
+            category = await db.scalar(
+                statement.values(**values)
+                .returning(Category)
+                .execution_options(populate_existing=True)
+            )
             
             if not category:
+                await db.rollback()
                 return None
             
-            # Check for duplicate name if name is being updated
-            update_data = category_update.model_dump(exclude_unset=True)
-            if 'name' in update_data:
-                existing = db.query(Category).filter(
-                    Category.user_id == user_id,
-                    Category.name == update_data['name'],
-                    Category.id != category_id
-                ).first()
-                
-                if existing:
-                    return None  # Duplicate name
-            
-            # Update fields
-            for field, value in update_data.items():
-                setattr(category, field, value)
-            
-            db.commit()
-            db.refresh(category)
-            
-            # Get todo count
-            todo_count = db.query(Todo).filter(Todo.category_id == category_id).count()
-            
-            return CategoryResponse(
-                id=category.id,
-                name=category.name,
-                color=category.color,
-                user_id=category.user_id,
-                created_at=category.created_at,
-                updated_at=category.updated_at,
-                todo_count=todo_count
-            )
+            await db.commit()
+            self.invalidate_user(user_id)
+            return self._to_response(category)
             
         except Exception as e:
             print(f"Error updating category: {e}")
-            db.rollback()
+            await db.rollback()
             return None
     
-    async def delete_category(self, category_id: str, user_id: str, db: Session) -> bool:
-        """Delete a category"""
+    async def delete_category(self, category_id: str, user_id: str, db: AsyncSession) -> bool:
+        """
+        Delete a category (its todo links go with it, ON DELETE CASCADE),
+        leaving a tombstone for the change feed
+        """
         try:
-            category = db.query(Category).filter(
-                Category.id == category_id,
-                Category.user_id == user_id
-            ).first()
+            await data_version_service.bump(user_id, db)
+            result = await db.execute(
+                delete(Category)
+                .where(Category.id == category_id, Category.user_id == user_id)
+                .execution_options(synchronize_session=False)
+            )
             
-            if not category:
+            if result.rowcount == 0:
+                await db.rollback()
                 return False
             
-            # Set todos in this category to have no category
-            db.query(Todo).filter(Todo.category_id == category_id).update(
-                {Todo.category_id: None}
-            )
-            
-            # Delete the category
-            db.delete(category)
-            db.commit()
+            await data_version_service.record_deletions(user_id, "category", [category_id], db)
+            await db.commit()
+            self.invalidate_user(user_id)
             return True
             
         except Exception as e:
             print(f"Error deleting category: {e}")
-            db.rollback()
+            await db.rollback()
             return False
 
 
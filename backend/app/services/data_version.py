@@ -0,0 +1,67 @@
+from typing import List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import insert, select, update
+from app.models.db_models import Tombstone, User, utcnow
+import hashlib
+import uuid
+
+
+class DataVersionService:
+    """
+    Per-user counter bumped in the same transaction as every todo/category
+    write. Reads derive a weak ETag from it, so an unchanged list or detail
+    can be answered with 304 after a primary key lookup on users.
+    """
+
+    # Tombstone rows per INSERT
+    CHUNK_SIZE = 500
+
+    async def bump(self, user_id: str, db: AsyncSession) -> None:
+        """
+        Increment the user's version. Call it before the write: the row lock
+        orders a user's writes, so updated_at values (taken afterwards)
+        follow commit order, which the change feed cursor relies on.
+        Callers commit with their write, or roll back to undo the bump.
+        """
+        await db.execute(
+            update(User)
+            .where(User.id == user_id)
+            # Not a profile change: keep users.updated_at (onupdate) as it was
+            .values(data_version=User.data_version + 1, updated_at=User.updated_at)
+            .execution_options(synchronize_session=False)
+        )
+
+    async def record_deletions(self, user_id: str, entity: str, ids: List[str], db: AsyncSession) -> None:
+        """Tombstones for deleted todos/categories, read by the change feed"""
+        deleted_at = utcnow()
+        for start in range(0, len(ids), self.CHUNK_SIZE):
+            await db.execute(insert(Tombstone).values([
+                {
+                    "id": str(uuid.uuid4()),
+                    "user_id": user_id,
+                    "entity": entity,
+                    "entity_id": entity_id,
+                    "deleted_at": deleted_at
+                }
+                for entity_id in ids[start:start + self.CHUNK_SIZE]
+            ]))
+
+    async def get(self, user_id: str, db: AsyncSession) -> Optional[int]:
+        """Current version, or None for an unknown user"""
+        return await db.scalar(select(User.data_version).where(User.id == user_id))
+
+    def etag(self, version: int, user_id: str, resource: str) -> str:
+        """Weak ETag for one user's view of a resource (path and query) at a version"""
+        digest = hashlib.sha256(f"{user_id}\n{resource}".encode()).hexdigest()[:16]
+        return f'W/"{version}-{digest}"'
+
+    def matches(self, if_none_match: Optional[str], etag: str) -> bool:
+        """Weak comparison against an If-None-Match header value"""
+        if not if_none_match:
+            return False
+        candidates = [tag.strip() for tag in if_none_match.split(",")]
+        return "*" in candidates or any(tag.removeprefix("W/") == etag.removeprefix("W/") for tag in candidates)
+
+
+# Singleton instance
+data_version_service = DataVersionService()
@@ -1,32 +1,160 @@
+from google.auth import jwt as google_jwt
 from google.auth.transport import requests
-from google.oauth2 import id_token
-from typing import Optional, Dict, Any
+from jose import jwk, jwt as jose_jwt
+from typing import Optional, Dict, Any, Callable
 from app.core.config import settings
+import asyncio
+import json
 import logging
+import re
+import threading
+import time
+import requests as http_requests
 
 logger = logging.getLogger(__name__)
 
+GOOGLE_ISSUERS = ['accounts.google.com', 'https://accounts.google.com']
+
+class GoogleKeyCache:
+    """
+    Google signing keys keyed by kid, shared across requests.
+    Keys are kept for the Cache-Control max-age of the certificate response
+    and refreshed in the background shortly before they expire.
+    """
+
+    def __init__(
+        self,
+        certs_url: str,
+        request: Optional[Callable[..., Any]] = None,
+        clock: Callable[[], float] = time.time,
+        refresh_margin_seconds: float = 300,
+        min_refresh_interval_seconds: float = 30,
+        default_max_age_seconds: float = 3600
+    ):
+        self.certs_url = certs_url
+        # One HTTP session for all fetches so connections are reused
+        self._request = request or requests.Request(session=http_requests.Session())
+        self._clock = clock
+        self.refresh_margin_seconds = refresh_margin_seconds
+        self.min_refresh_interval_seconds = min_refresh_interval_seconds
+        self.default_max_age_seconds = default_max_age_seconds
+        self._lock = threading.Lock()
+        self._keys: Optional[Dict[str, str]] = None
+        self._expires_at = 0.0
+        self._fetched_at = 0.0
+        self._refresh_thread: Optional[threading.Thread] = None
+        self.fetches = 0
+        self.fetch_errors = 0
+
+    def get_key(self, kid: Optional[str]) -> Optional[str]:
+        """Return the PEM key for kid, fetching or refreshing as needed"""
+        now = self._clock()
+        if self._keys is None or now >= self._expires_at:
+            self.refresh()
+        elif now >= self._expires_at - self.refresh_margin_seconds:
+            self._refresh_in_background()
+
+        keys = self._keys or {}
+        if kid is None and len(keys) == 1:
+            return next(iter(keys.values()))
+        key = keys.get(kid)
+        if key is None:
+            # Unknown kid: keys may have rotated before max-age ran out
+            self.refresh(force=True)
+            key = (self._keys or {}).get(kid)
+        return key
+
+    def refresh(self, force: bool = False) -> None:
+        """
+        Fetch the current keys and cache them for max-age seconds.
+        Skipped when another caller already refreshed; forced refreshes
+        are limited to one per min_refresh_interval_seconds.
+        """
+        with self._lock:
+            now = self._clock()
+            if self._keys is not None:
+                if force and now - self._fetched_at < self.min_refresh_interval_seconds:
+                    return
+                if not force and now < self._expires_at - self.refresh_margin_seconds:
+                    return
+
+            try:
+                response = self._request(self.certs_url, method="GET")
+                if response.status != 200:
+                    raise ValueError(f"Could not fetch certificates: HTTP {response.status}")
+                keys = self._parse_keys(json.loads(response.data.decode("utf-8")))
+            except Exception as e:
+                self.fetch_errors += 1
+                self._fetched_at = now
+                logger.error(f"Error fetching Google certificates: {e}")
+                if self._keys is None:
+                    raise
+                return
+
+            self._keys = keys
+            self._fetched_at = now
+            self._expires_at = now + self._max_age(response.headers)
+            self.fetches += 1
+
+    def _refresh_in_background(self) -> None:
+        with self._lock:
+            if self._refresh_thread is not None and self._refresh_thread.is_alive():
+                return
+            self._refresh_thread = threading.Thread(
+                target=self.refresh,
+                name="google-key-refresh",
+                daemon=True
+            )
+            self._refresh_thread.start()
+
+    def _max_age(self, headers: Any) -> float:
+        cache_control = (headers or {}).get("cache-control") or (headers or {}).get("Cache-Control") or ""
+        match = re.search(r"max-age=(\d+)", cache_control)
+        return float(match.group(1)) if match else self.default_max_age_seconds
+
+    def _parse_keys(self, body: Dict[str, Any]) -> Dict[str, str]:
+        """Accept both {kid: x509 PEM} and JWKS ({"keys": [...]}) responses"""
+        if "keys" not in body:
+            return dict(body)
+        return {
+            key["kid"]: jwk.construct(key, algorithm=key.get("alg", "RS256")).to_pem().decode("utf-8")
+            for key in body["keys"]
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        """Return fetch counters and cache state"""
+        return {
+            "keys": len(self._keys or {}),
+            "fetches": self.fetches,
+            "fetch_errors": self.fetch_errors,
+            "expires_in_seconds": max(self._expires_at - self._clock(), 0.0)
+        }
+
 class GoogleAuthService:
-    def __init__(self):
+    def __init__(self, key_cache: Optional[GoogleKeyCache] = None):
         self.client_id = settings.GOOGLE_CLIENT_ID
-        
+        self.key_cache = key_cache or GoogleKeyCache(settings.GOOGLE_CERTS_URL)
+
     def verify_google_token(self, token: str) -> Optional[Dict[str, Any]]:
         """
         Verify Google ID token and return user info
         """
         try:
+            # Look up the signing key for this token
+            kid = jose_jwt.get_unverified_header(token).get("kid")
+            key = self.key_cache.get_key(kid)
+            if key is None:
+                logger.error("Unknown signing key")
+                return None
+
             # Verify the token
-            idinfo = id_token.verify_oauth2_token(
-                token, 
-                requests.Request(), 
-                self.client_id
-            )
-            
+            idinfo = google_jwt.decode(token, certs=key, audience=self.client_id)
+
             # Verify the issuer
-            if idinfo['iss'] not in ['accounts.google.com', 'https://accounts.google.com']:
+            if idinfo['iss'] not in GOOGLE_ISSUERS:
                 logger.error("Wrong issuer")
                 return None
-                
+
             # Token is valid, return user info
             return {
                 'google_id': idinfo['sub'],
@@ -35,7 +163,7 @@ class GoogleAuthService:
                 'picture': idinfo.get('picture', ''),
                 'email_verified': idinfo.get('email_verified', False)
             }
-            
+
         except ValueError as e:
             logger.error(f"Invalid token: {e}")
             return None
@@ -43,4 +171,8 @@ class GoogleAuthService:
             logger.error(f"Error verifying Google token: {e}")
             return None
 
-google_auth_service = GoogleAuthService()
\ No newline at end of file
+    async def verify_google_token_async(self, token: str) -> Optional[Dict[str, Any]]:
+        """Verify Google ID token on a worker thread"""
+        return await asyncio.to_thread(self.verify_google_token, token)
+
+google_auth_service = GoogleAuthService()
@@ -0,0 +1,271 @@
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from pydantic import ValidationError
+from app.core.config import settings
+from app.models.todo import TodoBulkError, TodoCreate, TodoImportJob
+from app.models.db_models import Category, ImportJob, utcnow
+from app.services.data_version import data_version_service
+from app.services.todo_service import todo_service
+import codecs
+import csv
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+# A parsed row: the raw item, or the errors that stopped it being read
+Row = Tuple[Any, Optional[List[Dict[str, Any]]]]
+
+
+class RowTooLongError(ValueError):
+    """Raised when a CSV record outgrows TODO_IMPORT_MAX_ROW_SIZE"""
+    pass
+
+
+class TodoImportService:
+    """
+    Imports todos from NDJSON or CSV request bodies while they upload: rows
+    are parsed incrementally, validated against TodoCreate and inserted
+    TODO_IMPORT_BATCH_SIZE at a time. Each batch commits together with the
+    job's progress, so GET /api/todos/import/{id} can follow along.
+    """
+
+    FORMATS = ("ndjson", "csv")
+    # Columns the CSV export writes that are not part of TodoCreate
+    CSV_IGNORED_COLUMNS = {"id", "created_at", "updated_at"}
+    CSV_CATEGORY_SEPARATOR = ";"
+
+    async def create_job(self, user_id: str, format: str, db: AsyncSession) -> Optional[ImportJob]:
+        """Record a running job, committed so it can be polled straight away"""
+        try:
+            job = ImportJob(user_id=user_id, format=format, status="running", errors=[])
+            db.add(job)
+            await db.commit()
+            return job
+        except Exception as e:
+            logger.error(f"Error creating import job: {e}")
+            await db.rollback()
+            return None
+
+    async def get_job(self, job_id: str, user_id: str, db: AsyncSession) -> Optional[ImportJob]:
+        return await db.scalar(
+            select(ImportJob).where(ImportJob.id == job_id, ImportJob.user_id == user_id)
+        )
+
+    async def get_jobs(self, user_id: str, db: AsyncSession, limit: int = 20) -> List[ImportJob]:
+        """The user's most recent jobs, newest first"""
+        return (await db.scalars(
+            select(ImportJob)
+            .where(ImportJob.user_id == user_id)
+            .order_by(ImportJob.created_at.desc(), ImportJob.id.desc())
+            .limit(limit)
+        )).all()
+
+    def _parse_json(self, line: bytes) -> Row:
+        try:
+            return json.loads(line), None
+        except ValueError as e:
+            return None, [{"loc": [], "msg": f"Invalid JSON: {e}", "type": "json_invalid"}]
+
+    def _line_too_long(self) -> Row:
+        limit = settings.TODO_IMPORT_MAX_ROW_SIZE
+        return None, [{"loc": [], "msg": f"Line is longer than {limit} bytes", "type": "line_too_long"}]
+
+    async def _ndjson_rows(self, chunks: AsyncIterator[bytes]) -> AsyncIterator[Row]:
+        """
+        One row per non-blank line. A line longer than TODO_IMPORT_MAX_ROW_SIZE
+        is a row error; it is dropped as it arrives rather than buffered whole.
+        """
+        limit = settings.TODO_IMPORT_MAX_ROW_SIZE
+        pending = b""
+        # pending continues a line already known to be too long
+        oversized = False
+        async for chunk in chunks:
+            *lines, pending = (pending + chunk).split(b"\n")
+            for line in lines:
+                if oversized or len(line) > limit:
+                    oversized = False
+                    yield self._line_too_long()
+                elif line.strip():
+                    yield self._parse_json(line)
+            if len(pending) > limit:
+                pending, oversized = b"", True
+        if oversized or len(pending) > limit:
+            yield self._line_too_long()
+        elif pending.strip():
+            yield self._parse_json(pending)
+
+    def _csv_item(self, header: List[str], values: List[str]) -> Row:
+        if len(values) > len(header):
+            return None, [{"loc": [], "msg": "Row has more values than the header", "type": "csv_columns"}]
+        # Empty cells are missing values, so column defaults apply
+        item = {
+            column: value for column, value in zip(header, values)
+            if value != "" and column not in self.CSV_IGNORED_COLUMNS
+        }
+        if "categories" in item:
+            item["categories"] = [
+                name.strip() for name in item["categories"].split(self.CSV_CATEGORY_SEPARATOR) if name.strip()
+            ]
+        if "category_ids" in item:
+            item["category_ids"] = [
+                category_id.strip() for category_id in item["category_ids"].split(self.CSV_CATEGORY_SEPARATOR)
+                if category_id.strip()
+            ]
+        return item, None
+
+    async def _csv_rows(self, chunks: AsyncIterator[bytes]) -> AsyncIterator[Row]:
+        """
+        One row per CSV record after the header. Lines are gathered until
+        their quotes balance, so quoted values may contain newlines. A record
+        longer than TODO_IMPORT_MAX_ROW_SIZE fails the job: with a quote left
+        open there is no telling where the next record starts.
+        """
+        decoder = codecs.getincrementaldecoder("utf-8-sig")()
+        limit = settings.TODO_IMPORT_MAX_ROW_SIZE
+
+        async def records() -> AsyncIterator[str]:
+            record = pending = ""
+            async for chunk in chunks:
+                *lines, pending = (pending + decoder.decode(chunk)).split("\n")
+                for line in lines:
+                    record += line + "\n"
+                    if record.count('"') % 2 == 0:
+                        yield record
+                        record = ""
+                if len(record) + len(pending) > limit:
+                    raise RowTooLongError(f"A CSV record is longer than {limit} characters")
+            record += pending + decoder.decode(b"", final=True)
+            if record:
+                yield record
+
+        header = None
+        async for record in records():
+            values = next(csv.reader([record]), [])
+            if not any(value.strip() for value in values):
+                continue
+            if header is None:
+                header = [column.strip().lower() for column in values]
+            else:
+                yield self._csv_item(header, values)
+
+    async def _category_lookup(self, user_id: str, db: AsyncSession) -> Tuple[Dict[str, Category], Dict[str, Category]]:
+        """The user's categories by id and by name, read once per import"""
+        categories = (await db.scalars(select(Category).where(Category.user_id == user_id))).all()
+        return (
+            {category.id: category for category in categories},
+            {category.name: category for category in categories}
+        )
+
+    def _resolve_categories(
+        self,
+        item: Any,
+        by_id: Dict[str, Category],
+        by_name: Dict[str, Category]
+    ) -> Row:
+        """
+        Turn a categories list (names, or chips as exported) into category_ids.
+        Chips of another account match by name; unknown names are row errors.
+        """
+        if not isinstance(item, dict) or "categories" not in item:
+            return item, None
+        item = dict(item)
+        entries = item.pop("categories") or []
+        if not isinstance(entries, list):
+            return None, [{"loc": ["categories"], "msg": "Categories must be a list", "type": "list_type"}]
+
+        category_ids = item.get("category_ids") or []
+        if not isinstance(category_ids, list):
+            return None, [{"loc": ["category_ids"], "msg": "Input should be a valid list", "type": "list_type"}]
+        category_ids = list(category_ids)
+        for entry in entries:
+            category_id, name = (entry.get("id"), entry.get("name")) if isinstance(entry, dict) else (None, entry)
+            if not all(value is None or isinstance(value, str) for value in (category_id, name)):
+                return None, [{
+                    "loc": ["categories"],
+                    "msg": "Categories must be names or {id, name} objects",
+                    "type": "category_type"
+                }]
+            category = by_id.get(category_id) or by_name.get(name)
+            if category is None:
+                return None, [{"loc": ["categories"], "msg": f"Unknown category: {name}", "type": "category_unknown"}]
+            category_ids.append(category.id)
+        item["category_ids"] = category_ids
+        return item, None
+
+    async def _import_batch(
+        self,
+        job: ImportJob,
+        rows: List[Row],
+        categories: Tuple[Dict[str, Category], Dict[str, Category]],
+        db: AsyncSession
+    ) -> None:
+        """Validate and insert one batch and record the job's progress, in one transaction"""
+        valid = []
+        for index, (item, errors) in enumerate(rows, start=job.processed):
+            if errors is None:
+                item, errors = self._resolve_categories(item, *categories)
+            if errors is None:
+                try:
+                    valid.append(TodoCreate.model_validate(item))
+                    continue
+                except ValidationError as e:
+                    errors = todo_service.validation_errors(e)
+            job.failed += 1
+            if len(job.errors) < settings.TODO_IMPORT_MAX_ERRORS:
+                # A new list, so the JSON column is written
+                job.errors = job.errors + [TodoBulkError(index=index, errors=errors).model_dump()]
+
+        if valid:
+            await data_version_service.bump(job.user_id, db)
+            await todo_service.insert_todos(job.user_id, valid, categories[0], db)
+        job.processed += len(rows)
+        job.created += len(valid)
+        await db.commit()
+
+    async def run(self, job: ImportJob, chunks: AsyncIterator[bytes], db: AsyncSession) -> ImportJob:
+        """
+        Import the rows of a streamed body into job's user. Batches already
+        committed stay if a later one fails; the job then reports failed.
+        """
+        try:
+            categories = await self._category_lookup(job.user_id, db)
+            rows = self._ndjson_rows(chunks) if job.format == "ndjson" else self._csv_rows(chunks)
+            batch = []
+            async for row in rows:
+                batch.append(row)
+                if len(batch) >= settings.TODO_IMPORT_BATCH_SIZE:
+                    await self._import_batch(job, batch, categories, db)
+                    batch = []
+            if batch:
+                await self._import_batch(job, batch, categories, db)
+
+            status, detail = "completed", None
+        except Exception as e:
+            logger.error(f"Error importing todos: {e}")
+            status = "failed"
+            if isinstance(e, UnicodeDecodeError):
+                detail = "The body is not valid UTF-8"
+            elif isinstance(e, RowTooLongError):
+                detail = str(e)
+            else:
+                detail = "Import stopped by an error"
+            await db.rollback()
+
+        try:
+            job.status, job.detail, job.finished_at = status, detail, utcnow()
+            await db.commit()
+            # As stored (after a rollback: progress of the last committed batch)
+            await db.refresh(job)
+        except Exception as e:
+            logger.error(f"Error finishing import job: {e}")
+            await db.rollback()
+        return job
+
+    def to_response(self, job: ImportJob) -> TodoImportJob:
+        return TodoImportJob.model_validate(job)
+
+
+# Singleton instance
+todo_import_service = TodoImportService()
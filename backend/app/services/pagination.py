@@ -0,0 +1,102 @@
+from typing import Any, Dict, List, Optional, Tuple
+from datetime import datetime
+from sqlalchemy import and_, asc, desc, or_
+import base64
+import binascii
+import json
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor is malformed or does not match the sort"""
+    pass
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        return datetime.fromisoformat(value["dt"])
+    return value
+
+
+def _pack(payload: Dict[str, Any]) -> str:
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _unpack(cursor: str) -> Dict[str, Any]:
+    padded = cursor + "=" * (-len(cursor) % 4)
+    return json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+
+
+def encode_cursor(sort_by: str, sort_order: str, value: Any, last_id: str) -> str:
+    """Build an opaque cursor from the last row's sort key and id"""
+    return _pack({"s": sort_by, "o": sort_order, "v": _encode_value(value), "id": last_id})
+
+
+def decode_cursor(cursor: str, sort_by: str, sort_order: str) -> Tuple[Any, str]:
+    """Return (sort value, id) from a cursor created for the same sort"""
+    try:
+        payload = _unpack(cursor)
+        if payload["s"] != sort_by or payload["o"] != sort_order:
+            raise InvalidCursorError("Cursor does not match sort_by/sort_order")
+        return _decode_value(payload["v"]), str(payload["id"])
+    except InvalidCursorError:
+        raise
+    except (ValueError, KeyError, TypeError, binascii.Error) as e:
+        raise InvalidCursorError("Invalid cursor") from e
+
+
+def encode_positions(positions: Dict[str, Optional[Tuple[Any, str]]]) -> str:
+    """Opaque cursor holding a (key, id) position per named stream; None = from the start"""
+    return _pack({
+        name: None if position is None else [_encode_value(position[0]), position[1]]
+        for name, position in positions.items()
+    })
+
+
+def decode_positions(cursor: str, names: List[str]) -> Dict[str, Optional[Tuple[Any, str]]]:
+    """Positions from encode_positions for the given streams"""
+    try:
+        payload = _unpack(cursor)
+        positions = {}
+        for name in names:
+            position = payload[name]
+            positions[name] = None if position is None else (_decode_value(position[0]), str(position[1]))
+        return positions
+    except (ValueError, KeyError, TypeError, IndexError, binascii.Error) as e:
+        raise InvalidCursorError("Invalid cursor") from e
+
+
+def keyset_order(column: Any, id_column: Any, descending: bool, nullable: bool = False) -> List[Any]:
+    """ORDER BY for a sort key with id as tiebreaker; NULL keys sort last"""
+    direction = desc if descending else asc
+    key = direction(column)
+    if nullable:
+        key = key.nulls_last()
+    return [key, direction(id_column)]
+
+
+def keyset_condition(
+    column: Any,
+    id_column: Any,
+    value: Any,
+    last_id: str,
+    descending: bool,
+    nullable: bool = False
+) -> Any:
+    """WHERE clause selecting rows after (value, last_id) in keyset_order"""
+    id_after = id_column < last_id if descending else id_column > last_id
+    if value is None:
+        # Already inside the trailing NULL block
+        return and_(column.is_(None), id_after)
+
+    after = column < value if descending else column > value
+    condition = or_(after, and_(column == value, id_after))
+    if nullable:
+        condition = or_(condition, column.is_(None))
+    return condition
@@ -0,0 +1,115 @@
+from typing import Any, List, Optional
+from sqlalchemy import Column, Integer, MetaData, Select, String, Table, func, literal_column, or_, select
+from app.core.database import engine
+from app.models.db_models import Todo
+
+# The trigram index (FTS5 and pg_trgm) cannot match shorter terms
+MIN_TERM_LENGTH = 3
+
+# Contentless FTS5 table keyed by todos_fts_keys.id, kept in sync by triggers
+# on todos (alembic/sqlite_fts.py). Their own MetaData so they are never part
+# of create_all.
+fts_metadata = MetaData()
+
+todos_fts = Table(
+    "todos_fts",
+    fts_metadata,
+    Column("rowid", Integer),
+    Column("title", String),
+    Column("description", String),
+)
+
+todos_fts_keys = Table(
+    "todos_fts_keys",
+    fts_metadata,
+    Column("id", Integer, primary_key=True),
+    Column("todo_id", String),
+)
+
+FTS_TABLE = literal_column("todos_fts")
+
+# bm25 column weights: title matches outrank description matches
+TITLE_WEIGHT = 2.0
+DESCRIPTION_WEIGHT = 1.0
+
+
+def split_terms(search: Optional[str]) -> List[str]:
+    """Whitespace-separated search terms, deduplicated, in input order"""
+    return list(dict.fromkeys((search or "").split()))
+
+
+def fts_phrase(term: str) -> str:
+    """Quote a term as an FTS5 phrase so operators in user input are literal"""
+    return '"' + term.replace('"', '""') + '"'
+
+
+class TodoSearch:
+    """
+    Substring search over todo title/description backed by a trigram index:
+    SQLite FTS5 (tokenize='trigram') or Postgres pg_trgm GIN indexes.
+    Trigrams are n-grams, so text without word spaces (Japanese) matches too.
+    """
+
+    def __init__(self, dialect: str):
+        self.dialect = dialect
+
+    @property
+    def uses_fts(self) -> bool:
+        return self.dialect == "sqlite"
+
+    def _like_term(self, term: str) -> Any:
+        """ILIKE '%term%' on title or description, wildcards escaped"""
+        return or_(
+            Todo.title.icontains(term, autoescape=True),
+            Todo.description.icontains(term, autoescape=True)
+        )
+
+    def apply(self, query: Select, search: Optional[str], ranked: bool = False) -> Select:
+        """
+        Restrict query to todos matching every search term.
+        ranked joins the FTS table so rank() can be used in ORDER BY.
+        """
+        terms = split_terms(search)
+        if not terms:
+            return query
+
+        indexed = [term for term in terms if len(term) >= MIN_TERM_LENGTH]
+        if self.uses_fts and indexed:
+            match = FTS_TABLE.match(" ".join(fts_phrase(term) for term in indexed))
+            if ranked:
+                query = (
+                    query.join(todos_fts_keys, todos_fts_keys.c.todo_id == Todo.id)
+                    .join(todos_fts, todos_fts.c.rowid == todos_fts_keys.c.id)
+                    .where(match)
+                )
+            else:
+                # IN (subquery) runs the MATCH once rather than once per todo
+                matched = todos_fts.join(todos_fts_keys, todos_fts_keys.c.id == todos_fts.c.rowid)
+                query = query.where(Todo.id.in_(select(todos_fts_keys.c.todo_id).select_from(matched).where(match)))
+            # Short terms are checked on the rows the index already narrowed
+            terms = [term for term in terms if len(term) < MIN_TERM_LENGTH]
+
+        for term in terms:
+            query = query.where(self._like_term(term))
+        return query
+
+    def rank(self, search: Optional[str]) -> Optional[Any]:
+        """Relevance expression (best first in ascending order), or None"""
+        terms = [term for term in split_terms(search) if len(term) >= MIN_TERM_LENGTH]
+        if not terms:
+            return None
+
+        if self.uses_fts:
+            # Only valid on a query that went through apply(ranked=True)
+            return func.bm25(FTS_TABLE, TITLE_WEIGHT, DESCRIPTION_WEIGHT)
+
+        text = " ".join(terms)
+        similarity = (
+            func.word_similarity(text, Todo.title) * TITLE_WEIGHT
+            + func.word_similarity(text, func.coalesce(Todo.description, "")) * DESCRIPTION_WEIGHT
+        )
+        return -similarity
+
+
+# Singleton instance
+todo_search = TodoSearch(engine.dialect.name)
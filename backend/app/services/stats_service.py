@@ -0,0 +1,290 @@
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import bindparam, delete, func, null, select, union_all, update
+from app.core.database import dialect_insert, open_session
+from app.models.category import CategoryResponse
+from app.models.db_models import Category, Todo, User, UserStat, todo_categories, utcnow
+from app.models.todo import TodoPriority, TodoStatus
+from app.services.data_version import data_version_service
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class StatsService:
+    """
+    Per-user todo counters, keyed "total", "status:<status>" and
+    "priority:<priority or none>" (rows of user_stats), and "category:<id>"
+    and "category_completed:<id>" (categories.todo_count/completed_count).
+    TodoService applies deltas in the same transaction as each write, so
+    GET /api/todos/stats and the category list read stored counts whatever
+    the list size.
+    """
+
+    # Counter kinds stored on the categories row rather than in user_stats
+    CATEGORY_COLUMNS = {"category": "todo_count", "category_completed": "completed_count"}
+
+    def todo_keys(self, completed: Optional[bool], priority: Optional[str], category_ids: Iterable[str] = ()) -> List[str]:
+        """Counters one todo contributes to (NULL completed counts as pending)"""
+        status = TodoStatus.COMPLETED if completed else TodoStatus.PENDING
+        keys = ["total", f"status:{status.value}", f"priority:{priority or 'none'}"]
+        for category_id in category_ids:
+            keys.append(f"category:{category_id}")
+            if completed:
+                keys.append(f"category_completed:{category_id}")
+        return keys
+
+    def _category_rows(self, counters: Dict[str, int]) -> Dict[str, Dict[str, Any]]:
+        """Category counters grouped by category id, as bind parameters for _category_update"""
+        rows = {}
+        for key, value in counters.items():
+            kind, _, category_id = key.partition(":")
+            if kind in self.CATEGORY_COLUMNS:
+                row = rows.setdefault(category_id, {"category_id": category_id, "todo_count": 0, "completed_count": 0})
+                row[self.CATEGORY_COLUMNS[kind]] = value
+        return rows
+
+    def _category_update(self, user_id: str, increment: bool) -> Any:
+        """UPDATE of one category's counts, run with executemany"""
+        categories = Category.__table__
+        todo_count, completed_count = bindparam("todo_count_value"), bindparam("completed_count_value")
+        if increment:
+            todo_count = categories.c.todo_count + todo_count
+            completed_count = categories.c.completed_count + completed_count
+        return (
+            update(categories)
+            .where(categories.c.id == bindparam("category_id"), categories.c.user_id == user_id)
+            # Derived columns: not a change of the category itself (change feed)
+            .values(todo_count=todo_count, completed_count=completed_count, updated_at=categories.c.updated_at)
+        )
+
+    async def _write_categories(self, user_id: str, rows: Iterable[Dict[str, Any]], increment: bool, db: AsyncSession) -> None:
+        params = [
+            {
+                "category_id": row["category_id"],
+                "todo_count_value": row["todo_count"],
+                "completed_count_value": row["completed_count"]
+            }
+            for row in rows
+        ]
+        if params:
+            await db.execute(self._category_update(user_id, increment), params)
+
+    def _upsert(self, rows: List[Dict[str, Any]], increment: bool) -> Any:
+        """INSERT ... ON CONFLICT adding to (or replacing) the stored values"""
+        statement = dialect_insert(UserStat).values(rows)
+        value = UserStat.value + statement.excluded.value if increment else statement.excluded.value
+        return statement.on_conflict_do_update(
+            index_elements=[UserStat.user_id, UserStat.key],
+            set_={"value": value}
+        )
+
+    async def apply(self, user_id: str, delta: Counter, db: AsyncSession) -> None:
+        """
+        Add delta to the user's counters: one statement for user_stats and
+        one (executemany) for categories, each skipped when nothing changed
+        """
+        delta = {key: value for key, value in delta.items() if value}
+        rows = [
+            {"user_id": user_id, "key": key, "value": value}
+            for key, value in delta.items()
+            if key.partition(":")[0] not in self.CATEGORY_COLUMNS
+        ]
+        if rows:
+            await db.execute(self._upsert(rows, increment=True))
+        await self._write_categories(user_id, self._category_rows(delta).values(), True, db)
+
+    async def tally(self, todo_ids: Any, db: AsyncSession) -> Counter:
+        """
+        Counters for the todos selected by todo_ids (a SELECT of Todo.id),
+        counted with one statement. Call before a write to get what it removes.
+        """
+        by_status_priority = (
+            select(Todo.completed, Todo.priority, null().label("category_id"), func.count())
+            .where(Todo.id.in_(todo_ids))
+            .group_by(Todo.completed, Todo.priority)
+        )
+        by_category = (
+            select(Todo.completed, null(), todo_categories.c.category_id, func.count())
+            .join(Todo, Todo.id == todo_categories.c.todo_id)
+            .where(todo_categories.c.todo_id.in_(todo_ids))
+            .group_by(todo_categories.c.category_id, Todo.completed)
+        )
+        counts = Counter()
+        for completed, priority, category_id, count in await db.execute(union_all(by_status_priority, by_category)):
+            if category_id is not None:
+                counts[f"category:{category_id}"] += count
+                if completed:
+                    counts[f"category_completed:{category_id}"] += count
+                continue
+            for key in self.todo_keys(completed, priority):
+                counts[key] += count
+        return counts
+
+    def delta(self, after: Counter, before: Counter) -> Counter:
+        """after - before, keeping negative counts (unlike Counter's minus)"""
+        delta = Counter(after)
+        delta.subtract(before)
+        return delta
+
+    def after_update(
+        self,
+        before: Counter,
+        changes: Dict[str, Any],
+        toggle: bool = False,
+        category_ids: Optional[List[str]] = None
+    ) -> Counter:
+        """
+        Counters of the todos tallied in before once the same changes (a
+        TodoUpdate dump) are applied to all of them. category_ids are the
+        categories they are relinked to, if any.
+        """
+        total = before["total"]
+        status_changed = toggle or "status" in changes
+        after = Counter({
+            key: value for key, value in before.items()
+            if not (
+                (key.startswith(("status:", "category_completed:")) and status_changed)
+                or (key.startswith("priority:") and "priority" in changes)
+                or (key.startswith(("category:", "category_completed:")) and category_ids is not None)
+            )
+        })
+        pending, completed = (f"status:{status.value}" for status in (TodoStatus.PENDING, TodoStatus.COMPLETED))
+        if toggle:
+            after[pending], after[completed] = before[completed], before[pending]
+        elif "status" in changes:
+            # A null status stores completed = False, as _update_values does
+            after[f"status:{changes['status'] or TodoStatus.PENDING.value}"] = total
+        if "priority" in changes:
+            after[f"priority:{changes['priority'] or 'none'}"] = total
+
+        if category_ids is not None:
+            # Every todo is linked to every one of them
+            for category_id in category_ids:
+                after[f"category:{category_id}"] = total
+                after[f"category_completed:{category_id}"] = after[completed]
+        elif status_changed:
+            for key, count in before.items():
+                if key.startswith("category:"):
+                    category_id = key.partition(":")[2]
+                    was = before[f"category_completed:{category_id}"]
+                    if toggle:
+                        now = count - was
+                    else:
+                        now = count if changes["status"] == TodoStatus.COMPLETED.value else 0
+                    after[f"category_completed:{category_id}"] = now
+        return after
+
+    def _overdue_query(self, user_id: str) -> Any:
+        """Pending todos past their due date, counted on ix_todos_user_pending_due"""
+        return select(func.count()).select_from(Todo).where(
+            Todo.user_id == user_id,
+            Todo.completed.is_not(True) & Todo.due_date.is_not(None),
+            Todo.due_date < utcnow()
+        )
+
+    async def get_stats(
+        self,
+        user_id: str,
+        db: AsyncSession,
+        categories: Optional[List[CategoryResponse]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Counters of a user as a TodoStats dict. Pass the user's categories
+        if already loaded to take by_category from their stored counts.
+        """
+        try:
+            counters = dict((await db.execute(
+                select(UserStat.key, UserStat.value).where(UserStat.user_id == user_id)
+            )).all())
+            if categories is None:
+                by_category = dict((await db.execute(
+                    select(Category.id, Category.todo_count).where(Category.user_id == user_id, Category.todo_count > 0)
+                )).all())
+            else:
+                by_category = {category.id: category.todo_count for category in categories if category.todo_count > 0}
+            return {
+                "total": counters.get("total", 0),
+                "by_status": {status.value: counters.get(f"status:{status.value}", 0) for status in TodoStatus},
+                "by_priority": {
+                    priority: counters.get(f"priority:{priority}", 0)
+                    for priority in [*(priority.value for priority in TodoPriority), "none"]
+                },
+                "by_category": by_category,
+                # Depends on the time of the request, so it is counted rather than stored
+                "overdue": await db.scalar(self._overdue_query(user_id))
+            }
+        except Exception as e:
+            logger.error(f"Error getting todo stats: {e}")
+            return None
+
+    async def reconcile(self, user_id: str, db: AsyncSession) -> Dict[str, Dict[str, int]]:
+        """
+        Recount a user's counters from the todos, store them and return the
+        drift found as {key: {"stored": ..., "actual": ...}}
+        """
+        # Hold the user's row like a write does, so no write lands in between
+        await db.execute(select(User.id).where(User.id == user_id).with_for_update())
+        actual = await self.tally(select(Todo.id).where(Todo.user_id == user_id), db)
+        stored = dict((await db.execute(
+            select(UserStat.key, UserStat.value).where(UserStat.user_id == user_id)
+        )).all())
+        category_counts = (await db.execute(
+            select(Category.id, Category.todo_count, Category.completed_count).where(Category.user_id == user_id)
+        )).all()
+        for category_id, todo_count, completed_count in category_counts:
+            stored[f"category:{category_id}"] = todo_count
+            stored[f"category_completed:{category_id}"] = completed_count
+
+        drift = {
+            key: {"stored": stored.get(key, 0), "actual": actual.get(key, 0)}
+            for key in stored.keys() | actual.keys()
+            if stored.get(key, 0) != actual.get(key, 0)
+        }
+        if drift:
+            # Repaired counts are a change: new ETags and category cache keys
+            await data_version_service.bump(user_id, db)
+            counters = {key: value for key, value in actual.items() if key.partition(":")[0] not in self.CATEGORY_COLUMNS}
+            await db.execute(delete(UserStat).where(UserStat.user_id == user_id, UserStat.key.not_in(list(counters))))
+            rows = [{"user_id": user_id, "key": key, "value": value} for key, value in counters.items()]
+            if rows:
+                await db.execute(self._upsert(rows, increment=False))
+
+            # Absolute counts for every drifted category, zero where nothing is linked
+            drifted = {key.partition(":")[2] for key in drift if key.partition(":")[0] in self.CATEGORY_COLUMNS}
+            await self._write_categories(user_id, [
+                {
+                    "category_id": category_id,
+                    "todo_count": actual.get(f"category:{category_id}", 0),
+                    "completed_count": actual.get(f"category_completed:{category_id}", 0)
+                }
+                for category_id in sorted(drifted)
+            ], False, db)
+        await db.commit()
+        return drift
+
+    async def reconcile_all(self, user_id: Optional[str] = None) -> Dict[str, Any]:
+        """Reconcile every user (or only user_id), one transaction each; returns the drift per user"""
+        drift, checked = {}, 0
+        async with open_session() as db:
+            query = select(User.id).order_by(User.id)
+            if user_id is not None:
+                query = query.where(User.id == user_id)
+            user_ids = (await db.scalars(query)).all()
+            for checked_id in user_ids:
+                try:
+                    user_drift = await self.reconcile(checked_id, db)
+                except Exception as e:
+                    logger.error(f"Error reconciling todo stats of {checked_id}: {e}")
+                    await db.rollback()
+                    continue
+                checked += 1
+                if user_drift:
+                    logger.warning(f"Todo stats of {checked_id} drifted: {user_drift}")
+                    drift[checked_id] = user_drift
+        return {"users_checked": checked, "users_drifted": len(drift), "drift": drift}
+
+
+# Singleton instance
+stats_service = StatsService()
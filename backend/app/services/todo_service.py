@@ -1,61 +1,525 @@
-from typing import Optional, List, Dict, Any
-from sqlalchemy.orm import Session
-from sqlalchemy import desc, asc, or_
-from app.models.todo import TodoCreate, TodoUpdate, TodoResponse, TodoInDB, TodoStatus
-from app.models.db_models import Todo, Category
-from datetime import datetime
+from typing import Optional, List, Dict, Any, AsyncIterator, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import delete, insert, select, update, func, Select
+from sqlalchemy.orm import load_only, selectinload
+from pydantic import ValidationError
+from app.models.todo import (
+    TodoCreate,
+    TodoUpdate,
+    TodoResponse,
+    TodoInDB,
+    TodoStatus,
+    TodoBulkError,
+    TodoBulkUpdate,
+    TodoSelection
+)
+from app.core.database import open_session
+from app.models.db_models import Todo, Category, Tombstone, todo_categories, priority_rank, title_sort_key, utcnow
+from app.services.category_service import category_service
+from app.services.pagination import (
+    InvalidCursorError,
+    decode_cursor,
+    decode_positions,
+    encode_cursor,
+    encode_positions,
+    keyset_condition,
+    keyset_order
+)
+from app.services.data_version import data_version_service
+from app.services.stats_service import stats_service
+from app.services.search import todo_search
+from datetime import datetime, timedelta
+from pydantic_core import to_json
+from collections import Counter
+import csv
+import io
 import uuid
 import logging
 import math
 
 logger = logging.getLogger(__name__)
 
+class InvalidFieldsError(ValueError):
+    """Raised when fields= names something that is not a TodoResponse field"""
+    pass
+
 class TodoService:
+    # sort_by -> (column, nullable)
+    SORT_COLUMNS = {
+        "created_at": (Todo.created_at, False),
+        "due_date": (Todo.due_date, True),
+        "priority": (Todo.priority_rank, False),
+        "title": (Todo.title_key, False),
+    }
+
+    # Id lists per statement when a selection has to be materialized
+    ID_CHUNK_SIZE = 500
+
+    # Change feed streams, each paged by its own (timestamp, id) position
+    CHANGE_STREAMS = ["todos", "categories", "deleted"]
+
+    # TodoResponse field -> Todo columns it is read from, in response order
+    FIELD_COLUMNS = {
+        "id": [Todo.id],
+        "title": [Todo.title],
+        "description": [Todo.description],
+        "status": [Todo.completed],
+        "priority": [Todo.priority],
+        "due_date": [Todo.due_date],
+        "user_id": [Todo.user_id],
+        "created_at": [Todo.created_at],
+        "updated_at": [Todo.updated_at],
+        "category_ids": [],
+        "categories": [],
+    }
+    # Fields read from the categories relationship
+    CATEGORY_FIELDS = frozenset({"category_ids", "categories"})
+
+    # Rows fetched per round trip (and encoded per chunk) while exporting
+    EXPORT_BATCH_SIZE = 1000
+    # TodoUpdate fields that move a todo between StatsService counters
+    STATS_FIELDS = {"status", "priority", "category_ids"}
+
+    EXPORT_CSV_COLUMNS = [
+        "id", "title", "description", "status", "priority",
+        "due_date", "created_at", "updated_at", "categories"
+    ]
+
     def __init__(self):
         pass
-    
-    async def create_todo(self, user_id: str, todo_data: TodoCreate, db: Session) -> Optional[TodoResponse]:
-        """Create a new todo"""
-        try:
+
+    def _response_fields(
+        self,
+        todo: Todo,
+        categories: Optional[List[Category]] = None,
+        fields: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """
+        TodoResponse fields for a Todo row as JSON-ready values (categories
+        default to todo.categories). Rows were validated on the way in, so
+        list endpoints serialize these dicts without building models.
+        fields limits the dict to a sparse fieldset loaded by _load_options.
+        """
+        if fields is not None:
+            return self._sparse_fields(todo, categories, fields)
+        if categories is None:
+            categories = todo.categories
+        return {
+            "id": todo.id,
+            "title": todo.title,
+            "description": todo.description,
+            # Enum values, not members: inferred serialization of enums is slow
+            "status": TodoStatus.COMPLETED.value if todo.completed else TodoStatus.PENDING.value,
+            "priority": todo.priority,
+            "due_date": todo.due_date,
+            "user_id": todo.user_id,
+            "created_at": todo.created_at,
+            "updated_at": todo.updated_at,
+            "category_ids": [category.id for category in categories],
+            "categories": [
+                {"id": category.id, "name": category.name, "color": category.color}
+                for category in categories
+            ]
+        }
+
+    def _sparse_fields(self, todo: Todo, categories: Optional[List[Category]], fields: List[str]) -> Dict[str, Any]:
+        """_response_fields for a subset, touching only the loaded columns"""
+        if categories is None and not self.CATEGORY_FIELDS.isdisjoint(fields):
+            categories = todo.categories
+        values = {}
+        for name in fields:
+            if name == "status":
+                values[name] = TodoStatus.COMPLETED.value if todo.completed else TodoStatus.PENDING.value
+            elif name == "category_ids":
+                values[name] = [category.id for category in categories]
+            elif name == "categories":
+                values[name] = [
+                    {"id": category.id, "name": category.name, "color": category.color}
+                    for category in categories
+                ]
+            else:
+                values[name] = getattr(todo, name)
+        return values
+
+    def parse_fields(self, fields: Optional[str]) -> Optional[List[str]]:
+        """
+        TodoResponse field names from a comma-separated fields= value,
+        in response order with id always included; None means every field
+        """
+        if not fields:
+            return None
+        requested = {name.strip() for name in fields.split(",") if name.strip()}
+        unknown = requested - set(self.FIELD_COLUMNS)
+        if unknown:
+            raise InvalidFieldsError(f"Unknown fields: {', '.join(sorted(unknown))}")
+        return [name for name in self.FIELD_COLUMNS if name in requested or name == "id"]
+
+    def _load_options(self, fields: Optional[List[str]], *columns: Any) -> List[Any]:
+        """
+        Loader options fetching only what fields needs: load_only on the
+        backing columns (plus columns, e.g. the sort key for cursors), and
+        the category chips only when requested
+        """
+        if fields is None:
+            return [selectinload(Todo.categories)]
+        needed = [column for name in fields for column in self.FIELD_COLUMNS[name]]
+        options = [load_only(*needed, *columns)]
+        if not self.CATEGORY_FIELDS.isdisjoint(fields):
+            options.append(selectinload(Todo.categories))
+        return options
+
+    def _to_response(self, todo: Todo, categories: Optional[List[Category]] = None) -> TodoResponse:
+        """Convert a Todo row to TodoResponse"""
+        return TodoResponse(**self._response_fields(todo, categories))
+
+    async def _get_owned_todo(
+        self,
+        todo_id: str,
+        user_id: str,
+        db: AsyncSession,
+        fields: Optional[List[str]] = None
+    ) -> Optional[Todo]:
+        """Load a todo belonging to user_id, with its categories (or just fields)"""
+        return await db.scalar(
+            select(Todo).where(
+                Todo.id == todo_id,
+                Todo.user_id == user_id
+            ).options(*self._load_options(fields))
+        )
+
+    async def _owned_categories(self, user_id: str, category_ids: List[str], db: AsyncSession) -> List[Category]:
+        """The user's categories among category_ids (others are ignored)"""
+        if not category_ids:
+            return []
+        return (await db.scalars(
+            select(Category).where(
+                Category.id.in_(set(category_ids)),
+                Category.user_id == user_id
+            ).order_by(Category.name)
+        )).all()
+
+    async def _load_categories(self, todo_id: str, db: AsyncSession) -> List[Category]:
+        """Categories linked to one todo"""
+        return (await db.scalars(
+            select(Category)
+            .join(todo_categories, todo_categories.c.category_id == Category.id)
+            .where(todo_categories.c.todo_id == todo_id)
+            .order_by(Category.name)
+        )).all()
+
+    async def _replace_categories(self, user_id: str, todo_ids: List[str], category_ids: List[str], db: AsyncSession) -> None:
+        """Set the category links of todo_ids to the user's categories in category_ids"""
+        await db.execute(delete(todo_categories).where(todo_categories.c.todo_id.in_(todo_ids)))
+        if not category_ids:
+            return
+        # Joining on user_id keeps the ownership check inside the statement
+        await db.execute(
+            insert(todo_categories).from_select(
+                ["todo_id", "category_id"],
+                select(Todo.id, Category.id)
+                .join(Category, Category.user_id == Todo.user_id)
+                .where(
+                    Todo.id.in_(todo_ids),
+                    Todo.user_id == user_id,
+                    Category.id.in_(set(category_ids))
+                )
+            )
+        )
+
+    async def _commit_if(self, changed: Any, db: AsyncSession) -> None:
+        """Commit a write that touched rows; roll back (and the version bump) otherwise"""
+        if changed:
+            await db.commit()
+        else:
+            await db.rollback()
+
+    def _insert_values(self, user_id: str, todo_data: TodoCreate) -> Dict[str, Any]:
+        """Column values for a new todo, including the derived sort keys"""
+        priority = todo_data.priority.value if todo_data.priority else None
+        now = utcnow()
+        return {
+            "id": str(uuid.uuid4()),
+            "title": todo_data.title,
+            "title_key": title_sort_key(todo_data.title),
+            "description": todo_data.description,
             # Convert status to completed boolean for database
-            completed = todo_data.status == TodoStatus.completed if todo_data.status else False
-            
-            db_todo = Todo(
-                title=todo_data.title,
-                description=todo_data.description,
-                completed=completed,
-                priority=todo_data.priority,
-                due_date=todo_data.due_date,
-                user_id=user_id,
-                category_id=getattr(todo_data, 'category_id', None)
+            "completed": todo_data.status == TodoStatus.COMPLETED,
+            "priority": priority,
+            "priority_rank": priority_rank(priority),
+            "due_date": todo_data.due_date,
+            "user_id": user_id,
+            "created_at": now,
+            "updated_at": now,
+        }
+
+    def _update_values(self, changes: Dict[str, Any]) -> Dict[str, Any]:
+        """Column values for a TodoUpdate dump, keeping the sort keys in step"""
+        values = {}
+        for field, value in changes.items():
+            if field == "status":
+                values["completed"] = value == TodoStatus.COMPLETED
+            elif field == "category_ids":
+                # Linked through todo_categories, see _replace_categories
+                continue
+            elif field == "priority":
+                values["priority"] = value
+                values["priority_rank"] = priority_rank(value)
+            elif field == "title":
+                values["title"] = value
+                values["title_key"] = title_sort_key(value)
+            else:
+                values[field] = value
+        return values
+
+    async def create_todo(self, user_id: str, todo_data: TodoCreate, db: AsyncSession) -> Optional[TodoResponse]:
+        """Create a new todo (one INSERT ... RETURNING, plus category links)"""
+        try:
+            await data_version_service.bump(user_id, db)
+            categories = await self._owned_categories(user_id, todo_data.category_ids, db)
+            db_todo = await db.scalar(
+                insert(Todo).values(self._insert_values(user_id, todo_data)).returning(Todo)
             )
-            
-            db.add(db_todo)
-            db.commit()
-            db.refresh(db_todo)
-            
+            if categories:
+                await db.execute(insert(todo_categories).values([
+                    {"todo_id": db_todo.id, "category_id": category.id} for category in categories
+                ]))
+            await stats_service.apply(user_id, Counter(stats_service.todo_keys(
+                db_todo.completed, db_todo.priority, [category.id for category in categories]
+            )), db)
+            await db.commit()
+
             # Convert back to TodoResponse format
-            return TodoResponse(
-                id=db_todo.id,
-                title=db_todo.title,
-                description=db_todo.description,
-                status=TodoStatus.completed if db_todo.completed else TodoStatus.pending,
-                priority=db_todo.priority,
-                due_date=db_todo.due_date,
-                user_id=db_todo.user_id,
-                created_at=db_todo.created_at,
-                updated_at=db_todo.updated_at
-            )
-            
+            return self._to_response(db_todo, categories)
+
         except Exception as e:
             logger.error(f"Error creating todo: {e}")
-            db.rollback()
+            await db.rollback()
+            return None
+
+    def validation_errors(self, error: ValidationError) -> List[Dict[str, Any]]:
+        """JSON-safe loc/msg/type of each error reported for one item"""
+        return [
+            {"loc": list(detail["loc"]), "msg": detail["msg"], "type": detail["type"]}
+            for detail in error.errors()
+        ]
+
+    def validate_bulk_items(self, items: List[Dict[str, Any]]) -> Tuple[List[TodoCreate], List[TodoBulkError]]:
+        """Validate raw bulk items, collecting errors by item index"""
+        valid, errors = [], []
+        for index, item in enumerate(items):
+            try:
+                valid.append(TodoCreate.model_validate(item))
+            except ValidationError as e:
+                errors.append(TodoBulkError(index=index, errors=self.validation_errors(e)))
+        return valid, errors
+
+    async def insert_todos(
+        self,
+        user_id: str,
+        items: List[TodoCreate],
+        categories: Dict[str, Category],
+        db: AsyncSession
+    ) -> List[TodoResponse]:
+        """
+        Multi-row INSERT of todos and their category links, without committing.
+        categories maps the ids of the user's categories the items may link.
+        """
+        # Stagger created_at so listings keep the items in input order
+        rows = [self._insert_values(user_id, todo_data) for todo_data in items]
+        for offset, row in enumerate(rows):
+            row["created_at"] = row["updated_at"] = rows[0]["created_at"] + timedelta(microseconds=offset)
+
+        item_categories = [
+            sorted(
+                {categories[category_id] for category_id in todo_data.category_ids or [] if category_id in categories},
+                key=lambda category: category.name
+            )
+            for todo_data in items
+        ]
+        links = [
+            {"todo_id": row["id"], "category_id": category.id}
+            for row, linked in zip(rows, item_categories)
+            for category in linked
+        ]
+
+        if rows:
+            await db.execute(insert(Todo).values(rows))
+        if links:
+            await db.execute(insert(todo_categories).values(links))
+        await stats_service.apply(user_id, Counter(
+            key
+            for row, linked in zip(rows, item_categories)
+            for key in stats_service.todo_keys(row["completed"], row["priority"], [category.id for category in linked])
+        ), db)
+
+        # Every column was set client-side, so no read-back is needed
+        return [self._to_response(Todo(**row), linked) for row, linked in zip(rows, item_categories)]
+
+    async def create_todos(self, user_id: str, items: List[TodoCreate], db: AsyncSession) -> Optional[List[TodoResponse]]:
+        """Create todos with a single multi-row INSERT in one transaction"""
+        try:
+            await data_version_service.bump(user_id, db)
+            # One lookup for every category referenced by the batch
+            requested = {category_id for todo_data in items for category_id in todo_data.category_ids or []}
+            categories = {category.id: category for category in await self._owned_categories(user_id, list(requested), db)}
+
+            created = await self.insert_todos(user_id, items, categories, db)
+            await db.commit()
+            return created
+
+        except Exception as e:
+            logger.error(f"Error bulk creating todos: {e}")
+            await db.rollback()
             return None
-    
+
+    def _select_todos(self, statement: Any, user_id: str, selection: TodoSelection) -> Any:
+        """Scope an UPDATE/DELETE to the user's todos picked by ids or filter"""
+        statement = statement.where(Todo.user_id == user_id)
+        if selection.ids is not None:
+            statement = statement.where(Todo.id.in_(selection.ids))
+        else:
+            statement = self._apply_filters(statement, **selection.filter.model_dump(mode="json"))
+        # Nothing is loaded in the session, so skip syncing it
+        return statement.execution_options(synchronize_session=False)
+
+    async def update_todos(self, user_id: str, bulk_update: TodoBulkUpdate, db: AsyncSession) -> Optional[int]:
+        """Apply the same changes to a selection with one UPDATE; returns rows affected"""
+        try:
+            await data_version_service.bump(user_id, db)
+            changes = bulk_update.changes.model_dump(exclude_unset=True, mode="json")
+            values = self._update_values(changes)
+
+            if bulk_update.toggle:
+                # NULL counts as pending, like in _to_response
+                values["completed"] = Todo.completed.is_not(True)
+
+            # Counters of the selection before the change (after is derived from it)
+            counted = bulk_update.toggle or changes.keys() & self.STATS_FIELDS
+            before = await stats_service.tally(self._select_todos(select(Todo.id), user_id, bulk_update), db) if counted else None
+
+            category_ids = changes.get("category_ids")
+            if category_ids is None:
+                result = await db.execute(
+                    self._select_todos(update(Todo), user_id, bulk_update).values(**values)
+                )
+                if before:
+                    await stats_service.apply(user_id, stats_service.delta(
+                        stats_service.after_update(before, changes, bulk_update.toggle), before
+                    ), db)
+                await self._commit_if(result.rowcount, db)
+                return result.rowcount
+
+            # Relinking can change what a filter matches, so resolve the ids first
+            todo_ids = (await db.scalars(self._select_todos(select(Todo.id), user_id, bulk_update))).all()
+            if todo_ids:
+                linked = [category.id for category in await self._owned_categories(user_id, category_ids, db)]
+                await stats_service.apply(user_id, stats_service.delta(
+                    stats_service.after_update(before, changes, bulk_update.toggle, linked), before
+                ), db)
+            for start in range(0, len(todo_ids), self.ID_CHUNK_SIZE):
+                chunk = todo_ids[start:start + self.ID_CHUNK_SIZE]
+                await db.execute(
+                    update(Todo)
+                    .where(Todo.id.in_(chunk))
+                    .values(**values)
+                    .execution_options(synchronize_session=False)
+                )
+                await self._replace_categories(user_id, chunk, category_ids, db)
+            await self._commit_if(todo_ids, db)
+            return len(todo_ids)
+
+        except Exception as e:
+            logger.error(f"Error bulk updating todos: {e}")
+            await db.rollback()
+            return None
+
+    async def delete_todos(self, user_id: str, selection: TodoSelection, db: AsyncSession) -> Optional[int]:
+        """Delete a selection with one DELETE (plus tombstones); returns rows affected"""
+        try:
+            await data_version_service.bump(user_id, db)
+            before = await stats_service.tally(self._select_todos(select(Todo.id), user_id, selection), db)
+            deleted = (await db.scalars(
+                self._select_todos(delete(Todo), user_id, selection).returning(Todo.id)
+            )).all()
+            await stats_service.apply(user_id, stats_service.delta(Counter(), before), db)
+            await data_version_service.record_deletions(user_id, "todo", deleted, db)
+            await self._commit_if(deleted, db)
+            return len(deleted)
+
+        except Exception as e:
+            logger.error(f"Error bulk deleting todos: {e}")
+            await db.rollback()
+            return None
+
+    def _sort_column(self, sort_by: str) -> tuple:
+        """Return (column, nullable) for a sort_by value"""
+        return self.SORT_COLUMNS.get(sort_by, self.SORT_COLUMNS["created_at"])
+
+    def _apply_sort(self, query: Select, sort_by: str, sort_order: str, search: Optional[str] = None) -> Select:
+        """Order by the sort key with id as a deterministic tiebreaker"""
+        rank = todo_search.rank(search) if sort_by == "relevance" else None
+        if rank is not None:
+            # Best match first; sort_order does not apply
+            return query.order_by(rank, Todo.id)
+        sort_column, nullable = self._sort_column(sort_by)
+        return query.order_by(*keyset_order(sort_column, Todo.id, sort_order == "desc", nullable))
+
+    def build_list_query(
+        self,
+        user_id: str,
+        sort_by: str = "created_at",
+        sort_order: str = "desc",
+        **filters: Any
+    ) -> Select:
+        """The filtered, sorted todo list query (used for EXPLAIN checks)"""
+        query = self._apply_filters(
+            select(Todo).where(Todo.user_id == user_id),
+            ranked=sort_by == "relevance",
+            **filters
+        )
+        return self._apply_sort(query, sort_by, sort_order, filters.get("search"))
+
+    def _apply_filters(
+        self,
+        query: Select,
+        status: Optional[TodoStatus] = None,
+        search: Optional[str] = None,
+        priority: Optional[str] = None,
+        category_ids: Optional[List[str]] = None,
+        due_date_from: Optional[datetime] = None,
+        due_date_to: Optional[datetime] = None,
+        ranked: bool = False
+    ) -> Select:
+        """Apply the list filters shared by list-style endpoints"""
+        if status:
+            completed = status == TodoStatus.COMPLETED
+            query = query.where(Todo.completed == completed)
+
+        if search:
+            query = todo_search.apply(query, search, ranked)
+
+        if priority:
+            query = query.where(Todo.priority == priority)
+
+        if category_ids:
+            # Semi-join served by ix_todo_categories_category_todo
+            query = query.where(Todo.id.in_(
+                select(todo_categories.c.todo_id).where(todo_categories.c.category_id.in_(category_ids))
+            ))
+
+        # Date range filtering
+        if due_date_from:
+            query = query.where(Todo.due_date >= due_date_from)
+
+        if due_date_to:
+            query = query.where(Todo.due_date <= due_date_to)
+
+        return query
+
     async def get_todos(
-        self, 
+        self,
         user_id: str,
-        db: Session,
+        db: AsyncSession,
         page: int = 1,
         per_page: int = 20,
         status: Optional[TodoStatus] = None,
@@ -64,224 +528,329 @@ class TodoService:
         search: Optional[str] = None,
         priority: Optional[str] = None,
         category_ids: Optional[List[str]] = None,
-        due_date_from: Optional[str] = None,
-        due_date_to: Optional[str] = None
-    ) -> Dict[str, Any]:
-        """Get todos for a user with pagination"""
+        due_date_from: Optional[datetime] = None,
+        due_date_to: Optional[datetime] = None,
+        cursor: Optional[str] = None,
+        include_total: bool = True,
+        fields: Optional[List[str]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Get todos for a user, paged by page/per_page or by keyset cursor.
+        Every page carries next_cursor; pass it back as cursor to continue.
+        Items are TodoResponse fields as plain dicts (see trusted_json_response),
+        limited to fields (from parse_fields) when given. None on error.
+        """
         try:
             # Start with base query
-            query = db.query(Todo).filter(Todo.user_id == user_id)
-            
-            # Apply filters
-            if status:
-                completed = status == TodoStatus.completed
-                query = query.filter(Todo.completed == completed)
-            
-            if search:
-                search_filter = or_(
-                    Todo.title.ilike(f"%{search}%"),
-                    Todo.description.ilike(f"%{search}%")
+            query = self._apply_filters(
+                select(Todo).where(Todo.user_id == user_id),
+                status=status,
+                search=search,
+                priority=priority,
+                category_ids=category_ids,
+                due_date_from=due_date_from,
+                due_date_to=due_date_to,
+                ranked=sort_by == "relevance"
+            )
+
+            # Get total count (optional, it scans the whole filtered set)
+            total = None
+            if include_total:
+                total = await db.scalar(
+                    select(func.count()).select_from(query.subquery())
                 )
-                query = query.filter(search_filter)
-            
-            if priority:
-                query = query.filter(Todo.priority == priority)
-            
-            if category_ids:
-                query = query.filter(Todo.category_id.in_(category_ids))
-            
-            # Date range filtering
-            if due_date_from:
-                from_date = datetime.fromisoformat(due_date_from.replace('Z', '+00:00'))
-                query = query.filter(Todo.due_date >= from_date)
-            
-            if due_date_to:
-                to_date = datetime.fromisoformat(due_date_to.replace('Z', '+00:00'))
-                query = query.filter(Todo.due_date <= to_date)
-            
-            # Apply sorting
-            if sort_by == "created_at":
-                order_func = desc if sort_order == "desc" else asc
-                query = query.order_by(order_func(Todo.created_at))
-            elif sort_by == "due_date":
-                order_func = desc if sort_order == "desc" else asc
-                query = query.order_by(order_func(Todo.due_date))
-            elif sort_by == "priority":
-                # Custom priority ordering
-                priority_case = {
-                    "high": 3,
-                    "medium": 2, 
-                    "low": 1
-                }
-                if sort_order == "desc":
-                    query = query.order_by(Todo.priority.desc())
-                else:
-                    query = query.order_by(Todo.priority.asc())
-            
-            # Get total count
-            total = query.count()
-            
-            # Apply pagination
-            offset = (page - 1) * per_page
-            todos = query.offset(offset).limit(per_page).all()
-            
-            # Convert to response format
-            todo_responses = []
-            for todo in todos:
-                todo_responses.append(TodoResponse(
-                    id=todo.id,
-                    title=todo.title,
-                    description=todo.description,
-                    status=TodoStatus.completed if todo.completed else TodoStatus.pending,
-                    priority=todo.priority,
-                    due_date=todo.due_date,
-                    user_id=todo.user_id,
-                    created_at=todo.created_at,
-                    updated_at=todo.updated_at
-                ))
-            
+
+            # Apply sorting with id as a deterministic tiebreaker
+            sort_column, nullable = self._sort_column(sort_by)
+            descending = sort_order == "desc"
+            query = self._apply_sort(query, sort_by, sort_order, search)
+            # Relevance is computed per query, so it can only be paged by offset
+            keyset = not (sort_by == "relevance" and todo_search.rank(search) is not None)
+
+            # Apply pagination, fetching one extra row to detect a next page
+            if cursor and not keyset:
+                raise InvalidCursorError("Cursor paging is not available for relevance sort")
+            if cursor:
+                value, last_id = decode_cursor(cursor, sort_by, sort_order)
+                query = query.where(
+                    keyset_condition(sort_column, Todo.id, value, last_id, descending, nullable)
+                )
+            else:
+                query = query.offset((page - 1) * per_page)
+            # Only the requested columns; categories for the whole page come
+            # from one batched IN query. The sort key is loaded for next_cursor.
+            todos = (await db.scalars(
+                query.limit(per_page + 1).options(*self._load_options(fields, sort_column))
+            )).all()
+
+            next_cursor = None
+            if len(todos) > per_page:
+                todos = todos[:per_page]
+                last = todos[-1]
+                if keyset:
+                    next_cursor = encode_cursor(sort_by, sort_order, getattr(last, sort_column.key), last.id)
+
+            # Plain dicts: the route serializes them straight to JSON
+            todo_responses = [self._response_fields(todo, fields=fields) for todo in todos]
+
             return {
                 "items": todo_responses,
                 "total": total,
-                "page": page,
+                "page": None if cursor else page,
                 "per_page": per_page,
-                "pages": math.ceil(total / per_page) if total > 0 else 0
+                "pages": math.ceil(total / per_page) if total is not None else None,
+                "next_cursor": next_cursor
             }
-            
+
+        except InvalidCursorError:
+            raise
         except Exception as e:
+            # Not an empty page: that would be cached under the data version ETag
             logger.error(f"Error getting todos: {e}")
+            return None
+
+    def _changed_after(
+        self,
+        query: Select,
+        key: Any,
+        id_column: Any,
+        position: Optional[Tuple[Any, str]],
+        limit: int
+    ) -> Select:
+        """Rows after a (key, id) change feed position, oldest first"""
+        if position:
+            query = query.where(keyset_condition(key, id_column, *position, descending=False))
+        return query.order_by(*keyset_order(key, id_column, False)).limit(limit)
+
+    async def get_changes(
+        self,
+        user_id: str,
+        db: AsyncSession,
+        since: Optional[str] = None,
+        limit: int = 100
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Todos and categories created or updated, and tombstones of deletions,
+        after the since cursor (everything without one). Up to limit rows
+        per list; follow next_cursor while has_more. Deleting a category
+        does not touch its todos: clients drop its id from their local copies.
+        """
+        positions = (
+            decode_positions(since, self.CHANGE_STREAMS) if since
+            else dict.fromkeys(self.CHANGE_STREAMS)
+        )
+
+        try:
+            todos = (await db.scalars(self._changed_after(
+                select(Todo).where(Todo.user_id == user_id).options(selectinload(Todo.categories)),
+                Todo.updated_at, Todo.id, positions["todos"], limit + 1
+            ))).all()
+            categories = await category_service.get_changed_categories(
+                user_id, positions["categories"], limit + 1, db
+            )
+            tombstones = (await db.scalars(self._changed_after(
+                select(Tombstone).where(Tombstone.user_id == user_id),
+                Tombstone.deleted_at, Tombstone.id, positions["deleted"], limit + 1
+            ))).all()
+
+            has_more = any(len(rows) > limit for rows in (todos, categories, tombstones))
+            todos, categories, tombstones = todos[:limit], categories[:limit], tombstones[:limit]
+            if todos:
+                positions["todos"] = (todos[-1].updated_at, todos[-1].id)
+            if categories:
+                positions["categories"] = (categories[-1].updated_at, categories[-1].id)
+            if tombstones:
+                positions["deleted"] = (tombstones[-1].deleted_at, tombstones[-1].id)
+
             return {
-                "items": [],
-                "total": 0,
-                "page": page,
-                "per_page": per_page,
-                "pages": 0
+                "todos": [self._response_fields(todo) for todo in todos],
+                "categories": categories,
+                "deleted": [
+                    {"entity": tombstone.entity, "id": tombstone.entity_id, "deleted_at": tombstone.deleted_at}
+                    for tombstone in tombstones
+                ],
+                "next_cursor": encode_positions(positions),
+                "has_more": has_more
             }
-    
-    async def get_todo_by_id(self, todo_id: str, user_id: str, db: Session) -> Optional[TodoResponse]:
-        """Get a specific todo by ID"""
+
+        except Exception as e:
+            logger.error(f"Error getting changes: {e}")
+            return None
+
+    def _export_chunk(self, todos: List[Todo], format: str) -> bytes:
+        """Encode a batch of todos as NDJSON lines or CSV rows"""
+        if format == "ndjson":
+            return b"".join(to_json(self._response_fields(todo)) + b"\n" for todo in todos)
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for todo in todos:
+            values = self._response_fields(todo)
+            writer.writerow([
+                value.isoformat() if isinstance(value, datetime) else value
+                for value in (values[column] for column in self.EXPORT_CSV_COLUMNS[:-1])
+            ] + ["; ".join(category["name"] for category in values["categories"])])
+        return buffer.getvalue().encode("utf-8")
+
+    def export_todos(
+        self,
+        user_id: str,
+        format: str = "ndjson",
+        sort_by: str = "created_at",
+        sort_order: str = "desc",
+        **filters: Any
+    ) -> AsyncIterator[bytes]:
+        """
+        Stream every todo matching the get_todos filters as NDJSON or CSV.
+        The statement is built here, before the caller starts a response, so
+        bad filters fail while an error status can still be sent; only
+        iterating the rows is left to the returned stream.
+        """
+        query = (
+            self.build_list_query(user_id, sort_by, sort_order, **filters)
+            .options(selectinload(Todo.categories))
+            .execution_options(yield_per=self.EXPORT_BATCH_SIZE)
+        )
+        return self._stream_export(query, format)
+
+    async def _stream_export(self, query: Select, format: str) -> AsyncIterator[bytes]:
+        """
+        Rows come through a server-side cursor EXPORT_BATCH_SIZE at a time
+        (yield_per), so memory does not grow with the number of todos.
+        Uses its own session: the response body outlives the request's.
+        """
+        if format == "csv":
+            buffer = io.StringIO()
+            csv.writer(buffer).writerow(self.EXPORT_CSV_COLUMNS)
+            yield buffer.getvalue().encode("utf-8")
+
         try:
-            todo = db.query(Todo).filter(
-                Todo.id == todo_id,
-                Todo.user_id == user_id
-            ).first()
-            
+            async with open_session() as db:
+                result = await db.stream_scalars(query)
+                async for todos in result.partitions():
+                    yield self._export_chunk(todos, format)
+        except Exception as e:
+            # Headers are already sent; the client sees a truncated body
+            logger.error(f"Error exporting todos: {e}")
+            raise
+
+    async def get_todo_by_id(
+        self,
+        todo_id: str,
+        user_id: str,
+        db: AsyncSession,
+        fields: Optional[List[str]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Get a specific todo by ID as TodoResponse fields (all, or just fields)"""
+        try:
+            todo = await self._get_owned_todo(todo_id, user_id, db, fields)
+
             if todo:
-                return TodoResponse(
-                    id=todo.id,
-                    title=todo.title,
-                    description=todo.description,
-                    status=TodoStatus.completed if todo.completed else TodoStatus.pending,
-                    priority=todo.priority,
-                    due_date=todo.due_date,
-                    user_id=todo.user_id,
-                    created_at=todo.created_at,
-                    updated_at=todo.updated_at
-                )
+                return self._response_fields(todo, fields=fields)
             return None
-            
+
         except Exception as e:
             logger.error(f"Error getting todo: {e}")
             return None
-    
+
     async def update_todo(
-        self, 
-        todo_id: str, 
-        user_id: str, 
+        self,
+        todo_id: str,
+        user_id: str,
         todo_update: TodoUpdate,
-        db: Session
+        db: AsyncSession
     ) -> Optional[TodoResponse]:
-        """Update a todo"""
+        """Update a todo (UPDATE ... RETURNING, then its categories)"""
         try:
-            todo = db.query(Todo).filter(
-                Todo.id == todo_id,
-                Todo.user_id == user_id
-            ).first()
-            
+            await data_version_service.bump(user_id, db)
+            changes = todo_update.model_dump(exclude_unset=True, mode="json")
+            values = self._update_values(changes)
+            before = None
+            if changes.keys() & self.STATS_FIELDS:
+                before = await stats_service.tally(
+                    select(Todo.id).where(Todo.id == todo_id, Todo.user_id == user_id), db
+                )
+            todo = await db.scalar(
+                update(Todo)
+                .where(Todo.id == todo_id, Todo.user_id == user_id)
+                .values(**values)
+                .returning(Todo)
+                .execution_options(populate_existing=True)
+            )
+
             if not todo:
+                await db.rollback()
                 return None
-            
-            # Update fields
-            update_data = todo_update.model_dump(exclude_unset=True)
-            for field, value in update_data.items():
-                if field == "status":
-                    # Convert status to completed boolean
-                    todo.completed = (value == TodoStatus.completed)
-                else:
-                    setattr(todo, field, value)
-            
-            db.commit()
-            db.refresh(todo)
-            
-            return TodoResponse(
-                id=todo.id,
-                title=todo.title,
-                description=todo.description,
-                status=TodoStatus.completed if todo.completed else TodoStatus.pending,
-                priority=todo.priority,
-                due_date=todo.due_date,
-                user_id=todo.user_id,
-                created_at=todo.created_at,
-                updated_at=todo.updated_at
-            )
-            
+
+            if changes.get("category_ids") is not None:
+                await self._replace_categories(user_id, [todo_id], changes["category_ids"], db)
+            categories = await self._load_categories(todo_id, db)
+            if before is not None:
+                after = Counter(stats_service.todo_keys(
+                    todo.completed, todo.priority, [category.id for category in categories]
+                ))
+                await stats_service.apply(user_id, stats_service.delta(after, before), db)
+            await db.commit()
+            return self._to_response(todo, categories)
+
         except Exception as e:
             logger.error(f"Error updating todo: {e}")
-            db.rollback()
+            await db.rollback()
             return None
-    
-    async def delete_todo(self, todo_id: str, user_id: str, db: Session) -> bool:
-        """Delete a todo"""
+
+    async def delete_todo(self, todo_id: str, user_id: str, db: AsyncSession) -> bool:
+        """Delete a todo (one DELETE), leaving a tombstone for the change feed"""
         try:
-            todo = db.query(Todo).filter(
-                Todo.id == todo_id,
-                Todo.user_id == user_id
-            ).first()
-            
-            if not todo:
-                return False
-            
-            db.delete(todo)
-            db.commit()
-            return True
-            
+            await data_version_service.bump(user_id, db)
+            before = await stats_service.tally(
+                select(Todo.id).where(Todo.id == todo_id, Todo.user_id == user_id), db
+            )
+            deleted = (await db.scalars(
+                delete(Todo)
+                .where(Todo.id == todo_id, Todo.user_id == user_id)
+                .returning(Todo.id)
+                .execution_options(synchronize_session=False)
+            )).all()
+            await stats_service.apply(user_id, stats_service.delta(Counter(), before), db)
+            await data_version_service.record_deletions(user_id, "todo", deleted, db)
+            await self._commit_if(deleted, db)
+            return bool(deleted)
+
         except Exception as e:
             logger.error(f"Error deleting todo: {e}")
-            db.rollback()
+            await db.rollback()
             return False
-    
-    async def toggle_todo_status(self, todo_id: str, user_id: str, db: Session) -> Optional[TodoResponse]:
-        """Toggle todo status between pending and completed"""
+
+    async def toggle_todo_status(self, todo_id: str, user_id: str, db: AsyncSession) -> Optional[TodoResponse]:
+        """Toggle todo status between pending and completed (UPDATE ... RETURNING, then its categories)"""
         try:
-            todo = db.query(Todo).filter(
-                Todo.id == todo_id,
-                Todo.user_id == user_id
-            ).first()
-            
+            await data_version_service.bump(user_id, db)
+            todo = await db.scalar(
+                update(Todo)
+                .where(Todo.id == todo_id, Todo.user_id == user_id)
+                # NULL counts as pending, like in _to_response
+                .values(completed=Todo.completed.is_not(True))
+                .returning(Todo)
+                .execution_options(populate_existing=True)
+            )
+
             if not todo:
+                await db.rollback()
                 return None
-            
-            # Toggle completed status
-            todo.completed = not todo.completed
-            db.commit()
-            db.refresh(todo)
-            
-            return TodoResponse(
-                id=todo.id,
-                title=todo.title,
-                description=todo.description,
-                status=TodoStatus.completed if todo.completed else TodoStatus.pending,
-                priority=todo.priority,
-                due_date=todo.due_date,
-                user_id=todo.user_id,
-                created_at=todo.created_at,
-                updated_at=todo.updated_at
-            )
-            
+
+            categories = await self._load_categories(todo_id, db)
+            # The status it had is the other one
+            category_ids = [category.id for category in categories]
+            after = Counter(stats_service.todo_keys(todo.completed, todo.priority, category_ids))
+            before = Counter(stats_service.todo_keys(not todo.completed, todo.priority, category_ids))
+            await stats_service.apply(user_id, stats_service.delta(after, before), db)
+            await db.commit()
+            return self._to_response(todo, categories)
+
         except Exception as e:
             logger.error(f"Error toggling todo status: {e}")
-            db.rollback()
+            await db.rollback()
             return None
 
 # Singleton instance
-todo_service = TodoService()
\ No newline at end of file
+todo_service = TodoService()
@@ -0,0 +1,99 @@
+"""
+Time deleting a category linked to every todo of a user, and deleting the
+user, through ON DELETE CASCADE (what the services do) against the ORM
+loading the children and deleting them itself (what cascade="all,
+delete-orphan" without passive_deletes did). Builds throwaway SQLite
+databases from the Alembic revisions.
+
+    python -m benchmarks.delete_benchmark --rows 10000 50000
+"""
+from datetime import datetime, timezone
+import argparse
+import tempfile
+import time
+import uuid
+from sqlalchemy import create_engine, delete, event, insert, literal, select
+from sqlalchemy.orm import Session, selectinload
+from app.core.database import enable_sqlite_foreign_keys
+from app.core.migrations import upgrade_database
+from app.models.db_models import Category, Todo, User, todo_categories
+from benchmarks.search_benchmark import seed
+
+
+def seed_category(engine, user_id: str) -> str:
+    """One category linked to every todo of the user"""
+    category_id = str(uuid.uuid4())
+    now = datetime.now(timezone.utc)
+    with engine.begin() as connection:
+        connection.execute(insert(Category).values(
+            id=category_id, user_id=user_id, name="Everything", created_at=now, updated_at=now
+        ))
+        connection.execute(insert(todo_categories).from_select(
+            ["todo_id", "category_id"],
+            select(Todo.id, literal(category_id)).where(Todo.user_id == user_id)
+        ))
+    return category_id
+
+
+def cascade_category(session: Session, user_id: str, category_id: str) -> None:
+    session.execute(delete(Category).where(Category.id == category_id, Category.user_id == user_id))
+
+
+def orm_category(session: Session, user_id: str, category_id: str) -> None:
+    category = session.scalar(
+        select(Category).where(Category.id == category_id).options(selectinload(Category.todos))
+    )
+    session.delete(category)
+
+
+def cascade_user(session: Session, user_id: str, category_id: str) -> None:
+    session.execute(delete(User).where(User.id == user_id))
+
+
+def orm_user(session: Session, user_id: str, category_id: str) -> None:
+    user = session.scalar(
+        select(User).where(User.id == user_id).options(selectinload(User.todos), selectinload(User.categories))
+    )
+    session.delete(user)
+
+
+def run(rows: int, action) -> tuple:
+    """(seconds, statements) for one delete on a fresh database"""
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(f"sqlite:///{directory}/delete.db")
+        upgrade_database(engine)
+        user_id = seed(engine, rows)
+        category_id = seed_category(engine, user_id)
+        event.listen(engine, "connect", enable_sqlite_foreign_keys)
+        engine.dispose()
+
+        statements = []
+        event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+        with Session(engine) as session:
+            start = time.perf_counter()
+            action(session, user_id, category_id)
+            session.commit()
+            elapsed = time.perf_counter() - start
+        engine.dispose()
+        return elapsed, len(statements)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 50_000])
+    args = parser.parse_args()
+
+    print(f"{'rows':>8} {'delete':<18}{'seconds':>9}{'statements':>12}")
+    for rows in args.rows:
+        for name, action in [
+            ("category cascade", cascade_category),
+            ("category orm", orm_category),
+            ("user cascade", cascade_user),
+            ("user orm", orm_user),
+        ]:
+            elapsed, statements = run(rows, action)
+            print(f"{rows:>8} {name:<18}{elapsed:>9.2f}{statements:>12}")
+
+
+if __name__ == "__main__":
+    main()
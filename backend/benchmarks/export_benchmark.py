@@ -0,0 +1,78 @@
+"""
+Peak Python memory of streaming a user's todos through
+TodoService.export_todos, against loading the same rows at once.
+Builds throwaway SQLite databases from the Alembic revisions.
+
+    python -m benchmarks.export_benchmark --rows 10000 100000
+"""
+import argparse
+import asyncio
+import tempfile
+import time
+import tracemalloc
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.orm import selectinload
+from app.core.database import AsyncSessionLocal
+from app.core.migrations import upgrade_database
+from app.models.db_models import Todo
+from app.services.todo_service import todo_service
+from benchmarks.search_benchmark import seed
+
+
+async def stream(user_id: str, format: str) -> int:
+    """Consume the export, returning the bytes produced"""
+    size = 0
+    async for chunk in todo_service.export_todos(user_id, format=format):
+        size += len(chunk)
+    return size
+
+
+async def load_all(user_id: str) -> int:
+    """The naive alternative: every row and its encoding in memory at once"""
+    async with AsyncSessionLocal() as db:
+        todos = (await db.scalars(
+            todo_service.build_list_query(user_id).options(selectinload(Todo.categories))
+        )).all()
+        return len(todo_service._export_chunk(todos, "ndjson"))
+
+
+def measure(coroutine) -> tuple:
+    """(seconds, peak MiB, result)"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = asyncio.run(coroutine)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1] / 2 ** 20
+    tracemalloc.stop()
+    return elapsed, peak, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000])
+    args = parser.parse_args()
+
+    print(f"{'rows':>8} {'path':<14}{'seconds':>9}{'peak MiB':>10}{'MiB out':>9}")
+    for rows in args.rows:
+        with tempfile.TemporaryDirectory() as directory:
+            path = f"{directory}/export.db"
+            engine = create_engine(f"sqlite:///{path}")
+            upgrade_database(engine)
+            user_id = seed(engine, rows)
+            engine.dispose()
+
+            async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+            AsyncSessionLocal.configure(bind=async_engine)
+            for name, coroutine in [
+                ("stream ndjson", lambda: stream(user_id, "ndjson")),
+                ("stream csv", lambda: stream(user_id, "csv")),
+                ("load all", lambda: load_all(user_id)),
+            ]:
+                elapsed, peak, size = measure(coroutine())
+                print(f"{rows:>8} {name:<14}{elapsed:>9.2f}{peak:>10.1f}{size / 2 ** 20:>9.1f}")
+            asyncio.run(async_engine.dispose())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Compare todo search through the trigram index with the old ILIKE '%term%'
+scan. Builds a throwaway SQLite database from the Alembic revisions.
+
+    python -m benchmarks.search_benchmark --rows 100000
+"""
+from datetime import datetime, timedelta, timezone
+import argparse
+import random
+import statistics
+import tempfile
+import time
+import uuid
+from sqlalchemy import create_engine, func, insert, or_, select
+from app.core.migrations import upgrade_database
+from app.models.db_models import Todo, User, priority_rank, title_sort_key
+from app.services.todo_service import todo_service
+
+WORDS = [
+    "buy", "milk", "call", "bank", "report", "meeting", "review", "deploy",
+    "invoice", "dentist", "garden", "laundry", "taxes", "groceries", "email",
+    "牛乳を買う", "会議の資料を準備する", "銀行に電話", "報告書を提出", "歯医者の予約",
+]
+# Common words, rare project codes, Japanese substrings and misses
+QUERIES = ["milk", "deploy review", "prj-0042", "資料を準備", "案件0042", "報告書 prj-0042", "zzzz-no-match"]
+
+
+def ilike_query(user_id: str, search: str):
+    """The pre-index search filter"""
+    return (
+        select(Todo)
+        .where(Todo.user_id == user_id)
+        .where(or_(Todo.title.ilike(f"%{search}%"), Todo.description.ilike(f"%{search}%")))
+        .order_by(Todo.created_at.desc(), Todo.id.desc())
+    )
+
+
+def count_query(query):
+    """The total the list endpoint computes alongside each page"""
+    return select(func.count()).select_from(query.order_by(None).subquery())
+
+
+def seed(engine, rows: int) -> str:
+    """Insert rows todos for one user (plus a second user with a tenth as many)"""
+    rng = random.Random(42)
+    users = [str(uuid.uuid4()), str(uuid.uuid4())]
+    now = datetime.now(timezone.utc)
+    with engine.begin() as connection:
+        connection.execute(insert(User), [
+            {"id": user_id, "email": f"{user_id}@example.com", "username": "bench", "hashed_password": "x"}
+            for user_id in users
+        ])
+        batch = []
+        for i in range(rows + rows // 10):
+            code = rng.randrange(2000)
+            title = " ".join(rng.sample(WORDS, 3) + [f"PRJ-{code:04d}"])
+            priority = rng.choice(["low", "medium", "high"])
+            batch.append({
+                "id": str(uuid.uuid4()),
+                "title": title,
+                "title_key": title_sort_key(title),
+                "description": " ".join(rng.sample(WORDS, 5) + [f"案件{code:04d}"]),
+                "priority": priority,
+                "priority_rank": priority_rank(priority),
+                "completed": False,
+                "user_id": users[0] if i < rows else users[1],
+                "created_at": now - timedelta(seconds=i),
+            })
+            if len(batch) == 5000:
+                connection.execute(insert(Todo), batch)
+                batch = []
+        if batch:
+            connection.execute(insert(Todo), batch)
+    return users[0]
+
+
+def timed(engine, statement, repeat: int) -> tuple:
+    """(median ms, result rows) over repeat runs"""
+    samples = []
+    with engine.connect() as connection:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            count = len(connection.execute(statement).all())
+            samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(f"sqlite:///{directory}/search.db")
+        upgrade_database(engine)
+        start = time.perf_counter()
+        user_id = seed(engine, args.rows)
+        print(f"seeded {args.rows} todos in {time.perf_counter() - start:.1f}s\n")
+
+        columns = ["ilike page", "ilike count", "index page", "index count", "relevance"]
+        print(f"{'query (ms)':<20}" + "".join(f"{name:>12} " for name in columns) + f"{'rows':>7}")
+        for search in QUERIES:
+            baseline = ilike_query(user_id, search)
+            indexed = todo_service.build_list_query(user_id, search=search)
+            ranked = todo_service.build_list_query(user_id, sort_by="relevance", search=search)
+            timings = [
+                timed(engine, baseline.limit(20), args.repeat),
+                timed(engine, count_query(baseline), args.repeat),
+                timed(engine, indexed.limit(20), args.repeat),
+                timed(engine, count_query(indexed), args.repeat),
+                timed(engine, ranked.limit(20), args.repeat),
+            ]
+            with engine.connect() as connection:
+                rows = connection.scalar(count_query(indexed))
+            print(f"{search:<20}" + "".join(f"{ms:>12.1f} " for ms, _ in timings) + f"{rows:>7}")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Per-item cost of turning a page of todo rows into JSON bytes: the old
+path (validated TodoResponse per row, TodoListResponse(**result), then
+FastAPI's response_model validation and jsonable_encoder) against the
+trusted path (plain dicts of TodoResponse fields, serialized by
+pydantic_core.to_json without a model). No database needed.
+
+    python -m benchmarks.serialization_benchmark --per-page 100
+"""
+from datetime import datetime, timedelta, timezone
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+from app.core.responses import trusted_json_response
+from app.models.db_models import Category, Todo
+from app.models.todo import TodoListResponse, TodoResponse, TodoStatus
+from app.services.todo_service import todo_service
+
+
+def make_rows(count: int) -> list:
+    """Todo rows with two category chips each, as a list page loads them"""
+    now = datetime.now(timezone.utc)
+    categories = [
+        Category(id=str(uuid.uuid4()), name=name, color="#6B7280", user_id="u")
+        for name in ("Home", "Work")
+    ]
+    rows = []
+    for i in range(count):
+        todo = Todo(
+            id=str(uuid.uuid4()),
+            title=f"Todo number {i}",
+            description="Some description text for the benchmark",
+            completed=i % 2 == 0,
+            priority=("low", "medium", "high")[i % 3],
+            due_date=now + timedelta(days=i),
+            user_id="u",
+            created_at=now,
+            updated_at=now,
+        )
+        todo.categories = categories
+        rows.append(todo)
+    return rows
+
+
+def validated_response(todo: Todo) -> TodoResponse:
+    """TodoService._to_response before the trusted path"""
+    return TodoResponse(
+        id=todo.id,
+        title=todo.title,
+        description=todo.description,
+        status=TodoStatus.COMPLETED if todo.completed else TodoStatus.PENDING,
+        priority=todo.priority,
+        due_date=todo.due_date,
+        user_id=todo.user_id,
+        created_at=todo.created_at,
+        updated_at=todo.updated_at,
+        category_ids=[category.id for category in todo.categories],
+        categories=[
+            {"id": category.id, "name": category.name, "color": category.color}
+            for category in todo.categories
+        ]
+    )
+
+
+def page(items: list, per_page: int) -> dict:
+    return {"items": items, "total": 1000, "page": 1, "per_page": per_page, "pages": 10, "next_cursor": None}
+
+
+FIELD = create_response_field(name="Response_get_todos", type_=TodoListResponse)
+
+
+async def before(rows: list) -> bytes:
+    result = TodoListResponse(**page([validated_response(todo) for todo in rows], len(rows)))
+    content = await serialize_response(field=FIELD, response_content=result, is_coroutine=True)
+    return JSONResponse(content).body
+
+
+async def after(rows: list) -> bytes:
+    result = page([todo_service._response_fields(todo) for todo in rows], len(rows))
+    return trusted_json_response(result, Response()).body
+
+
+def per_item_us(path, rows: list, repeat: int) -> float:
+    """Median microseconds per item over repeat runs"""
+    loop = asyncio.new_event_loop()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        loop.run_until_complete(path(rows))
+        samples.append((time.perf_counter() - start) * 1e6 / len(rows))
+    loop.close()
+    return statistics.median(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--per-page", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    rows = make_rows(args.per_page)
+    loop = asyncio.new_event_loop()
+    old, new = (loop.run_until_complete(path(rows)) for path in (before, after))
+    loop.close()
+    assert TodoListResponse.model_validate_json(old) == TodoListResponse.model_validate_json(new)
+
+    old_cost = per_item_us(before, rows, args.repeat)
+    new_cost = per_item_us(after, rows, args.repeat)
+    print(f"per_page={args.per_page}, median of {args.repeat} runs")
+    print(f"{'path':<10}{'us/item':>10}{'ms/page':>10}")
+    print(f"{'before':<10}{old_cost:>10.1f}{old_cost * args.per_page / 1000:>10.2f}")
+    print(f"{'after':<10}{new_cost:>10.1f}{new_cost * args.per_page / 1000:>10.2f}")
+    print(f"speedup {old_cost / new_cost:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
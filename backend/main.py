@@ -2,10 +2,10 @@ from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.responses import Response
 from app.core.config import settings
-from app.core.database import init_db
+from app.core.database import init_db, close_db
 # Import models to register them with SQLAlchemy
 from app.models import db_models
-from app.routes import auth, todos, categories
+from app.routes import auth, todos, categories, internal, bootstrap
 import logging
 import os
 
@@ -28,6 +28,10 @@ async def startup_event():
     init_db()
     logger.info("Database initialization completed")
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    await close_db()
+
 # Get CORS origins from environment variable
 cors_origins_env = os.getenv("CORS_ORIGINS", "*")
 logger.info(f"CORS_ORIGINS env var: {cors_origins_env}")
@@ -71,6 +75,8 @@ async def add_cors_header(request: Request, call_next):
 app.include_router(auth.router, prefix="/api/auth", tags=["authentication"])
 app.include_router(todos.router, prefix="/api/todos", tags=["todos"])
 app.include_router(categories.router, prefix="/api/categories", tags=["categories"])
+app.include_router(internal.router, prefix="/api/internal", tags=["internal"])
+app.include_router(bootstrap.router, prefix="/api/bootstrap", tags=["bootstrap"])
 
 @app.get("/")
 async def root():
@@ -0,0 +1,71 @@
+import uuid
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from main import app
+from app.core.database import async_engine, engine, init_db
+
+client = TestClient(app)
+
+PASSWORD = "TestPassword123!"
+
+
+@pytest.fixture(scope="session", autouse=True)
+def migrate_database():
+    """Bring the development database to the latest migration before tests"""
+    init_db()
+
+
+@pytest.fixture
+def register_user():
+    """Use as `headers = register_user()`: registers and logs in a fresh user"""
+    def register(email=None):
+        email = email or f"user-{uuid.uuid4().hex[:8]}@example.com"
+        client.post("/api/auth/register", json={"email": email, "username": "testuser", "password": PASSWORD})
+        response = client.post("/api/auth/login", json={"email": email, "password": PASSWORD})
+        return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    return register
+
+
+@pytest.fixture
+def auth_headers(register_user):
+    """Authorization headers of a freshly registered user"""
+    return register_user()
+
+
+class QueryCounter:
+    """SQL statements sent to the database (either engine) while active"""
+
+    def __init__(self):
+        self.statements = []
+
+    def __call__(self, conn, cursor, statement, *args):
+        self.statements.append(statement)
+
+    def writes(self, table):
+        """INSERT/UPDATE/DELETE statements that target table"""
+        prefixes = (f"INSERT INTO {table} ", f"UPDATE {table} ", f"DELETE FROM {table} ")
+        return [statement for statement in self.statements if statement.startswith(prefixes)]
+
+    def __len__(self):
+        return len(self.statements)
+
+
+@pytest.fixture
+def count_queries():
+    """Use as `with count_queries() as queries:` around the code under test"""
+    targets = [async_engine.sync_engine, engine]
+
+    class Recording:
+        def __enter__(self):
+            self.counter = QueryCounter()
+            for target in targets:
+                event.listen(target, "before_cursor_execute", self.counter)
+            return self.counter
+
+        def __exit__(self, *exc):
+            for target in targets:
+                event.remove(target, "before_cursor_execute", self.counter)
+
+    return Recording
@@ -0,0 +1,48 @@
+import pytest
+from fastapi.testclient import TestClient
+from main import app
+
+client = TestClient(app)
+
+
+class TestBootstrap:
+    @pytest.fixture(autouse=True)
+    def setup(self, auth_headers):
+        """Register a fresh user with a category and a few todos"""
+        self.headers = auth_headers
+        category = client.post("/api/categories", json={"name": "Home"}, headers=self.headers).json()
+        items = [
+            {"title": f"todo {i}", "status": "completed" if i % 3 == 0 else "pending", "category_ids": [category["id"]]}
+            for i in range(25)
+        ]
+        client.post("/api/todos/bulk", json={"items": items}, headers=self.headers)
+
+    def get(self, url, **params):
+        response = client.get(url, params=params, headers=self.headers)
+        assert response.status_code == 200
+        return response.json()
+
+    def test_matches_separate_endpoints(self):
+        data = self.get("/api/bootstrap")
+        assert data["user"] == self.get("/api/auth/me")
+        assert data["categories"] == self.get("/api/categories")["items"]
+        assert data["todos"] == self.get("/api/todos")
+        assert data["stats"] == self.get("/api/todos/stats")
+
+    def test_per_page(self):
+        todos = self.get("/api/bootstrap", per_page=10)["todos"]
+        assert len(todos["items"]) == 10
+        assert (todos["total"], todos["pages"], todos["per_page"]) == (25, 3, 10)
+        assert todos["next_cursor"] is not None
+
+    def test_queries(self, count_queries):
+        self.get("/api/auth/me")
+        with count_queries() as queries:
+            self.get("/api/bootstrap")
+        # Version, categories, counters, overdue, page, category chips; no
+        # count query (the total is a counter) and no user lookup (cached)
+        assert len(queries) == 6
+        assert not any(statement.startswith("SELECT count(*) AS count_1 \nFROM (SELECT") for statement in queries.statements)
+
+    def test_requires_auth(self):
+        assert client.get("/api/bootstrap").status_code in (401, 403)
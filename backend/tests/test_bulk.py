@@ -0,0 +1,203 @@
+import uuid
+import pytest
+from fastapi.testclient import TestClient
+from app.core.config import settings
+from main import app
+
+client = TestClient(app)
+
+
+class TestBulkCreate:
+    @pytest.fixture(autouse=True)
+    def setup(self, auth_headers):
+        """Register a fresh user for each test"""
+        self.headers = auth_headers
+
+    def list_titles(self):
+        data = client.get("/api/todos", params={"per_page": 100}, headers=self.headers).json()
+        return [item["title"] for item in data["items"]]
+
+    def test_creates_all_items_with_one_insert(self, count_queries):
+        items = [{"title": f"item {i}", "priority": "high" if i % 2 else "low"} for i in range(50)]
+        with count_queries() as queries:
+            response = client.post("/api/todos/bulk", json={"items": items}, headers=self.headers)
+
+        assert response.status_code == 201
+        data = response.json()
+        assert [todo["title"] for todo in data["created"]] == [item["title"] for item in items]
+        assert data["errors"] == []
+        assert len(queries.writes("todos")) == 1
+
+        # Newest first, so the listing is the input order reversed
+        assert self.list_titles() == [item["title"] for item in reversed(items)]
+
+    def test_created_rows_are_searchable_and_sortable(self):
+        client.post(
+            "/api/todos/bulk",
+            json={"items": [{"title": "Ｂ bulk", "priority": "low"}, {"title": "a bulk", "priority": "high"}]},
+            headers=self.headers
+        )
+        data = client.get(
+            "/api/todos",
+            params={"search": "bulk", "sort_by": "priority", "sort_order": "desc"},
+            headers=self.headers
+        ).json()
+        assert [item["title"] for item in data["items"]] == ["a bulk", "Ｂ bulk"]
+
+        data = client.get(
+            "/api/todos",
+            params={"sort_by": "title", "sort_order": "asc"},
+            headers=self.headers
+        ).json()
+        assert [item["title"] for item in data["items"]] == ["a bulk", "Ｂ bulk"]
+
+    def test_all_or_nothing_rejects_batch(self):
+        items = [{"title": "ok"}, {"title": ""}, {"title": "fine", "priority": "urgent"}]
+        response = client.post("/api/todos/bulk", json={"items": items}, headers=self.headers)
+        assert response.status_code == 422
+        errors = response.json()["detail"]["errors"]
+        assert [error["index"] for error in errors] == [1, 2]
+        assert errors[0]["errors"][0]["loc"] == ["title"]
+        assert self.list_titles() == []
+
+    def test_partial_creates_valid_items(self):
+        items = [{"title": "ok"}, {"description": "no title"}, {"title": "also ok"}]
+        response = client.post(
+            "/api/todos/bulk",
+            json={"items": items, "all_or_nothing": False},
+            headers=self.headers
+        )
+        assert response.status_code == 201
+        data = response.json()
+        assert [todo["title"] for todo in data["created"]] == ["ok", "also ok"]
+        assert [error["index"] for error in data["errors"]] == [1]
+
+    def test_item_limit(self):
+        items = [{"title": "x"}] * (settings.TODO_BULK_MAX_ITEMS + 1)
+        response = client.post("/api/todos/bulk", json={"items": items}, headers=self.headers)
+        assert response.status_code == 413
+
+    def test_empty_batch_rejected(self):
+        response = client.post("/api/todos/bulk", json={"items": []}, headers=self.headers)
+        assert response.status_code == 422
+
+    def test_requires_auth(self):
+        response = client.post("/api/todos/bulk", json={"items": [{"title": "x"}]})
+        assert response.status_code in (401, 403)
+
+
+class TestBulkUpdateDelete:
+    @pytest.fixture(autouse=True)
+    def setup(self, register_user):
+        """Register a fresh user with a few todos, plus another user's todo"""
+        self.headers = register_user()
+        items = [
+            {"title": "write report", "priority": "low"},
+            {"title": "review report", "priority": "low", "status": "completed"},
+            {"title": "buy milk", "priority": "high"},
+            {"title": "call bank", "priority": "medium", "status": "completed"},
+        ]
+        created = client.post("/api/todos/bulk", json={"items": items}, headers=self.headers).json()["created"]
+        self.ids = {todo["title"]: todo["id"] for todo in created}
+
+        self.other_headers = register_user()
+        self.other_id = client.post(
+            "/api/todos", json={"title": "other report"}, headers=self.other_headers
+        ).json()["id"]
+
+    def todos(self, headers=None):
+        data = client.get("/api/todos", params={"per_page": 100}, headers=headers or self.headers).json()
+        return {item["title"]: item for item in data["items"]}
+
+    def bulk_delete(self, body, headers=None):
+        return client.request("DELETE", "/api/todos/bulk", json=body, headers=headers or self.headers)
+
+    def test_update_by_ids(self):
+        response = client.patch(
+            "/api/todos/bulk",
+            json={
+                "ids": [self.ids["write report"], self.ids["buy milk"], self.other_id],
+                "changes": {"priority": "high", "status": "completed"}
+            },
+            headers=self.headers
+        )
+        assert response.json() == {"affected": 2}
+        todos = self.todos()
+        assert todos["write report"]["priority"] == "high"
+        assert todos["write report"]["status"] == "completed"
+        assert todos["call bank"]["priority"] == "medium"
+        assert self.todos(self.other_headers)["other report"]["status"] == "pending"
+
+    def test_complete_all_by_filter(self):
+        response = client.patch(
+            "/api/todos/bulk",
+            json={"filter": {"status": "pending"}, "changes": {"status": "completed"}},
+            headers=self.headers
+        )
+        assert response.json() == {"affected": 2}
+        assert {todo["status"] for todo in self.todos().values()} == {"completed"}
+        assert self.todos(self.other_headers)["other report"]["status"] == "pending"
+
+    def test_update_keeps_sort_keys(self):
+        client.patch(
+            "/api/todos/bulk",
+            json={"filter": {"search": "report"}, "changes": {"priority": "high"}},
+            headers=self.headers
+        )
+        data = client.get(
+            "/api/todos",
+            params={"sort_by": "priority", "sort_order": "desc", "per_page": 3},
+            headers=self.headers
+        ).json()
+        assert {item["priority"] for item in data["items"]} == {"high"}
+
+    def test_toggle(self):
+        response = client.patch(
+            "/api/todos/bulk",
+            json={"ids": list(self.ids.values()), "toggle": True},
+            headers=self.headers
+        )
+        assert response.json() == {"affected": 4}
+        todos = self.todos()
+        assert todos["write report"]["status"] == "completed"
+        assert todos["call bank"]["status"] == "pending"
+
+    def test_clear_completed(self):
+        response = self.bulk_delete({"filter": {"status": "completed"}})
+        assert response.status_code == 200
+        assert response.json() == {"affected": 2}
+        assert set(self.todos()) == {"write report", "buy milk"}
+        assert client.get("/api/todos", params={"search": "review"}, headers=self.headers).json()["items"] == []
+
+    def test_delete_by_ids_is_scoped_to_user(self):
+        response = self.bulk_delete({"ids": [self.ids["buy milk"], self.other_id]})
+        assert response.json() == {"affected": 1}
+        assert "other report" in self.todos(self.other_headers)
+
+    def test_selection_must_be_ids_or_filter(self):
+        assert self.bulk_delete({}).status_code == 422
+        assert self.bulk_delete({"ids": [self.ids["buy milk"]], "filter": {}}).status_code == 422
+        assert self.bulk_delete({"ids": []}).status_code == 422
+
+    def test_update_needs_changes(self):
+        response = client.patch("/api/todos/bulk", json={"filter": {}}, headers=self.headers)
+        assert response.status_code == 422
+        response = client.patch(
+            "/api/todos/bulk",
+            json={"filter": {}, "toggle": True, "changes": {"status": "completed"}},
+            headers=self.headers
+        )
+        assert response.status_code == 422
+
+    def test_null_title_rejected(self):
+        response = client.patch(
+            "/api/todos/bulk",
+            json={"ids": [self.ids["buy milk"]], "changes": {"title": None}},
+            headers=self.headers
+        )
+        assert response.status_code == 422
+        assert "buy milk" in self.todos()
+
+    def test_id_limit(self):
+        ids = [str(uuid.uuid4()) for _ in range(settings.TODO_BULK_MAX_ITEMS + 1)]
+        assert self.bulk_delete({"ids": ids}).status_code == 413
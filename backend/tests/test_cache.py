@@ -0,0 +1,148 @@
+import uuid
+import pytest
+from fastapi.testclient import TestClient
+from main import app
+from app.core.cache import TTLCache
+from app.services.auth_service import auth_service
+from app.services.category_service import category_service
+
+client = TestClient(app)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestTTLCache:
+    def test_hit_and_miss_counters(self):
+        cache = TTLCache(max_size=10, ttl_seconds=60)
+        assert cache.get("a") is None
+        cache.set("a", 1)
+        assert cache.get("a") == 1
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+
+    def test_entries_expire(self):
+        clock = FakeClock()
+        cache = TTLCache(max_size=10, ttl_seconds=5, clock=clock)
+        cache.set("a", 1)
+        clock.now = 4.9
+        assert cache.get("a") == 1
+        clock.now = 5.0
+        assert cache.get("a") is None
+
+    def test_least_recently_used_is_evicted(self):
+        cache = TTLCache(max_size=2, ttl_seconds=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.stats()["evictions"] == 1
+
+    def test_invalidate_where(self):
+        cache = TTLCache(max_size=10, ttl_seconds=60)
+        cache.set(("u1", "t1"), 1)
+        cache.set(("u1", "t2"), 2)
+        cache.set(("u2", "t1"), 3)
+        assert cache.invalidate_where(lambda key: key[0] == "u1") == 2
+        assert cache.get(("u2", "t1")) == 3
+
+
+class TestUserCache:
+    @pytest.fixture(autouse=True)
+    def setup(self, register_user):
+        """Register a fresh user and log in"""
+        self.email = f"cache-{uuid.uuid4().hex[:8]}@example.com"
+        self.headers = register_user(self.email)
+
+    def test_repeated_requests_hit_cache(self):
+        """Second request with the same token is served from the cache"""
+        client.get("/api/auth/me", headers=self.headers)
+        hits_before = auth_service.user_cache.hits
+        response = client.get("/api/auth/me", headers=self.headers)
+        assert response.status_code == 200
+        assert response.json()["email"] == self.email
+        assert auth_service.user_cache.hits == hits_before + 1
+
+    def test_invalidate_user(self):
+        """Invalidating a user forces the next lookup back to the database"""
+        me = client.get("/api/auth/me", headers=self.headers).json()
+        auth_service.invalidate_user(me["id"])
+        misses_before = auth_service.user_cache.misses
+        client.get("/api/auth/me", headers=self.headers)
+        assert auth_service.user_cache.misses == misses_before + 1
+
+    def test_deactivated_user_is_evicted(self):
+        """Changing the user row invalidates cached entries for that user"""
+        from app.core.database import SessionLocal
+        from app.models.db_models import User
+
+        assert client.get("/api/auth/me", headers=self.headers).status_code == 200
+        db = SessionLocal()
+        try:
+            user = db.query(User).filter(User.email == self.email).first()
+            user.is_active = False
+            db.commit()
+        finally:
+            db.close()
+
+        response = client.get("/api/auth/me", headers=self.headers)
+        assert response.status_code == 400
+
+
+class TestCategoryCache:
+    @pytest.fixture(autouse=True)
+    def setup(self, auth_headers):
+        """Register a fresh user with one category"""
+        self.headers = auth_headers
+        self.category = client.post("/api/categories", json={"name": "Cached"}, headers=self.headers).json()
+
+    def categories(self):
+        response = client.get("/api/categories", headers=self.headers)
+        assert response.status_code == 200
+        return {category["id"]: category for category in response.json()["items"]}
+
+    def test_repeated_list_is_served_from_cache(self, count_queries):
+        self.categories()
+        hits_before = category_service.cache.stats()["hits"]
+        with count_queries() as queries:
+            categories = self.categories()
+        assert self.category["id"] in categories
+        assert category_service.cache.stats()["hits"] == hits_before + 1
+        # Only the data version lookup of the ETag check
+        assert not any(statement.startswith("SELECT categories.") for statement in queries.statements)
+
+    def test_category_writes_invalidate(self):
+        self.categories()
+        client.put(f"/api/categories/{self.category['id']}", json={"name": "Renamed"}, headers=self.headers)
+        assert self.categories()[self.category["id"]]["name"] == "Renamed"
+
+        other = client.post("/api/categories", json={"name": "Other"}, headers=self.headers).json()
+        assert other["id"] in self.categories()
+
+        client.delete(f"/api/categories/{other['id']}", headers=self.headers)
+        assert other["id"] not in self.categories()
+
+    def test_todo_writes_refresh_counts(self):
+        assert self.categories()[self.category["id"]]["todo_count"] == 0
+        todo = client.post(
+            "/api/todos",
+            json={"title": "counted", "category_ids": [self.category["id"]]},
+            headers=self.headers
+        ).json()
+        assert self.categories()[self.category["id"]]["todo_count"] == 1
+
+        client.patch(f"/api/todos/{todo['id']}/toggle", headers=self.headers)
+        assert self.categories()[self.category["id"]]["completed_count"] == 1
+
+    def test_stats_are_reported(self):
+        response = client.get("/api/internal/stats")
+        assert response.status_code == 200
+        assert {"hits", "misses", "hit_rate", "size"} <= response.json()["category_cache"].keys()
@@ -0,0 +1,102 @@
+import pytest
+from fastapi.testclient import TestClient
+from main import app
+
+client = TestClient(app)
+
+
+class TestChangeFeed:
+    @pytest.fixture(autouse=True)
+    def setup(self, auth_headers):
+        """Register a fresh user"""
+        self.headers = auth_headers
+
+    def changes(self, since=None, **params):
+        if since:
+            params["since"] = since
+        response = client.get("/api/todos/changes", params=params, headers=self.headers)
+        assert response.status_code == 200
+        return response.json()
+
+    def create_todo(self, title, **todo):
+        return client.post("/api/todos", json={"title": title, **todo}, headers=self.headers).json()
+
+    def test_snapshot_then_nothing_new(self):
+        category = client.post("/api/categories", json={"name": "Sync"}, headers=self.headers).json()
+        todo = self.create_todo("first", category_ids=[category["id"]])
+
+        data = self.changes()
+        assert [item["id"] for item in data["todos"]] == [todo["id"]]
+        assert data["todos"][0]["category_ids"] == [category["id"]]
+        # After the defaults seeded at registration
+        assert [item["id"] for item in data["categories"]][-1] == category["id"]
+        assert data["deleted"] == []
+        assert data["has_more"] is False
+
+        again = self.changes(data["next_cursor"])
+        assert again["todos"] == again["categories"] == again["deleted"] == []
+        assert again["next_cursor"] == data["next_cursor"]
+
+    def test_only_changes_since_cursor(self):
+        kept = self.create_todo("kept")
+        edited = self.create_todo("edited")
+        gone = self.create_todo("gone")
+        cursor = self.changes()["next_cursor"]
+
+        client.put(f"/api/todos/{edited['id']}", json={"title": "edited twice"}, headers=self.headers)
+        client.delete(f"/api/todos/{gone['id']}", headers=self.headers)
+        added = self.create_todo("added")
+
+        data = self.changes(cursor)
+        assert [item["title"] for item in data["todos"]] == ["edited twice", "added"]
+        assert kept["id"] not in {item["id"] for item in data["todos"]}
+        assert [(item["entity"], item["id"]) for item in data["deleted"]] == [("todo", gone["id"])]
+        assert added["id"] in {item["id"] for item in data["todos"]}
+
+    def test_bulk_and_category_deletes_leave_tombstones(self):
+        ids = [self.create_todo(f"bulk {i}")["id"] for i in range(3)]
+        category = client.post("/api/categories", json={"name": "Doomed"}, headers=self.headers).json()
+        cursor = self.changes()["next_cursor"]
+
+        client.request("DELETE", "/api/todos/bulk", json={"ids": ids[:2]}, headers=self.headers)
+        client.delete(f"/api/categories/{category['id']}", headers=self.headers)
+        # Misses leave nothing behind
+        client.delete("/api/todos/missing", headers=self.headers)
+
+        deleted = self.changes(cursor)["deleted"]
+        assert {(item["entity"], item["id"]) for item in deleted} == {
+            ("todo", ids[0]), ("todo", ids[1]), ("category", category["id"])
+        }
+
+    def test_pages_with_limit(self):
+        created = [self.create_todo(f"page {i}")["id"] for i in range(5)]
+        seen, cursor = [], None
+        while True:
+            data = self.changes(cursor, limit=2)
+            assert len(data["todos"]) <= 2
+            seen.extend(item["id"] for item in data["todos"])
+            cursor = data["next_cursor"]
+            if not data["has_more"]:
+                break
+        assert seen == created
+
+    def test_other_users_changes_are_hidden(self, register_user):
+        other_headers = register_user()
+        other = client.post("/api/todos", json={"title": "theirs"}, headers=other_headers).json()
+        client.delete(f"/api/todos/{other['id']}", headers=other_headers)
+
+        data = self.changes()
+        assert data["todos"] == [] and data["deleted"] == []
+
+    def test_invalid_cursor(self):
+        response = client.get("/api/todos/changes", params={"since": "nope"}, headers=self.headers)
+        assert response.status_code == 400
+
+    def test_unchanged_feed_is_not_modified(self):
+        self.create_todo("etag")
+        response = client.get("/api/todos/changes", headers=self.headers)
+        response = client.get(
+            "/api/todos/changes",
+            headers={**self.headers, "If-None-Match": response.headers["etag"]}
+        )
+        assert response.status_code == 304
@@ -0,0 +1,64 @@
+import pytest
+from fastapi.testclient import TestClient
+from main import app
+from app.core.config import settings
+from app.core.database import get_async_database_url
+
+client = TestClient(app)
+
+
+def test_async_database_url():
+    assert get_async_database_url("sqlite:///./todoShare.db") == "sqlite+aiosqlite:///./todoShare.db"
+    assert get_async_database_url("postgres://u:p@h/db") == "postgresql+asyncpg://u:p@h/db"
+    assert get_async_database_url("postgresql://u:p@h/db") == "postgresql+asyncpg://u:p@h/db"
+
+
+class TestSessionModes:
+    @pytest.fixture(autouse=True, params=[True, False], ids=["async", "sync"])
+    def setup(self, request, monkeypatch, register_user):
+        """Run each test against both the async and the sync session path"""
+        monkeypatch.setattr(settings, "DATABASE_ASYNC", request.param)
+        self.headers = register_user()
+
+    def test_todo_crud(self):
+        """Create, list, update, toggle and delete go through the selected session"""
+        response = client.post(
+            "/api/todos",
+            json={"title": "Session Todo", "priority": "high"},
+            headers=self.headers
+        )
+        assert response.status_code == 201
+        todo_id = response.json()["id"]
+
+        response = client.get("/api/todos", headers=self.headers)
+        assert response.status_code == 200
+        assert response.json()["total"] == 1
+
+        response = client.put(
+            f"/api/todos/{todo_id}",
+            json={"title": "Renamed"},
+            headers=self.headers
+        )
+        assert response.json()["title"] == "Renamed"
+
+        response = client.patch(f"/api/todos/{todo_id}/toggle", headers=self.headers)
+        assert response.json()["status"] == "completed"
+
+        assert client.delete(f"/api/todos/{todo_id}", headers=self.headers).status_code == 204
+        assert client.get(f"/api/todos/{todo_id}", headers=self.headers).status_code == 404
+
+    def test_category_crud(self):
+        """Categories are created, counted and deleted through the selected session"""
+        response = client.post(
+            "/api/categories",
+            json={"name": "Session", "color": "#123456"},
+            headers=self.headers
+        )
+        assert response.status_code == 201
+        category_id = response.json()["id"]
+
+        response = client.get("/api/categories", headers=self.headers)
+        assert any(c["id"] == category_id for c in response.json()["items"])
+
+        assert client.delete(f"/api/categories/{category_id}", headers=self.headers).status_code == 204
+        assert client.get(f"/api/categories/{category_id}", headers=self.headers).status_code == 404
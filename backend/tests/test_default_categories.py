@@ -0,0 +1,44 @@
+import asyncio
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import inspect, select
+from main import app
+from app.core.database import SessionLocal, SyncSessionAdapter, engine
+from app.models.category import default_categories
+from app.models.db_models import Category
+from app.services.category_service import category_service
+
+client = TestClient(app)
+
+
+class TestDefaultCategories:
+    @pytest.fixture(autouse=True)
+    def setup(self, auth_headers):
+        """Register a fresh user"""
+        self.headers = auth_headers
+        self.user_id = client.get("/api/auth/me", headers=self.headers).json()["id"]
+
+    def names(self):
+        with SessionLocal() as db:
+            return sorted(db.scalars(select(Category.name).where(Category.user_id == self.user_id)).all())
+
+    def test_seeded_at_registration(self):
+        assert self.names() == sorted(default["name"] for default in default_categories)
+
+    def test_list_does_not_write(self, count_queries):
+        with count_queries() as queries:
+            response = client.get("/api/categories", headers=self.headers)
+        assert response.status_code == 200
+        assert len(response.json()["items"]) == len(default_categories)
+        assert queries.writes("categories") == []
+
+    def test_seeding_again_is_a_no_op(self):
+        with SessionLocal() as session:
+            asyncio.run(category_service.seed_default_categories(self.user_id, SyncSessionAdapter(session)))
+            session.commit()
+        assert self.names() == sorted(default["name"] for default in default_categories)
+
+    def test_names_are_unique_per_user(self):
+        indexes = {index["name"]: index for index in inspect(engine).get_indexes("categories")}
+        assert indexes["uq_categories_user_name"]["unique"]
+        assert indexes["uq_categories_user_name"]["column_names"] == ["user_id", "name"]
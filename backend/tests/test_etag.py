@@ -0,0 +1,114 @@
+import pytest
+from fastapi.testclient import TestClient
+from main import app
+from app.services.category_service import CategoryService
+from app.services.todo_service import TodoService
+
+client = TestClient(app)
+
+
+class TestConditionalGet:
+    @pytest.fixture(autouse=True)
+    def setup(self, auth_headers):
+        """Register a fresh user with one todo and one category"""
+        self.headers = auth_headers
+        self.category = client.post("/api/categories", json={"name": "Cached"}, headers=self.headers).json()
+        self.todo = client.post("/api/todos", json={"title": "cached"}, headers=self.headers).json()
+
+    def get(self, url, etag=None, **params):
+        headers = dict(self.headers)
+        if etag:
+            headers["If-None-Match"] = etag
+        return client.get(url, params=params, headers=headers)
+
+    @pytest.mark.parametrize("url", ["/api/todos", "/api/categories"])
+    def test_unchanged_list_is_not_modified(self, url):
+        response = self.get(url)
+        etag = response.headers["etag"]
+        assert etag.startswith('W/"')
+        assert response.headers["cache-control"] == "private, no-cache"
+
+        response = self.get(url, etag)
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+
+    def test_detail_endpoints(self):
+        for url in [f"/api/todos/{self.todo['id']}", f"/api/categories/{self.category['id']}"]:
+            etag = self.get(url).headers["etag"]
+            assert self.get(url, etag).status_code == 304
+
+    @pytest.mark.parametrize("write", [
+        lambda self: client.post("/api/todos", json={"title": "new"}, headers=self.headers),
+        lambda self: client.patch(f"/api/todos/{self.todo['id']}/toggle", headers=self.headers),
+        lambda self: client.delete(f"/api/todos/{self.todo['id']}", headers=self.headers),
+        lambda self: client.patch("/api/todos/bulk", json={"ids": [self.todo["id"]], "toggle": True}, headers=self.headers),
+        lambda self: client.put(f"/api/categories/{self.category['id']}", json={"color": "#000000"}, headers=self.headers),
+        lambda self: client.delete(f"/api/categories/{self.category['id']}", headers=self.headers),
+    ], ids=["create", "toggle", "delete", "bulk", "update_category", "delete_category"])
+    def test_writes_change_the_etag(self, write):
+        etags = {url: self.get(url).headers["etag"] for url in ["/api/todos", "/api/categories"]}
+        assert write(self).status_code < 300
+        for url, etag in etags.items():
+            response = self.get(url, etag)
+            assert response.status_code == 200
+            assert response.headers["etag"] != etag
+
+    def test_failed_write_keeps_the_etag(self):
+        etag = self.get("/api/todos").headers["etag"]
+        assert client.put("/api/todos/missing", json={"title": "x"}, headers=self.headers).status_code == 404
+        assert client.post("/api/categories", json={"name": "Cached"}, headers=self.headers).status_code == 400
+        assert self.get("/api/todos", etag).status_code == 304
+
+    def test_etag_depends_on_query(self):
+        etag = self.get("/api/todos").headers["etag"]
+        response = self.get("/api/todos", etag, status="completed")
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag
+
+    def test_if_none_match_list_and_wildcard(self):
+        etag = self.get("/api/todos").headers["etag"]
+        assert self.get("/api/todos", f'W/"0-stale", {etag}').status_code == 304
+        assert self.get("/api/todos", etag.removeprefix("W/")).status_code == 304
+        assert self.get("/api/todos", "*").status_code == 304
+
+    def test_other_users_etag_does_not_match(self, register_user):
+        etag = self.get("/api/todos").headers["etag"]
+        other_headers = register_user()
+        response = client.get(
+            "/api/todos",
+            headers={**other_headers, "If-None-Match": etag}
+        )
+        assert response.status_code == 200
+
+    def test_not_modified_skips_todo_queries(self, count_queries):
+        self.get("/api/auth/me")  # warm the user cache
+        etag = self.get("/api/todos").headers["etag"]
+        with count_queries() as queries:
+            assert self.get("/api/todos", etag).status_code == 304
+        assert len(queries) == 1
+        assert "FROM users" in queries.statements[0]
+
+    @pytest.mark.parametrize("url,service,method", [
+        ("/api/todos", TodoService, "_apply_filters"),
+        ("/api/categories", CategoryService, "build_list_query"),
+    ], ids=["todos", "categories"])
+    def test_error_is_not_cacheable(self, monkeypatch, url, service, method):
+        """A failed read answers 500 without an ETag, not an empty list clients would revalidate forever"""
+        def fail(*args, **kwargs):
+            raise RuntimeError("database unavailable")
+        monkeypatch.setattr(service, method, fail)
+        # A version the category cache has not seen yet
+        client.post("/api/todos", json={"title": "bump"}, headers=self.headers)
+        response = self.get(url)
+        assert response.status_code == 500
+        assert "etag" not in response.headers
+
+    def test_invalid_filter_is_a_client_error(self):
+        """A malformed filter value is rejected before the service runs, not reported as a 500"""
+        response = client.get("/api/todos", params={"due_date_from": "notadate"}, headers=self.headers)
+        assert response.status_code == 422
+        client.post("/api/todos", json={"title": "due", "due_date": "2030-01-02T00:00:00"}, headers=self.headers)
+        for due_date_from in ("2030-01-01", "2030-01-01T00:00:00Z"):
+            response = client.get("/api/todos", params={"due_date_from": due_date_from}, headers=self.headers)
+            assert [item["title"] for item in response.json()["items"]] == ["due"]
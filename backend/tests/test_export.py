@@ -0,0 +1,99 @@
+import csv
+import gzip
+import io
+import json
+import pytest
+from fastapi.testclient import TestClient
+from main import app
+from app.services.todo_service import todo_service
+
+client = TestClient(app)
+
+
+class TestExport:
+    @pytest.fixture(autouse=True)
+    def setup(self, auth_headers):
+        """Register a fresh user with more todos than one export batch"""
+        self.headers = auth_headers
+        self.category = client.post("/api/categories", json={"name": "Export"}, headers=self.headers).json()
+        items = [
+            {
+                "title": f"todo {i:03d}",
+                "description": 'comma, "quote"\nnewline' if i == 0 else None,
+                "status": "completed" if i % 5 == 0 else "pending",
+                "category_ids": [self.category["id"]] if i % 2 == 0 else []
+            }
+            for i in range(25)
+        ]
+        response = client.post("/api/todos/bulk", json={"items": items}, headers=self.headers)
+        assert response.status_code == 201
+
+    @pytest.fixture
+    def small_batches(self, monkeypatch):
+        """Several server-side cursor batches for a handful of rows"""
+        monkeypatch.setattr(todo_service, "EXPORT_BATCH_SIZE", 4)
+
+    def export(self, **params):
+        response = client.get("/api/todos/export", params=params, headers=self.headers)
+        assert response.status_code == 200
+        return response
+
+    def test_ndjson_streams_every_todo(self, small_batches):
+        response = self.export(sort_by="title", sort_order="asc")
+        assert response.headers["content-type"] == "application/x-ndjson"
+        assert 'filename="todos.ndjson"' in response.headers["content-disposition"]
+        rows = [json.loads(line) for line in response.text.splitlines()]
+        assert [row["title"] for row in rows] == [f"todo {i:03d}" for i in range(25)]
+        assert rows[0]["categories"][0]["name"] == "Export"
+        assert rows[1]["category_ids"] == []
+
+        listed = client.get("/api/todos", params={"sort_by": "title", "sort_order": "asc", "per_page": 1}, headers=self.headers)
+        assert rows[0] == listed.json()["items"][0]
+
+    def test_csv(self, small_batches):
+        response = self.export(format="csv", sort_by="title", sort_order="asc")
+        assert response.headers["content-type"].startswith("text/csv")
+        rows = list(csv.DictReader(io.StringIO(response.text)))
+        assert len(rows) == 25
+        assert rows[0]["description"] == 'comma, "quote"\nnewline'
+        assert rows[0]["categories"] == "Export"
+        assert rows[0]["status"] == "completed"
+        assert rows[1]["categories"] == ""
+
+    def test_filters_apply(self):
+        rows = self.export(status="completed").text.splitlines()
+        assert len(rows) == 5
+        rows = self.export(category_ids=self.category["id"], search="todo 01").text.splitlines()
+        assert sorted(json.loads(row)["title"] for row in rows) == ["todo 010", "todo 012", "todo 014", "todo 016", "todo 018"]
+
+    def test_gzip(self, small_batches):
+        response = client.get(
+            "/api/todos/export",
+            params={"format": "csv", "gzip": "true"},
+            headers={**self.headers, "Accept-Encoding": "identity"}
+        )
+        assert response.headers["content-type"] == "application/gzip"
+        assert 'filename="todos.csv.gz"' in response.headers["content-disposition"]
+        rows = list(csv.DictReader(io.StringIO(gzip.decompress(response.content).decode("utf-8"))))
+        assert len(rows) == 25
+
+    def test_other_users_todos_not_exported(self, register_user):
+        other_headers = register_user()
+        response = client.get("/api/todos/export", headers=other_headers)
+        assert response.text == ""
+
+    def test_invalid_format(self):
+        response = client.get("/api/todos/export", params={"format": "xml"}, headers=self.headers)
+        assert response.status_code == 422
+
+    def test_invalid_filter(self):
+        response = client.get("/api/todos/export", params={"due_date_from": "notadate"}, headers=self.headers)
+        assert response.status_code == 422
+
+    def test_statement_fails_before_streaming(self, monkeypatch):
+        """Errors building the query answer 500 instead of a truncated 200 body"""
+        def fail(*args, **kwargs):
+            raise RuntimeError("bad filter")
+        monkeypatch.setattr(todo_service, "build_list_query", fail)
+        response = client.get("/api/todos/export", headers=self.headers)
+        assert response.status_code == 500
@@ -0,0 +1,82 @@
+import pytest
+from fastapi.testclient import TestClient
+from main import app
+from app.models.todo import TodoSparse, TodoSparseListResponse
+
+client = TestClient(app)
+
+
+class TestSparseFieldsets:
+    @pytest.fixture(autouse=True)
+    def setup(self, auth_headers):
+        """Register a fresh user with a few todos"""
+        self.headers = auth_headers
+        assert client.get("/api/auth/me", headers=self.headers).status_code == 200
+        category = client.post("/api/categories", json={"name": "Fields"}, headers=self.headers).json()
+        self.todos = [
+            client.post(
+                "/api/todos",
+                json={"title": f"todo {i}", "description": "x" * 400, "priority": priority, "category_ids": [category["id"]]},
+                headers=self.headers
+            ).json()
+            for i, priority in enumerate(["low", "high", "medium"])
+        ]
+
+    def test_list_returns_only_requested_fields(self):
+        data = client.get("/api/todos", params={"fields": "title,status"}, headers=self.headers).json()
+        assert data["total"] == 3
+        assert [set(item) for item in data["items"]] == [{"id", "title", "status"}] * 3
+        assert data["items"][0]["status"] == "pending"
+
+    def test_sparse_responses_match_declared_schema(self):
+        data = client.get("/api/todos", params={"fields": "title,category_ids"}, headers=self.headers).json()
+        TodoSparseListResponse.model_validate(data)
+        todo = client.get(f"/api/todos/{self.todos[0]['id']}", params={"fields": "priority"}, headers=self.headers).json()
+        assert TodoSparse.model_validate(todo).priority == "low"
+
+        paths = client.get("/openapi.json").json()["paths"]
+        for path, schema in [("/api/todos", "TodoSparseListResponse"), ("/api/todos/{todo_id}", "TodoSparse")]:
+            ok = paths[path]["get"]["responses"]["200"]["content"]["application/json"]["schema"]
+            assert f"#/components/schemas/{schema}" in str(ok)
+
+    def test_columns_are_projected_in_sql(self, count_queries):
+        with count_queries() as queries:
+            response = client.get("/api/todos", params={"fields": "title,priority"}, headers=self.headers)
+        assert response.status_code == 200
+        page = [statement for statement in queries.statements if "LIMIT" in statement]
+        assert len(page) == 1
+        assert "todos.title" in page[0]
+        assert "todos.description" not in page[0]
+        # Version, count and page; no category query when chips are not requested
+        assert len(queries) == 3
+
+    def test_categories_loaded_when_requested(self):
+        data = client.get("/api/todos", params={"fields": "categories"}, headers=self.headers).json()
+        assert all(item["categories"][0]["name"] == "Fields" for item in data["items"])
+
+    def test_cursor_walk_with_sparse_fields(self):
+        params = {"fields": "title", "sort_by": "priority", "sort_order": "desc", "per_page": 2}
+        first = client.get("/api/todos", params=params, headers=self.headers).json()
+        second = client.get(
+            "/api/todos",
+            params={**params, "cursor": first["next_cursor"]},
+            headers=self.headers
+        ).json()
+        titles = [item["title"] for item in first["items"] + second["items"]]
+        assert titles == ["todo 1", "todo 2", "todo 0"]
+
+    def test_detail_with_fields(self):
+        todo_id = self.todos[0]["id"]
+        response = client.get(f"/api/todos/{todo_id}", params={"fields": "due_date, category_ids"}, headers=self.headers)
+        assert response.json() == {"id": todo_id, "due_date": None, "category_ids": self.todos[0]["category_ids"]}
+        assert "etag" in response.headers
+
+        full = client.get(f"/api/todos/{todo_id}", headers=self.headers).json()
+        assert full == self.todos[0]
+
+    def test_unknown_field_rejected(self):
+        response = client.get("/api/todos", params={"fields": "title,hashed_password"}, headers=self.headers)
+        assert response.status_code == 400
+        assert "hashed_password" in response.json()["detail"]
+        todo_id = self.todos[0]["id"]
+        assert client.get(f"/api/todos/{todo_id}", params={"fields": "nope"}, headers=self.headers).status_code == 400
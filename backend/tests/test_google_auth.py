@@ -0,0 +1,138 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from google.auth import crypt, jwt as google_jwt
+from jose import jwk
+from app.services.google_auth import GoogleAuthService, GoogleKeyCache
+
+CLIENT_ID = "test-client-id"
+
+
+def make_key(kid):
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    private_pem = private_key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption()
+    )
+    public_pem = private_key.public_key().public_bytes(
+        serialization.Encoding.PEM,
+        serialization.PublicFormat.SubjectPublicKeyInfo
+    )
+    public_jwk = jwk.construct(public_pem, algorithm="RS256").to_dict()
+    public_jwk.update({"kid": kid, "alg": "RS256", "use": "sig"})
+    public_jwk = {k: v.decode() if isinstance(v, bytes) else v for k, v in public_jwk.items()}
+    return crypt.RSASigner.from_string(private_pem, key_id=kid), public_jwk
+
+
+def make_token(signer, email="google-user@example.com"):
+    now = int(time.time())
+    return google_jwt.encode(signer, {
+        "iss": "https://accounts.google.com",
+        "aud": CLIENT_ID,
+        "sub": "google-sub-1",
+        "email": email,
+        "iat": now,
+        "exp": now + 600
+    }).decode()
+
+
+class JWKSServer:
+    """Local stand-in for Google's certificate endpoint"""
+
+    def __init__(self, max_age=60):
+        self.keys = []
+        self.max_age = max_age
+        self.requests = 0
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                server.requests += 1
+                body = json.dumps({"keys": server.keys}).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Cache-Control", f"public, max-age={server.max_age}")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = HTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_port}/certs"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.httpd.shutdown()
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestGoogleKeyCache:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.server = JWKSServer(max_age=600)
+        self.signer, public_jwk = make_key("key-1")
+        self.server.keys = [public_jwk]
+        self.clock = FakeClock()
+        self.cache = GoogleKeyCache(
+            self.server.url,
+            clock=self.clock,
+            refresh_margin_seconds=60,
+            min_refresh_interval_seconds=10
+        )
+        self.service = GoogleAuthService(key_cache=self.cache)
+        self.service.client_id = CLIENT_ID
+        yield
+        self.server.close()
+
+    def test_keys_fetched_once_within_max_age(self):
+        token = make_token(self.signer)
+        assert self.service.verify_google_token(token)["email"] == "google-user@example.com"
+        self.clock.now += 500
+        assert self.service.verify_google_token(token) is not None
+        assert self.server.requests == 1
+
+    def test_expired_keys_are_refetched(self):
+        token = make_token(self.signer)
+        self.service.verify_google_token(token)
+        self.clock.now += 601
+        assert self.service.verify_google_token(token) is not None
+        assert self.server.requests == 2
+
+    def test_background_refresh_near_expiry(self):
+        token = make_token(self.signer)
+        self.service.verify_google_token(token)
+        self.clock.now += 550
+        assert self.service.verify_google_token(token) is not None
+        self.cache._refresh_thread.join(timeout=5)
+        assert self.server.requests == 2
+        assert self.cache.stats()["expires_in_seconds"] == 600
+
+    def test_unknown_kid_triggers_rate_limited_refresh(self):
+        self.service.verify_google_token(make_token(self.signer))
+        rotated_signer, rotated_jwk = make_key("key-2")
+        self.server.keys.append(rotated_jwk)
+        self.clock.now += 20
+        assert self.service.verify_google_token(make_token(rotated_signer)) is not None
+        assert self.server.requests == 2
+
+        unknown_signer, _ = make_key("key-3")
+        assert self.service.verify_google_token(make_token(unknown_signer)) is None
+        assert self.server.requests == 2
+
+    def test_wrong_audience_rejected(self):
+        self.service.client_id = "other-client"
+        assert self.service.verify_google_token(make_token(self.signer)) is None
@@ -0,0 +1,183 @@
+import csv
+import io
+import json
+import pytest
+from fastapi.testclient import TestClient
+from main import app
+from app.core.config import settings
+
+client = TestClient(app)
+
+
+
+class TestImport:
+    @pytest.fixture(autouse=True)
+    def setup(self, auth_headers):
+        """Register a fresh user with one category"""
+        self.headers = auth_headers
+        self.category = client.post("/api/categories", json={"name": "Home"}, headers=self.headers).json()
+
+    @pytest.fixture
+    def small_batches(self, monkeypatch):
+        """Several committed batches for a handful of rows"""
+        monkeypatch.setattr(settings, "TODO_IMPORT_BATCH_SIZE", 4)
+
+    def upload(self, body, format="ndjson", headers=None):
+        response = client.post(
+            "/api/todos/import",
+            params={"format": format},
+            content=body,
+            headers=headers or self.headers
+        )
+        assert response.status_code == 201
+        return response.json()
+
+    def titles(self, headers=None):
+        data = client.get(
+            "/api/todos",
+            params={"sort_by": "title", "sort_order": "asc", "per_page": 100},
+            headers=headers or self.headers
+        ).json()
+        return [item["title"] for item in data["items"]]
+
+    def test_ndjson(self, small_batches):
+        lines = [json.dumps({"title": f"todo {i:02d}", "priority": "high"}) for i in range(10)]
+        job = self.upload("\n".join(lines) + "\n")
+        assert job["status"] == "completed"
+        assert (job["processed"], job["created"], job["failed"]) == (10, 10, 0)
+        assert job["finished_at"] is not None
+        assert self.titles() == [f"todo {i:02d}" for i in range(10)]
+
+    def test_row_errors_are_reported(self, small_batches):
+        body = "\n".join([
+            json.dumps({"title": "ok 1"}),
+            "{not json",
+            json.dumps({"title": ""}),
+            "",
+            json.dumps({"title": "ok 2", "categories": ["Nope"]}),
+            json.dumps({"title": "ok 3", "priority": "urgent"}),
+            json.dumps({"title": "ok 4"}),
+        ])
+        job = self.upload(body)
+        assert job["status"] == "completed"
+        assert (job["processed"], job["created"], job["failed"]) == (6, 2, 4)
+        assert [error["index"] for error in job["errors"]] == [1, 2, 3, 4]
+        assert job["errors"][0]["errors"][0]["type"] == "json_invalid"
+        assert job["errors"][1]["errors"][0]["loc"] == ["title"]
+        assert job["errors"][2]["errors"][0]["type"] == "category_unknown"
+        assert self.titles() == ["ok 1", "ok 4"]
+
+    def test_malformed_categories_are_row_errors(self):
+        body = "\n".join(json.dumps(row) for row in [
+            {"title": "nested id", "category_ids": [["x"]]},
+            {"title": "nested name", "categories": [["Home"]]},
+            {"title": "nested chip", "categories": [{"id": ["x"], "name": "Home"}]},
+            {"title": "nested id with names", "category_ids": [{"a": 1}], "categories": ["Home"]},
+            {"title": "ok", "categories": ["Home"]},
+        ])
+        job = self.upload(body)
+        assert job["status"] == "completed"
+        assert (job["processed"], job["created"], job["failed"]) == (5, 1, 4)
+        assert [error["index"] for error in job["errors"]] == [0, 1, 2, 3]
+        assert self.titles() == ["ok"]
+
+    def test_long_line_is_a_row_error(self, monkeypatch):
+        monkeypatch.setattr(settings, "TODO_IMPORT_MAX_ROW_SIZE", 100)
+        # Split so the long line outgrows the buffer before its newline arrives
+        body = (json.dumps({"title": "before"}) + "\n" + "x" * 500 + "\n" + json.dumps({"title": "after"})).encode()
+        job = client.post(
+            "/api/todos/import",
+            params={"format": "ndjson"},
+            content=iter([body[i:i + 64] for i in range(0, len(body), 64)]),
+            headers=self.headers
+        ).json()
+        assert (job["processed"], job["created"], job["failed"]) == (3, 2, 1)
+        assert job["errors"][0]["index"] == 1
+        assert job["errors"][0]["errors"][0]["type"] == "line_too_long"
+
+    def test_long_csv_record_fails_the_job(self, monkeypatch):
+        monkeypatch.setattr(settings, "TODO_IMPORT_MAX_ROW_SIZE", 100)
+        job = self.upload('title\nok\n"' + "x" * 500, format="csv")
+        assert job["status"] == "failed"
+        assert "longer than 100" in job["detail"]
+
+    def test_errors_are_capped(self, monkeypatch):
+        monkeypatch.setattr(settings, "TODO_IMPORT_MAX_ERRORS", 2)
+        job = self.upload("\n".join(json.dumps({"title": ""}) for _ in range(5)))
+        assert job["failed"] == 5
+        assert len(job["errors"]) == 2
+
+    def test_category_names(self):
+        job = self.upload(json.dumps({"title": "chores", "categories": ["Home"]}))
+        assert job["created"] == 1
+        todo = client.get("/api/todos", headers=self.headers).json()["items"][0]
+        assert todo["category_ids"] == [self.category["id"]]
+
+    def test_csv(self, small_batches):
+        rows = [["title", "description", "priority", "due_date", "categories"]]
+        rows += [[f"todo {i:02d}", "", "low", "", "Home" if i % 2 == 0 else ""] for i in range(9)]
+        rows.append(["multi", 'comma, "quote"\nnewline', "", "2030-01-01T00:00:00", ""])
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(rows)
+
+        job = self.upload(buffer.getvalue().encode("utf-8-sig"), format="csv")
+        assert (job["processed"], job["created"], job["failed"]) == (10, 10, 0)
+        todos = {
+            item["title"]: item
+            for item in client.get("/api/todos", params={"per_page": 100}, headers=self.headers).json()["items"]
+        }
+        assert todos["multi"]["description"] == 'comma, "quote"\nnewline'
+        assert todos["multi"]["priority"] == "medium"
+        assert todos["todo 00"]["category_ids"] == [self.category["id"]]
+        assert todos["todo 01"]["category_ids"] == []
+
+    @pytest.mark.parametrize("format", ["ndjson", "csv"])
+    def test_export_round_trip(self, format, register_user):
+        """An export imports into another account, categories matched by name"""
+        items = [
+            {"title": f"todo {i}", "status": "completed" if i % 2 else "pending", "category_ids": [self.category["id"]]}
+            for i in range(3)
+        ]
+        client.post("/api/todos/bulk", json={"items": items}, headers=self.headers)
+        exported = client.get("/api/todos/export", params={"format": format}, headers=self.headers).content
+
+        other = register_user()
+        home = client.post("/api/categories", json={"name": "Home"}, headers=other).json()
+        job = self.upload(exported, format=format, headers=other)
+        assert (job["created"], job["failed"]) == (3, 0)
+
+        todos = client.get("/api/todos", params={"sort_by": "title", "sort_order": "asc"}, headers=other).json()["items"]
+        assert [todo["title"] for todo in todos] == ["todo 0", "todo 1", "todo 2"]
+        assert [todo["status"] for todo in todos] == ["pending", "completed", "pending"]
+        assert all(todo["category_ids"] == [home["id"]] for todo in todos)
+
+    def test_invalid_utf8_fails_job(self):
+        job = self.upload(b"title\n\xff\xfe\n", format="csv")
+        assert job["status"] == "failed"
+        assert job["detail"]
+
+    def test_queries_per_batch_not_per_row(self, small_batches, count_queries):
+        body = "\n".join(json.dumps({"title": f"todo {i}", "categories": ["Home"]}) for i in range(12))
+        with count_queries() as queries:
+            job = self.upload(body)
+        assert job["created"] == 12
+        assert len(queries.writes("todos")) == 3
+        assert len(queries.writes("todo_categories")) == 3
+
+    def test_job_status(self):
+        job = self.upload(json.dumps({"title": "one"}))
+        response = client.get(f"/api/todos/import/{job['id']}", headers=self.headers)
+        assert response.status_code == 200
+        assert response.json() == job
+
+        jobs = client.get("/api/todos/import", headers=self.headers).json()
+        assert [listed["id"] for listed in jobs] == [job["id"]]
+
+    def test_other_users_job_not_found(self, register_user):
+        job = self.upload(json.dumps({"title": "one"}))
+        response = client.get(f"/api/todos/import/{job['id']}", headers=register_user())
+        assert response.status_code == 404
+
+    def test_invalid_format(self):
+        response = client.post("/api/todos/import", params={"format": "xml"}, content=b"", headers=self.headers)
+        assert response.status_code == 422
@@ -0,0 +1,122 @@
+import pytest
+from datetime import datetime
+from sqlalchemy import create_engine, delete, func, inspect, select, text, update
+from sqlalchemy.orm import Session
+from app.core.migrations import upgrade_database
+from app.models.db_models import Category, ImportJob, Todo, Tombstone, User, UserStat, todo_categories
+from app.models.todo import TodoStatus
+from app.services.category_service import category_service
+from app.services.stats_service import stats_service
+from app.services.todo_service import todo_service
+
+
+@pytest.fixture(scope="module")
+def engine(tmp_path_factory):
+    """Fresh SQLite database built from the Alembic revisions"""
+    engine = create_engine(f"sqlite:///{tmp_path_factory.mktemp('explain') / 'explain.db'}")
+    upgrade_database(engine)
+    yield engine
+    engine.dispose()
+
+
+def query_plan(engine, statement):
+    """EXPLAIN QUERY PLAN details for a SQLAlchemy statement"""
+    compiled = statement.compile(dialect=engine.dialect, compile_kwargs={"render_postcompile": True})
+    params = tuple(compiled.params[name] for name in compiled.positiontup)
+    with engine.connect() as connection:
+        rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}", params)
+        return [row[3] for row in rows]
+
+
+HOT_QUERIES = [
+    ("list_default", lambda: todo_service.build_list_query("u"), "ix_todos_user_created"),
+    ("list_by_status", lambda: todo_service.build_list_query("u", status=TodoStatus.COMPLETED), "ix_todos_user_completed_created"),
+    ("list_by_due_date", lambda: todo_service.build_list_query("u", sort_by="due_date", sort_order="asc"), "ix_todos_user_due_date"),
+    ("list_due_range", lambda: todo_service.build_list_query("u", due_date_from=datetime(2030, 1, 1)), "ix_todos_user_due_date"),
+    ("list_by_priority", lambda: todo_service.build_list_query("u", sort_by="priority"), "ix_todos_user_priority_rank"),
+    ("list_by_title", lambda: todo_service.build_list_query("u", sort_by="title", sort_order="asc"), "ix_todos_user_title_key"),
+    ("search", lambda: todo_service.build_list_query("u", search="milk"), "todos_fts"),
+    ("search_by_relevance", lambda: todo_service.build_list_query("u", sort_by="relevance", search="milk"), "todos_fts"),
+    ("list_by_category", lambda: todo_service.build_list_query("u", category_ids=["c"]), "ix_todo_categories_category_todo"),
+    ("category_todo_count", lambda: select(func.count()).select_from(todo_categories).where(todo_categories.c.category_id == "c"), "ix_todo_categories_category_todo"),
+    ("category_list", lambda: category_service.build_list_query("u"), "ix_categories_user_id"),
+    ("todo_changes", lambda: todo_service._changed_after(
+        select(Todo).where(Todo.user_id == "u"), Todo.updated_at, Todo.id, (datetime(2030, 1, 1), "t"), 100
+    ), "ix_todos_user_updated"),
+    ("overdue_count", lambda: stats_service._overdue_query("u"), "ix_todos_user_pending_due"),
+    ("tombstone_changes", lambda: todo_service._changed_after(
+        select(Tombstone).where(Tombstone.user_id == "u"), Tombstone.deleted_at, Tombstone.id, (datetime(2030, 1, 1), "t"), 100
+    ), "ix_tombstones_user_deleted"),
+]
+
+
+@pytest.mark.parametrize("name,build,index", HOT_QUERIES, ids=[q[0] for q in HOT_QUERIES])
+def test_hot_query_uses_index(engine, name, build, index):
+    plan = query_plan(engine, build())
+    assert any(index in step for step in plan), plan
+    assert not any(step.split()[:2] in (["SCAN", "todos"], ["SCAN", "categories"]) for step in plan), plan
+
+
+@pytest.mark.parametrize("sort_by,status", [
+    ("created_at", None),
+    ("created_at", TodoStatus.PENDING),
+    ("priority", None),
+    ("title", None),
+])
+@pytest.mark.parametrize("sort_order", ["asc", "desc"])
+def test_sorted_list_needs_no_sort_step(engine, sort_by, status, sort_order):
+    """Sort key + id ordering is read straight from the index"""
+    plan = query_plan(engine, todo_service.build_list_query("u", sort_by=sort_by, sort_order=sort_order, status=status))
+    assert not any("TEMP B-TREE" in step for step in plan), plan
+
+
+def test_category_list_reads_stored_counts(engine):
+    """todo_count is a column, so the sidebar never touches the link table"""
+    plan = query_plan(engine, category_service.build_list_query("u"))
+    assert any("ix_categories_user_id" in step for step in plan), plan
+    assert not any("todo_categories" in step for step in plan), plan
+
+
+def test_category_chips_use_link_primary_key(engine):
+    """selectinload(Todo.categories) for a page: one IN lookup on the link table"""
+    statement = (
+        select(todo_categories.c.todo_id, Category)
+        .join(todo_categories, todo_categories.c.category_id == Category.id)
+        .where(todo_categories.c.todo_id.in_(["a", "b", "c"]))
+    )
+    plan = query_plan(engine, statement)
+    assert any("todo_categories USING" in step and "todo_id=?" in step for step in plan), plan
+    assert not any(step.split()[:2] == ["SCAN", "todo_categories"] for step in plan), plan
+
+
+@pytest.mark.parametrize("table", ["todos", "categories", "tombstones", "user_stats", "import_jobs"])
+def test_user_rows_cascade(engine, table):
+    """Deleting a user is one statement: the database removes its rows"""
+    foreign_keys = inspect(engine).get_foreign_keys(table)
+    assert [fk["options"].get("ondelete") for fk in foreign_keys if fk["referred_table"] == "users"] == ["CASCADE"]
+
+
+@pytest.mark.parametrize("model", [Todo, Category, Tombstone, UserStat, ImportJob])
+def test_user_cascade_is_indexed(engine, model):
+    """The cascade finds a user's rows by index, not a table scan"""
+    plan = query_plan(engine, select(model.id if hasattr(model, "id") else model.key).where(model.user_id == "u"))
+    assert not any(step.startswith("SCAN") for step in plan), plan
+
+
+def test_search_index_survives_rowid_changes(engine):
+    """The FTS index is keyed by todo id, not the todos rowid that VACUUM and table rebuilds renumber"""
+    def search(term):
+        with Session(engine) as session:
+            return [todo.title for todo in session.scalars(todo_service.build_list_query("fts", search=term))]
+
+    with Session(engine) as session:
+        session.add(User(id="fts", email="fts@example.com", username="fts"))
+        session.add_all(Todo(user_id="fts", title=title) for title in ["buy milk", "bake bread", "boil eggs"])
+        session.commit()
+        session.execute(text("UPDATE todos SET rowid = rowid + 1000 WHERE user_id = 'fts'"))
+        session.execute(update(Todo).where(Todo.title == "boil eggs").values(title="boil rice"))
+        session.execute(delete(Todo).where(Todo.title == "buy milk"))
+        session.commit()
+    assert search("rice") == ["boil rice"]
+    assert search("eggs") == search("milk") == []
+    assert search("bread") == ["bake bread"]
@@ -0,0 +1,122 @@
+import pytest
+from fastapi.testclient import TestClient
+from main import app
+
+client = TestClient(app)
+
+
+class TestCursorPagination:
+    @pytest.fixture(autouse=True)
+    def setup(self, auth_headers):
+        """Register a fresh user and create todos with ties and NULL due dates"""
+        self.headers = auth_headers
+
+        todos = [
+            {"title": "b", "priority": "high", "due_date": "2030-01-02T00:00:00"},
+            {"title": "a", "priority": "low"},
+            {"title": "b", "priority": "medium", "due_date": "2030-01-01T00:00:00"},
+            {"title": "c", "priority": "high"},
+            {"title": "a", "priority": "medium", "due_date": "2030-01-02T00:00:00"},
+            {"title": "d", "priority": "low", "due_date": "2030-01-03T00:00:00"},
+            {"title": "c", "priority": "high"},
+        ]
+        for todo in todos:
+            assert client.post("/api/todos", json=todo, headers=self.headers).status_code == 201
+
+    def walk(self, **params):
+        """Follow next_cursor until exhausted, returning ids in order"""
+        ids = []
+        response = client.get("/api/todos", params={**params, "per_page": 2}, headers=self.headers)
+        while True:
+            assert response.status_code == 200
+            data = response.json()
+            ids.extend(item["id"] for item in data["items"])
+            if not data["next_cursor"]:
+                return ids
+            response = client.get(
+                "/api/todos",
+                params={**params, "per_page": 2, "cursor": data["next_cursor"], "include_total": "false"},
+                headers=self.headers
+            )
+
+    @pytest.mark.parametrize("sort_by", ["created_at", "due_date", "priority", "title"])
+    @pytest.mark.parametrize("sort_order", ["asc", "desc"])
+    def test_cursor_walk_matches_full_listing(self, sort_by, sort_order):
+        params = {"sort_by": sort_by, "sort_order": sort_order}
+        full = client.get("/api/todos", params={**params, "per_page": 100}, headers=self.headers).json()
+        expected = [item["id"] for item in full["items"]]
+        assert len(expected) == 7
+
+        walked = self.walk(**params)
+        assert walked == expected
+
+    def test_include_total_false_skips_count(self):
+        response = client.get("/api/todos", params={"include_total": "false"}, headers=self.headers)
+        data = response.json()
+        assert data["total"] is None
+        assert len(data["items"]) == 7
+
+    def test_page_mode_still_reports_totals(self):
+        data = client.get("/api/todos", params={"per_page": 3, "page": 2}, headers=self.headers).json()
+        assert data["total"] == 7
+        assert data["pages"] == 3
+        assert data["page"] == 2
+        assert len(data["items"]) == 3
+
+    def test_invalid_cursor(self):
+        response = client.get("/api/todos", params={"cursor": "not-a-cursor"}, headers=self.headers)
+        assert response.status_code == 400
+
+    def test_cursor_for_other_sort_rejected(self):
+        data = client.get("/api/todos", params={"per_page": 2}, headers=self.headers).json()
+        response = client.get(
+            "/api/todos",
+            params={"cursor": data["next_cursor"], "sort_by": "title"},
+            headers=self.headers
+        )
+        assert response.status_code == 400
+
+
+class TestSortKeys:
+    @pytest.fixture(autouse=True)
+    def setup(self, auth_headers):
+        self.headers = auth_headers
+
+    def create(self, **todo):
+        response = client.post("/api/todos", json=todo, headers=self.headers)
+        assert response.status_code == 201
+        return response.json()
+
+    def test_priority_sorts_by_rank(self):
+        for priority in ["medium", "low", "high", "medium"]:
+            self.create(title=f"p-{priority}", priority=priority)
+        data = client.get(
+            "/api/todos",
+            params={"sort_by": "priority", "sort_order": "desc"},
+            headers=self.headers
+        ).json()
+        assert [item["priority"] for item in data["items"]] == ["high", "medium", "medium", "low"]
+
+    def test_title_sort_is_normalized(self):
+        """Full-width and upper-case titles sort with their plain forms"""
+        for title in ["ｃherry", "Banana", "apple", "タスク", "ﾀｽｸ2"]:
+            self.create(title=title)
+        data = client.get(
+            "/api/todos",
+            params={"sort_by": "title", "sort_order": "asc"},
+            headers=self.headers
+        ).json()
+        assert [item["title"] for item in data["items"]] == ["apple", "Banana", "ｃherry", "タスク", "ﾀｽｸ2"]
+
+    def test_update_keeps_sort_keys_in_sync(self):
+        todo = self.create(title="zzz", priority="low")
+        self.create(title="mmm", priority="medium")
+        client.put(f"/api/todos/{todo['id']}", json={"title": "AAA", "priority": "high"}, headers=self.headers)
+        by_title = client.get(
+            "/api/todos", params={"sort_by": "title", "sort_order": "asc"}, headers=self.headers
+        ).json()
+        by_priority = client.get(
+            "/api/todos", params={"sort_by": "priority", "sort_order": "desc"}, headers=self.headers
+        ).json()
+        assert by_title["items"][0]["id"] == todo["id"]
+        assert by_priority["items"][0]["id"] == todo["id"]
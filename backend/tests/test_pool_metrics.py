@@ -0,0 +1,76 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+from main import app
+from app.core.config import settings
+from app.core.pool_metrics import PoolMetrics
+
+client = TestClient(app)
+
+
+class TestPoolMetrics:
+    @pytest.fixture(autouse=True)
+    def setup(self, tmp_path):
+        """Engine with a single pooled connection and a short timeout"""
+        self.metrics = PoolMetrics("test", pool_size=1, max_overflow=0)
+        self.engine = create_engine(
+            f"sqlite:///{tmp_path / 'pool.db'}",
+            poolclass=self.metrics.instrument(QueuePool),
+            pool_size=1,
+            max_overflow=0,
+            pool_timeout=0.1
+        )
+        self.metrics.listen(self.engine)
+        yield
+        self.engine.dispose()
+
+    def test_checkout_and_in_use_counts(self):
+        with self.engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            stats = self.metrics.stats()
+            assert stats["in_use"] == 1
+            assert stats["open_connections"] == 1
+        stats = self.metrics.stats()
+        assert stats["in_use"] == 0
+        assert stats["checkouts"] == 1
+        assert stats["max_in_use"] == 1
+
+    def test_pool_timeout_is_counted(self):
+        with self.engine.connect():
+            with pytest.raises(PoolTimeoutError):
+                self.engine.connect()
+        stats = self.metrics.stats()
+        assert stats["timeouts"] == 1
+        assert stats["max_checkout_wait_ms"] >= 100
+
+    def test_connection_lifetime_recorded_on_close(self):
+        with self.engine.connect():
+            pass
+        self.engine.dispose()
+        stats = self.metrics.stats()
+        assert stats["open_connections"] == 0
+        assert stats["max_connection_lifetime_s"] > 0
+
+
+def test_internal_stats_endpoint():
+    response = client.get("/api/internal/stats")
+    assert response.status_code == 200
+    data = response.json()
+    assert set(data["database"]["pools"]) == {"sync", "async"}
+    assert "hits" in data["user_cache"]
+    assert "queue_depth" in data["password_hasher"]
+
+
+@pytest.mark.parametrize("environment", ["staging", "prodution"])
+def test_internal_stats_hidden_outside_development(monkeypatch, environment):
+    monkeypatch.setattr(settings, "ENVIRONMENT", environment)
+    monkeypatch.setattr(settings, "INTERNAL_STATS_TOKEN", None)
+    assert client.get("/api/internal/stats").status_code == 404
+
+
+def test_internal_stats_token(monkeypatch):
+    monkeypatch.setattr(settings, "INTERNAL_STATS_TOKEN", "secret")
+    assert client.get("/api/internal/stats").status_code == 403
+    assert client.get("/api/internal/stats", headers={"X-Internal-Token": "secret"}).status_code == 200
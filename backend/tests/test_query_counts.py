@@ -0,0 +1,214 @@
+import asyncio
+import uuid
+import pytest
+from fastapi.testclient import TestClient
+from main import app
+from app.core.database import SessionLocal, SyncSessionAdapter
+from app.models.db_models import Category, Todo
+from app.services.auth_service import auth_service
+
+client = TestClient(app)
+
+
+class TestWriteQueryCounts:
+    """
+    Each write endpoint costs the statements listed, with no read-back.
+    Todo/category writes start with one UPDATE bumping users.data_version
+    (rolled back when nothing matched); deletes add a tombstone INSERT.
+    """
+
+    @pytest.fixture(autouse=True)
+    def setup(self, auth_headers):
+        """Register a fresh user and warm the user cache for its token"""
+        self.headers = auth_headers
+        assert client.get("/api/auth/me", headers=self.headers).status_code == 200
+
+    def create_todo(self, **todo):
+        return client.post("/api/todos", json={"title": "todo", **todo}, headers=self.headers).json()
+
+    def test_register(self, count_queries):
+        email = f"queries-{uuid.uuid4().hex[:8]}@example.com"
+        with count_queries() as queries:
+            response = client.post(
+                "/api/auth/register",
+                json={"email": email, "username": "queryuser", "password": "TestPassword123!"}
+            )
+        assert response.status_code == 200
+        assert response.json()["created_at"] is not None
+        # The user, then its default categories in one multi-row INSERT
+        assert len(queries) == 2
+        assert len(queries.writes("categories")) == 1
+
+    def test_register_duplicate(self, count_queries):
+        email = f"queries-{uuid.uuid4().hex[:8]}@example.com"
+        body = {"email": email, "username": "queryuser", "password": "TestPassword123!"}
+        client.post("/api/auth/register", json=body)
+        with count_queries() as queries:
+            response = client.post("/api/auth/register", json=body)
+        assert response.status_code == 400
+        assert len(queries) == 1
+
+    def test_create_todo(self, count_queries):
+        with count_queries() as queries:
+            response = client.post(
+                "/api/todos",
+                json={"title": "one statement", "priority": "high"},
+                headers=self.headers
+            )
+        assert response.status_code == 201
+        assert response.json()["created_at"] is not None
+        assert len(queries) == 3
+        assert len(queries.writes("users")) == 1
+        assert len(queries.writes("user_stats")) == 1
+
+    def test_update_todo(self, count_queries):
+        todo = self.create_todo()
+        with count_queries() as queries:
+            response = client.put(
+                f"/api/todos/{todo['id']}",
+                json={"title": "renamed", "status": "completed"},
+                headers=self.headers
+            )
+        data = response.json()
+        assert data["title"] == "renamed"
+        assert data["status"] == "completed"
+        assert data["updated_at"] is not None
+        # UPDATE ... RETURNING, the category chips, the version bump,
+        # and for a status change the counters it had and their update
+        assert len(queries) == 5
+        assert len(queries.writes("user_stats")) == 1
+
+    def test_update_missing_todo(self, count_queries):
+        with count_queries() as queries:
+            response = client.put("/api/todos/missing", json={"title": "x"}, headers=self.headers)
+        assert response.status_code == 404
+        assert len(queries) == 2
+
+    def test_toggle_todo(self, count_queries):
+        todo = self.create_todo()
+        with count_queries() as queries:
+            response = client.patch(f"/api/todos/{todo['id']}/toggle", headers=self.headers)
+        assert response.json()["status"] == "completed"
+        assert len(queries) == 4
+        assert queries.statements[1].startswith("UPDATE todos")
+        assert len(queries.writes("user_stats")) == 1
+
+        response = client.patch(f"/api/todos/{todo['id']}/toggle", headers=self.headers)
+        assert response.json()["status"] == "pending"
+
+    def test_delete_todo(self, count_queries):
+        todo = self.create_todo()
+        with count_queries() as queries:
+            response = client.delete(f"/api/todos/{todo['id']}", headers=self.headers)
+        assert response.status_code == 204
+        assert len(queries) == 5
+        assert len(queries.writes("tombstones")) == 1
+        assert len(queries.writes("user_stats")) == 1
+        assert client.delete(f"/api/todos/{todo['id']}", headers=self.headers).status_code == 404
+
+    def test_bulk_update_and_delete(self, count_queries):
+        ids = [self.create_todo()["id"] for _ in range(3)]
+        with count_queries() as queries:
+            client.patch("/api/todos/bulk", json={"ids": ids, "toggle": True}, headers=self.headers)
+        assert len(queries) == 4
+        with count_queries() as queries:
+            client.request("DELETE", "/api/todos/bulk", json={"ids": ids}, headers=self.headers)
+        assert len(queries) == 5
+        assert len(queries.writes("user_stats")) == 1
+
+    def test_create_category(self, count_queries):
+        with count_queries() as queries:
+            response = client.post(
+                "/api/categories",
+                json={"name": "Queries", "color": "#123456"},
+                headers=self.headers
+            )
+        assert response.status_code == 201
+        assert response.json()["todo_count"] == 0
+        assert len(queries) == 2
+
+        with count_queries() as queries:
+            response = client.post("/api/categories", json={"name": "Queries"}, headers=self.headers)
+        assert response.status_code == 400
+        assert len(queries) == 2
+
+    def test_update_category(self, count_queries):
+        category = client.post("/api/categories", json={"name": "Before"}, headers=self.headers).json()
+        client.post("/api/categories", json={"name": "Taken"}, headers=self.headers)
+        with count_queries() as queries:
+            response = client.put(
+                f"/api/categories/{category['id']}",
+                json={"name": "After"},
+                headers=self.headers
+            )
+        assert response.json()["name"] == "After"
+        assert response.json()["updated_at"] is not None
+        # UPDATE ... RETURNING (todo_count is a column), the version bump
+        assert len(queries) == 2
+
+        response = client.put(
+            f"/api/categories/{category['id']}",
+            json={"name": "Taken"},
+            headers=self.headers
+        )
+        assert response.status_code == 404
+
+    def test_update_category_with_description(self):
+        """description is accepted (CategoryForm sends it) but has no column"""
+        category = client.post("/api/categories", json={"name": "Described"}, headers=self.headers).json()
+        response = client.put(
+            f"/api/categories/{category['id']}",
+            json={"name": "Renamed", "color": "#000000", "description": "Things at home"},
+            headers=self.headers
+        )
+        assert response.status_code == 200
+        assert (response.json()["name"], response.json()["color"]) == ("Renamed", "#000000")
+
+        response = client.put(
+            f"/api/categories/{category['id']}",
+            json={"description": "Only a description"},
+            headers=self.headers
+        )
+        assert response.status_code == 200
+        assert response.json()["name"] == "Renamed"
+
+    def test_delete_category(self, count_queries):
+        category = client.post("/api/categories", json={"name": "Gone"}, headers=self.headers).json()
+        with count_queries() as queries:
+            response = client.delete(f"/api/categories/{category['id']}", headers=self.headers)
+        assert response.status_code == 204
+        # Links to todos go with it through ON DELETE CASCADE
+        assert len(queries) == 3
+
+    def test_delete_user(self, count_queries):
+        todo = client.post("/api/todos", json={"title": "gone"}, headers=self.headers).json()
+        category = client.get("/api/categories", headers=self.headers).json()["items"][0]
+        client.put(f"/api/todos/{todo['id']}", json={"category_ids": [category["id"]]}, headers=self.headers)
+        user_id = client.get("/api/auth/me", headers=self.headers).json()["id"]
+        with count_queries() as queries, SessionLocal() as session:
+            assert asyncio.run(auth_service.delete_user(user_id, SyncSessionAdapter(session)))
+        # Everything else goes through ON DELETE CASCADE
+        assert len(queries.writes("users")) == 1
+        assert queries.writes("todos") == queries.writes("categories") == []
+        assert client.get("/api/auth/me", headers=self.headers).status_code == 401
+        with SessionLocal() as db:
+            assert db.get(Todo, todo["id"]) is None
+            assert db.get(Category, category["id"]) is None
+
+    def test_list_page_loads_categories_in_one_query(self, count_queries):
+        categories = [
+            client.post("/api/categories", json={"name": f"Chip {i}"}, headers=self.headers).json()["id"]
+            for i in range(3)
+        ]
+        client.post(
+            "/api/todos/bulk",
+            json={"items": [{"title": f"todo {i}", "category_ids": categories[: i % 4]} for i in range(100)]},
+            headers=self.headers
+        )
+        with count_queries() as queries:
+            response = client.get("/api/todos", params={"per_page": 100}, headers=self.headers)
+        items = response.json()["items"]
+        assert len(items) == 100
+        assert sum(len(item["categories"]) for item in items) == 150
+        # Version, count, page, and one IN query for every category chip on the page
+        assert len(queries) == 4
@@ -0,0 +1,85 @@
+import pytest
+from fastapi.testclient import TestClient
+from main import app
+
+client = TestClient(app)
+
+
+class TestTodoSearch:
+    @pytest.fixture(autouse=True)
+    def setup(self, auth_headers):
+        """Register a fresh user with a mix of English and Japanese todos"""
+        self.headers = auth_headers
+
+        self.ids = {}
+        for title, description in [
+            ("Buy milk", "and some bread"),
+            ("Call the bank", "ask about the milk money"),
+            ("牛乳を買う", "スーパーで"),
+            ("会議の資料を準備する", None),
+            ("100% done", "literal percent"),
+        ]:
+            response = client.post(
+                "/api/todos",
+                json={"title": title, "description": description},
+                headers=self.headers
+            )
+            assert response.status_code == 201
+            self.ids[title] = response.json()["id"]
+
+    def search(self, term, **params):
+        response = client.get("/api/todos", params={"search": term, **params}, headers=self.headers)
+        assert response.status_code == 200
+        return response.json()
+
+    def titles(self, term, **params):
+        return {item["title"] for item in self.search(term, **params)["items"]}
+
+    def test_matches_title_and_description(self):
+        assert self.titles("milk") == {"Buy milk", "Call the bank"}
+        assert self.titles("MILK") == {"Buy milk", "Call the bank"}
+
+    def test_all_terms_must_match(self):
+        assert self.titles("milk bread") == {"Buy milk"}
+
+    def test_japanese_substring(self):
+        assert self.titles("資料を準備") == {"会議の資料を準備する"}
+        assert self.titles("牛乳") == {"牛乳を買う"}
+
+    def test_index_follows_updates_and_deletes(self):
+        todo_id = self.ids["Buy milk"]
+        client.put(f"/api/todos/{todo_id}", json={"title": "Buy oat drink"}, headers=self.headers)
+        assert self.titles("Buy milk") == set()
+        assert self.titles("oat drink") == {"Buy oat drink"}
+
+        client.delete(f"/api/todos/{todo_id}", headers=self.headers)
+        assert self.titles("oat drink") == set()
+
+    def test_query_syntax_is_literal(self):
+        assert self.titles('"milk" OR NEAR(bank') == set()
+        assert self.titles("100%") == {"100% done"}
+        assert self.titles("%") == {"100% done"}
+
+    def test_relevance_ranks_title_matches_first(self):
+        data = self.search("milk", sort_by="relevance")
+        assert [item["title"] for item in data["items"]] == ["Buy milk", "Call the bank"]
+        assert data["total"] == 2
+
+    def test_relevance_has_no_cursor(self):
+        data = self.search("milk", sort_by="relevance", per_page=1)
+        assert data["next_cursor"] is None
+        response = client.get(
+            "/api/todos",
+            params={"search": "milk", "sort_by": "relevance", "cursor": "abc"},
+            headers=self.headers
+        )
+        assert response.status_code == 400
+
+    def test_other_users_todos_not_matched(self, register_user):
+        other_headers = register_user()
+        response = client.get(
+            "/api/todos",
+            params={"search": "milk"},
+            headers=other_headers
+        )
+        assert response.json()["items"] == []
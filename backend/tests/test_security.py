@@ -0,0 +1,45 @@
+import asyncio
+import threading
+import pytest
+from app.core.security import PasswordHasher, PasswordHasherBusyError, verify_password
+
+
+class TestPasswordHasher:
+    def test_hash_and_verify_on_pool(self):
+        """Hashing and verification run on the pool and record latency"""
+        hasher = PasswordHasher(max_workers=1, queue_limit=1)
+
+        async def run():
+            hashed = await hasher.hash("TestPassword123!")
+            return hashed, await hasher.verify("TestPassword123!", hashed)
+
+        hashed, valid = asyncio.run(run())
+        assert valid
+        assert verify_password("TestPassword123!", hashed)
+        stats = hasher.stats()
+        assert stats["completed"] == 2
+        assert stats["in_flight"] == 0
+        assert stats["avg_hash_ms"] > 0
+
+    def test_rejects_when_queue_full(self):
+        """Work beyond workers + queue_limit is rejected instead of queued"""
+        hasher = PasswordHasher(max_workers=1, queue_limit=1)
+        release = threading.Event()
+
+        async def run():
+            blocked = [
+                asyncio.ensure_future(hasher.run(release.wait)),
+                asyncio.ensure_future(hasher.run(release.wait)),
+            ]
+            await asyncio.sleep(0)
+            assert hasher.stats()["queue_depth"] == 1
+            with pytest.raises(PasswordHasherBusyError):
+                await hasher.run(release.wait)
+            release.set()
+            await asyncio.gather(*blocked)
+
+        asyncio.run(run())
+        stats = hasher.stats()
+        assert stats["rejected"] == 1
+        assert stats["max_queue_depth"] == 1
+        assert stats["in_flight"] == 0
@@ -0,0 +1,40 @@
+import pytest
+from fastapi.testclient import TestClient
+from main import app
+from app.models.todo import TodoChangesResponse, TodoListResponse
+
+client = TestClient(app)
+
+
+class TestTrustedSerialization:
+    @pytest.fixture(autouse=True)
+    def setup(self, auth_headers):
+        """Register a fresh user with a categorized todo"""
+        self.headers = auth_headers
+        category = client.post("/api/categories", json={"name": "Json"}, headers=self.headers).json()
+        self.todo = client.post(
+            "/api/todos",
+            json={
+                "title": "serialized",
+                "description": "through the fast path",
+                "priority": "high",
+                "due_date": "2030-01-02T03:04:05",
+                "category_ids": [category["id"]]
+            },
+            headers=self.headers
+        ).json()
+
+    def test_list_items_match_validated_detail(self):
+        response = client.get("/api/todos", headers=self.headers)
+        assert response.headers["content-type"] == "application/json"
+        assert "etag" in response.headers
+        TodoListResponse.model_validate_json(response.content)
+
+        detail = client.get(f"/api/todos/{self.todo['id']}", headers=self.headers).json()
+        assert response.json()["items"] == [detail]
+
+    def test_change_feed_matches_models(self):
+        response = client.get("/api/todos/changes", headers=self.headers)
+        changes = TodoChangesResponse.model_validate_json(response.content)
+        assert changes.todos[0].priority == "high"
+        assert response.json()["todos"][0] == client.get(f"/api/todos/{self.todo['id']}", headers=self.headers).json()
@@ -0,0 +1,212 @@
+import asyncio
+import json
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import update
+from main import app
+from app.core.config import settings
+from app.core.database import SessionLocal, SyncSessionAdapter
+from app.models.db_models import Category, UserStat
+from app.services.stats_service import stats_service
+
+client = TestClient(app)
+
+
+class TestStats:
+    @pytest.fixture(autouse=True)
+    def setup(self, auth_headers):
+        """Register a fresh user with two categories"""
+        self.headers = auth_headers
+        self.user_id = client.get("/api/auth/me", headers=self.headers).json()["id"]
+        self.home = client.post("/api/categories", json={"name": "Home"}, headers=self.headers).json()["id"]
+        self.work = client.post("/api/categories", json={"name": "Work"}, headers=self.headers).json()["id"]
+
+    def stats(self):
+        response = client.get("/api/todos/stats", headers=self.headers)
+        assert response.status_code == 200
+        return response.json()
+
+    def create(self, **todo):
+        response = client.post("/api/todos", json={"title": "todo", **todo}, headers=self.headers)
+        assert response.status_code == 201
+        return response.json()
+
+    def reconcile(self):
+        """Drift of this user found (and repaired) by reconciliation"""
+        with SessionLocal() as session:
+            return asyncio.run(stats_service.reconcile(self.user_id, SyncSessionAdapter(session)))
+
+    def test_empty(self):
+        assert self.stats() == {
+            "total": 0,
+            "by_status": {"pending": 0, "completed": 0},
+            "by_priority": {"low": 0, "medium": 0, "high": 0, "none": 0},
+            "by_category": {},
+            "overdue": 0
+        }
+
+    def test_counts_follow_writes(self):
+        first = self.create(priority="high", category_ids=[self.home])
+        second = self.create(priority="low", status="completed", category_ids=[self.home, self.work])
+        third = self.create(due_date="2000-01-01T00:00:00")
+        client.post("/api/todos/bulk", json={"items": [{"title": "bulk", "priority": None}]}, headers=self.headers)
+        stats = self.stats()
+        assert stats["total"] == 4
+        assert stats["by_status"] == {"pending": 3, "completed": 1}
+        assert stats["by_priority"] == {"low": 1, "medium": 1, "high": 1, "none": 1}
+        assert stats["by_category"] == {self.home: 2, self.work: 1}
+        assert stats["overdue"] == 1
+
+        client.put(f"/api/todos/{first['id']}", json={"priority": "low", "category_ids": [self.work]}, headers=self.headers)
+        client.patch(f"/api/todos/{third['id']}/toggle", headers=self.headers)
+        client.delete(f"/api/todos/{second['id']}", headers=self.headers)
+        stats = self.stats()
+        assert stats["total"] == 3
+        assert stats["by_status"] == {"pending": 2, "completed": 1}
+        assert stats["by_priority"] == {"low": 1, "medium": 1, "high": 0, "none": 1}
+        assert stats["by_category"] == {self.work: 1}
+        assert stats["overdue"] == 0
+        assert self.reconcile() == {}
+
+    def test_bulk_writes(self):
+        for priority in ["low", "low", "high"]:
+            self.create(priority=priority, category_ids=[self.home])
+        client.patch(
+            "/api/todos/bulk",
+            json={"filter": {"priority": "low"}, "changes": {"status": "completed", "category_ids": [self.work]}},
+            headers=self.headers
+        )
+        client.patch("/api/todos/bulk", json={"filter": {}, "toggle": True}, headers=self.headers)
+        stats = self.stats()
+        assert stats["by_status"] == {"pending": 2, "completed": 1}
+        assert stats["by_category"] == {self.home: 1, self.work: 2}
+
+        client.patch("/api/todos/bulk", json={"filter": {}, "changes": {"priority": "medium"}}, headers=self.headers)
+        assert self.stats()["by_priority"] == {"low": 0, "medium": 3, "high": 0, "none": 0}
+        assert self.reconcile() == {}
+
+        client.request("DELETE", "/api/todos/bulk", json={"filter": {"status": "pending"}}, headers=self.headers)
+        stats = self.stats()
+        assert stats["total"] == 1
+        assert stats["by_category"] == {self.home: 1}
+        assert self.reconcile() == {}
+
+    def test_null_status_counts_as_pending(self):
+        for status in ["completed", "completed", "pending"]:
+            self.create(status=status, category_ids=[self.home])
+        client.patch("/api/todos/bulk", json={"filter": {}, "changes": {"status": None}}, headers=self.headers)
+        assert self.stats()["by_status"] == {"pending": 3, "completed": 0}
+        assert self.category_counts() == {self.home: (3, 0), self.work: (0, 0)}
+        assert self.reconcile() == {}
+
+    def test_import_and_category_delete(self):
+        body = "\n".join(json.dumps({"title": f"todo {i}", "categories": ["Home"]}) for i in range(3))
+        client.post("/api/todos/import", content=body, headers=self.headers)
+        assert self.stats()["by_category"] == {self.home: 3}
+
+        client.delete(f"/api/categories/{self.home}", headers=self.headers)
+        stats = self.stats()
+        assert stats["total"] == 3
+        assert stats["by_category"] == {}
+        assert self.reconcile() == {}
+
+    def test_reconcile_repairs_drift(self):
+        self.create(priority="high")
+        with SessionLocal() as db:
+            db.execute(
+                update(UserStat)
+                .where(UserStat.user_id == self.user_id, UserStat.key == "priority:high")
+                .values(value=5)
+            )
+            db.commit()
+        assert self.stats()["by_priority"]["high"] == 5
+
+        assert self.reconcile() == {"priority:high": {"stored": 5, "actual": 1}}
+        assert self.stats()["by_priority"]["high"] == 1
+        assert self.reconcile() == {}
+
+    def test_reconcile_endpoint_for_one_user(self, monkeypatch):
+        monkeypatch.setattr(settings, "INTERNAL_STATS_TOKEN", "secret")
+        self.create()
+        with SessionLocal() as db:
+            db.execute(update(UserStat).where(UserStat.user_id == self.user_id, UserStat.key == "total").values(value=9))
+            db.commit()
+        response = client.post(
+            "/api/internal/stats/reconcile",
+            params={"user_id": self.user_id},
+            headers={"X-Internal-Token": "secret"}
+        )
+        assert response.status_code == 200
+        assert response.json() == {
+            "users_checked": 1,
+            "users_drifted": 1,
+            "drift": {self.user_id: {"total": {"stored": 9, "actual": 1}}}
+        }
+
+    def test_reconcile_endpoint_requires_token(self, monkeypatch):
+        """Even in development, where reading /internal/stats needs no token"""
+        monkeypatch.setattr(settings, "INTERNAL_STATS_TOKEN", None)
+        assert client.post("/api/internal/stats/reconcile", params={"user_id": self.user_id}).status_code == 404
+        monkeypatch.setattr(settings, "INTERNAL_STATS_TOKEN", "secret")
+        assert client.post("/api/internal/stats/reconcile", params={"user_id": self.user_id}).status_code == 403
+
+    def test_stats_read_is_constant(self, count_queries):
+        for i in range(5):
+            self.create(category_ids=[self.home])
+        with count_queries() as queries:
+            self.stats()
+        small = len(queries)
+        client.post("/api/todos/bulk", json={"items": [{"title": f"more {i}"} for i in range(50)]}, headers=self.headers)
+        with count_queries() as queries:
+            assert self.stats()["total"] == 55
+        # Counters, categories with todos, overdue
+        assert len(queries) == small == 3
+
+    def category_counts(self):
+        """(todo_count, completed_count) by category id, as the sidebar lists them"""
+        categories = client.get("/api/categories", headers=self.headers).json()["items"]
+        return {
+            category["id"]: (category["todo_count"], category["completed_count"])
+            for category in categories
+            if category["id"] in (self.home, self.work)
+        }
+
+    def test_category_counts_follow_writes(self):
+        first = self.create(category_ids=[self.home, self.work])
+        second = self.create(status="completed", category_ids=[self.home])
+        assert self.category_counts() == {self.home: (2, 1), self.work: (1, 0)}
+
+        client.patch(f"/api/todos/{first['id']}/toggle", headers=self.headers)
+        assert self.category_counts() == {self.home: (2, 2), self.work: (1, 1)}
+
+        client.put(f"/api/todos/{second['id']}", json={"status": "pending", "category_ids": [self.work]}, headers=self.headers)
+        assert self.category_counts() == {self.home: (1, 1), self.work: (2, 1)}
+
+        client.patch("/api/todos/bulk", json={"filter": {}, "toggle": True}, headers=self.headers)
+        assert self.category_counts() == {self.home: (1, 0), self.work: (2, 1)}
+
+        client.patch(
+            "/api/todos/bulk",
+            json={"filter": {}, "changes": {"status": "completed", "category_ids": [self.home]}},
+            headers=self.headers
+        )
+        assert self.category_counts() == {self.home: (2, 2), self.work: (0, 0)}
+
+        client.request("DELETE", "/api/todos/bulk", json={"ids": [first["id"]]}, headers=self.headers)
+        assert self.category_counts() == {self.home: (1, 1), self.work: (0, 0)}
+        assert self.reconcile() == {}
+
+    def test_reconcile_repairs_category_counts(self):
+        self.create(status="completed", category_ids=[self.home])
+        with SessionLocal() as db:
+            db.execute(update(Category).where(Category.id == self.home).values(todo_count=7, completed_count=0))
+            db.execute(update(Category).where(Category.id == self.work).values(todo_count=3))
+            db.commit()
+
+        assert self.reconcile() == {
+            f"category:{self.home}": {"stored": 7, "actual": 1},
+            f"category_completed:{self.home}": {"stored": 0, "actual": 1},
+            f"category:{self.work}": {"stored": 3, "actual": 0}
+        }
+        assert self.category_counts() == {self.home: (1, 1), self.work: (0, 0)}
+        assert self.reconcile() == {}
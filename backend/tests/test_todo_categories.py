@@ -0,0 +1,120 @@
+import pytest
+from fastapi.testclient import TestClient
+from main import app
+
+client = TestClient(app)
+
+
+class TestTodoCategories:
+    @pytest.fixture(autouse=True)
+    def setup(self, auth_headers):
+        """Register a fresh user with two categories"""
+        self.headers = auth_headers
+        self.work = self.create_category("Work")
+        self.home = self.create_category("Home")
+
+    def create_category(self, name, headers=None):
+        response = client.post("/api/categories", json={"name": name}, headers=headers or self.headers)
+        assert response.status_code == 201
+        return response.json()["id"]
+
+    def create_todo(self, title, category_ids):
+        response = client.post(
+            "/api/todos",
+            json={"title": title, "category_ids": category_ids},
+            headers=self.headers
+        )
+        assert response.status_code == 201
+        return response.json()
+
+    def list_titles(self, **params):
+        data = client.get("/api/todos", params=params, headers=self.headers).json()
+        return {item["title"] for item in data["items"]}
+
+    def test_create_links_categories(self):
+        todo = self.create_todo("both", [self.work, self.home])
+        assert todo["category_ids"] == [self.home, self.work]
+        assert [chip["name"] for chip in todo["categories"]] == ["Home", "Work"]
+
+        fetched = client.get(f"/api/todos/{todo['id']}", headers=self.headers).json()
+        assert fetched["categories"] == todo["categories"]
+
+    def test_other_users_categories_are_ignored(self, register_user):
+        foreign = self.create_category("Theirs", headers=register_user())
+        todo = self.create_todo("mine", [self.work, foreign])
+        assert todo["category_ids"] == [self.work]
+
+    def test_filter_by_categories(self):
+        self.create_todo("work only", [self.work])
+        self.create_todo("home only", [self.home])
+        self.create_todo("both", [self.work, self.home])
+        self.create_todo("none", [])
+
+        assert self.list_titles(category_ids=self.work) == {"work only", "both"}
+        assert self.list_titles(category_ids=f"{self.work},{self.home}") == {"work only", "home only", "both"}
+        data = client.get("/api/todos", params={"category_ids": self.home}, headers=self.headers).json()
+        assert data["total"] == 2
+
+    def test_update_replaces_links(self):
+        todo = self.create_todo("move me", [self.work])
+        response = client.put(
+            f"/api/todos/{todo['id']}",
+            json={"category_ids": [self.home]},
+            headers=self.headers
+        )
+        assert response.json()["category_ids"] == [self.home]
+
+        # Leaving category_ids out keeps the links
+        response = client.put(f"/api/todos/{todo['id']}", json={"title": "moved"}, headers=self.headers)
+        assert response.json()["category_ids"] == [self.home]
+
+        response = client.put(f"/api/todos/{todo['id']}", json={"category_ids": []}, headers=self.headers)
+        assert response.json()["categories"] == []
+
+    def test_bulk_update_relinks_filter_selection(self):
+        self.create_todo("a", [self.work])
+        self.create_todo("b", [self.work])
+        self.create_todo("c", [self.home])
+        response = client.patch(
+            "/api/todos/bulk",
+            json={
+                "filter": {"category_ids": [self.work]},
+                "changes": {"category_ids": [self.home], "status": "completed"}
+            },
+            headers=self.headers
+        )
+        assert response.json() == {"affected": 2}
+        assert self.list_titles(category_ids=self.home) == {"a", "b", "c"}
+        assert self.list_titles(category_ids=self.home, status="completed") == {"a", "b"}
+
+    def test_bulk_create_links_categories(self):
+        response = client.post(
+            "/api/todos/bulk",
+            json={"items": [
+                {"title": "x", "category_ids": [self.work]},
+                {"title": "y", "category_ids": [self.work, self.home, "missing"]},
+                {"title": "z"}
+            ]},
+            headers=self.headers
+        )
+        created = response.json()["created"]
+        assert [len(todo["categories"]) for todo in created] == [1, 2, 0]
+        assert self.list_titles(category_ids=self.work) == {"x", "y"}
+
+    def test_category_counts_and_delete(self):
+        todo = self.create_todo("counted", [self.work, self.home])
+        self.create_todo("also counted", [self.work])
+        categories = client.get("/api/categories", headers=self.headers).json()["items"]
+        counts = {category["name"]: category["todo_count"] for category in categories}
+        assert counts["Work"] == 2
+        assert counts["Home"] == 1
+
+        assert client.delete(f"/api/categories/{self.work}", headers=self.headers).status_code == 204
+        fetched = client.get(f"/api/todos/{todo['id']}", headers=self.headers).json()
+        assert fetched["category_ids"] == [self.home]
+
+    def test_deleting_todo_removes_links(self):
+        todo = self.create_todo("short lived", [self.work])
+        client.delete(f"/api/todos/{todo['id']}", headers=self.headers)
+        category = client.get(f"/api/categories/{self.work}", headers=self.headers).json()
+        assert category["todo_count"] == 0
@@ -0,0 +1,19 @@
+import api from './api'
+import type { User } from './auth'
+import type { Category } from '@/types/category'
+import type { TodoListResponse, TodoStats } from '@/types/todo'
+
+export interface BootstrapResponse {
+  user: User
+  categories: Category[]
+  // First page, newest first, no filters
+  todos: TodoListResponse
+  stats: TodoStats
+}
+
+export const bootstrapApi = {
+  async getBootstrap(perPage?: number): Promise<BootstrapResponse> {
+    const response = await api.get('/bootstrap', { params: { per_page: perPage } })
+    return response.data
+  }
+}
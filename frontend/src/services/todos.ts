@@ -1,5 +1,5 @@
 import api from './api'
-import type { Todo, TodoCreate, TodoUpdate, TodoListResponse, TodoStatus } from '@/types/todo'
+import type { Todo, TodoCreate, TodoUpdate, TodoListResponse, TodoStatus, TodoBulkCreateResponse, TodoSelection, TodoBulkResult, TodoChanges, TodoImportJob, TodoStats } from '@/types/todo'
 
 export const todosApi = {
   async getTodos(params?: {
@@ -13,6 +13,10 @@ export const todosApi = {
     category_ids?: string
     due_date_from?: string
     due_date_to?: string
+    cursor?: string
+    include_total?: boolean
+    // Comma-separated Todo fields; items then carry only those (plus id)
+    fields?: string
   }): Promise<TodoListResponse> {
     const response = await api.get('/todos', { params })
     return response.data
@@ -23,11 +27,71 @@ export const todosApi = {
     return response.data
   },
 
+  async exportTodos(params?: {
+    format?: 'ndjson' | 'csv'
+    gzip?: boolean
+    status?: TodoStatus
+    sort_by?: string
+    sort_order?: string
+    search?: string
+    priority?: string
+    category_ids?: string
+    due_date_from?: string
+    due_date_to?: string
+  }): Promise<Blob> {
+    const response = await api.get('/todos/export', { params, responseType: 'blob' })
+    return response.data
+  },
+
+  async getStats(): Promise<TodoStats> {
+    const response = await api.get('/todos/stats')
+    return response.data
+  },
+
+  async importTodos(file: Blob, format: 'ndjson' | 'csv' = 'ndjson'): Promise<TodoImportJob> {
+    // Raw body, not multipart: the server parses it while it uploads
+    const response = await api.post('/todos/import', file, {
+      params: { format },
+      headers: { 'Content-Type': format === 'csv' ? 'text/csv' : 'application/x-ndjson' }
+    })
+    return response.data
+  },
+
+  async getImportJob(id: string): Promise<TodoImportJob> {
+    const response = await api.get(`/todos/import/${id}`)
+    return response.data
+  },
+
+  async getChanges(since?: string, limit?: number): Promise<TodoChanges> {
+    const response = await api.get('/todos/changes', { params: { since, limit } })
+    return response.data
+  },
+
   async createTodo(data: TodoCreate): Promise<Todo> {
     const response = await api.post('/todos', data)
     return response.data
   },
 
+  async createTodos(items: TodoCreate[], allOrNothing = true): Promise<TodoBulkCreateResponse> {
+    const response = await api.post('/todos/bulk', { items, all_or_nothing: allOrNothing })
+    return response.data
+  },
+
+  async updateTodos(selection: TodoSelection, changes: TodoUpdate): Promise<TodoBulkResult> {
+    const response = await api.patch('/todos/bulk', { ...selection, changes })
+    return response.data
+  },
+
+  async toggleTodos(selection: TodoSelection): Promise<TodoBulkResult> {
+    const response = await api.patch('/todos/bulk', { ...selection, toggle: true })
+    return response.data
+  },
+
+  async deleteTodos(selection: TodoSelection): Promise<TodoBulkResult> {
+    const response = await api.delete('/todos/bulk', { data: selection })
+    return response.data
+  },
+
   async updateTodo(id: string, data: TodoUpdate): Promise<Todo> {
     const response = await api.put(`/todos/${id}`, data)
     return response.data
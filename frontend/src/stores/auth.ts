@@ -109,6 +109,10 @@ export const useAuthStore = defineStore('auth', () => {
     }
   }
 
+  const setUser = (userData: User) => {
+    user.value = userData
+  }
+
   const refreshToken = async () => {
     try {
       const response = await authApi.refreshToken()
@@ -181,6 +185,7 @@ export const useAuthStore = defineStore('auth', () => {
     register,
     logout,
     getCurrentUser,
+    setUser,
     refreshToken,
     clearError,
     setError,
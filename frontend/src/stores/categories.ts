@@ -29,6 +29,10 @@ export const useCategoriesStore = defineStore('categories', () => {
   })
 
   // Actions
+  const setCategories = (items: Category[]) => {
+    categories.value = items
+  }
+
   const fetchCategories = async () => {
     try {
       loading.value = true
@@ -117,6 +121,7 @@ export const useCategoriesStore = defineStore('categories', () => {
     getCategoriesByIds,
     
     // Actions
+    setCategories,
     fetchCategories,
     createCategory,
     updateCategory,
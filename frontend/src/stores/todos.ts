@@ -1,7 +1,7 @@
 import { defineStore } from 'pinia'
 import { ref, computed } from 'vue'
 import { todosApi } from '@/services/todos'
-import type { Todo, TodoCreate, TodoUpdate, TodoStatus } from '@/types/todo'
+import type { Todo, TodoCreate, TodoUpdate, TodoStatus, TodoListResponse } from '@/types/todo'
 
 export const useTodosStore = defineStore('todos', () => {
   // State
@@ -32,6 +32,13 @@ export const useTodosStore = defineStore('todos', () => {
     todos.value.filter(todo => todo.status === 'completed')
   )
   
+  // Whether the list differs from the default first page (as /bootstrap returns it)
+  const hasQuery = computed(() =>
+    !!filterStatus.value || !!searchQuery.value || !!filterPriority.value ||
+    filterCategoryIds.value.length > 0 || !!filterDueDateFrom.value || !!filterDueDateTo.value ||
+    sortBy.value !== 'created_at' || sortOrder.value !== 'desc'
+  )
+
   const todayTodos = computed(() => {
     const today = new Date().toDateString()
     return todos.value.filter(todo => {
@@ -41,6 +48,15 @@ export const useTodosStore = defineStore('todos', () => {
   })
 
   // Actions
+  // The store pages by number with totals, so page/pages/total are set;
+  // keep the previous values should a response come without them
+  const setPage = (response: TodoListResponse) => {
+    todos.value = response.items
+    currentPage.value = response.page ?? currentPage.value
+    totalPages.value = response.pages ?? totalPages.value
+    totalTodos.value = response.total ?? totalTodos.value
+  }
+
   const fetchTodos = async (page: number = 1) => {
     try {
       loading.value = true
@@ -59,10 +75,7 @@ export const useTodosStore = defineStore('todos', () => {
         due_date_to: filterDueDateTo.value || undefined
       })
       
-      todos.value = response.items
-      currentPage.value = response.page
-      totalPages.value = response.pages
-      totalTodos.value = response.total
+      setPage(response)
       
       return true
     } catch (err: any) {
@@ -218,8 +231,10 @@ export const useTodosStore = defineStore('todos', () => {
     pendingTodos,
     completedTodos,
     todayTodos,
+    hasQuery,
     
     // Actions
+    setPage,
     fetchTodos,
     createTodo,
     updateTodo,
@@ -19,7 +19,8 @@ const mockTodo = {
       color: '#007bff',
       description: 'Work tasks',
       created_at: '2024-01-01T00:00:00Z',
-      todo_count: 1
+      todo_count: 1,
+      completed_count: 0
     }
   ]
 }
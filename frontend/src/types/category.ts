@@ -7,6 +7,7 @@ export interface Category {
   created_at: string
   updated_at?: string
   todo_count: number
+  completed_count: number
 }
 
 export interface CategoryCreate {
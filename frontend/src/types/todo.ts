@@ -45,8 +45,71 @@ export interface TodoUpdate {
 
 export interface TodoListResponse {
   items: Todo[]
-  total: number
-  page: number
+  // null when include_total=false
+  total: number | null
+  // null in cursor mode (cursor=...)
+  page: number | null
   per_page: number
-  pages: number
-}
\ No newline at end of file
+  pages: number | null
+  // Pass back as cursor for the next page; null on the last one
+  next_cursor: string | null
+}
+export interface TodoBulkError {
+  index: number
+  errors: { loc: (string | number)[]; msg: string; type: string }[]
+}
+
+export interface TodoBulkCreateResponse {
+  created: Todo[]
+  errors: TodoBulkError[]
+}
+
+export interface TodoStats {
+  total: number
+  by_status: Record<TodoStatus, number>
+  by_priority: Record<TodoPriority | 'none', number>
+  by_category: Record<string, number>
+  overdue: number
+}
+
+export interface TodoImportJob {
+  id: string
+  format: 'ndjson' | 'csv'
+  status: 'running' | 'completed' | 'failed'
+  processed: number
+  created: number
+  failed: number
+  errors: TodoBulkError[]
+  detail?: string
+  created_at: string
+  finished_at?: string
+}
+
+export interface TodoFilter {
+  status?: TodoStatus
+  search?: string
+  priority?: string
+  category_ids?: string[]
+  due_date_from?: string
+  due_date_to?: string
+}
+
+export type TodoSelection = { ids: string[] } | { filter: TodoFilter }
+
+export interface TodoBulkResult {
+  affected: number
+}
+
+export interface Tombstone {
+  entity: 'todo' | 'category'
+  id: string
+  deleted_at: string
+}
+
+export interface TodoChanges {
+  todos: Todo[]
+  categories: Category[]
+  deleted: Tombstone[]
+  next_cursor: string
+  has_more: boolean
+}